@@ -0,0 +1,310 @@
+"""
+Cold archive tier for the staging area.
+Packs rejected and old reviewed articles into append-only gzip segment
+files with an offset index, so they stop taking up space and scan time
+in the live staging directories but remain retrievable by ID.
+"""
+
+import os
+import json
+import gzip
+import logging
+from datetime import datetime, timedelta
+
+from .locking import staging_lock, write_json_atomic
+from .layout import iter_articles, find_article
+from .search import get_search_index
+from .snapshot import get_snapshot
+
+logger = logging.getLogger('staging_archive')
+
+# Start a new segment on the next run once the current one grows past this size
+MAX_SEGMENT_SIZE = 64 * 1024 * 1024
+
+INDEX_FILENAME = 'index.tsv'
+SUMMARY_FILENAME = 'summary.json'
+
+# Metadata fields recorded in each index line after the offset, so the summary can be counted from the index
+SUMMARY_FIELDS = ('category', 'language', 'source')
+
+# Cache of index path -> (index file size, {article_id: (segment, offset, length)})
+_index_cache = {}
+
+def _archive_dir(staging_dir, create=False):
+    archive_dir = os.path.join(str(staging_dir), 'archive')
+    if create:
+        os.makedirs(archive_dir, exist_ok=True)
+    return archive_dir
+
+def _index_field(value):
+    return str(value).replace('\t', ' ').replace('\n', ' ')
+
+def load_index(staging_dir):
+    """
+    Load the archive offset index.
+
+    The index is append-only, so a cached copy is extended with just the
+    lines written since it was last read.
+
+    Args:
+        staging_dir (str): Path to the staging directory
+
+    Returns:
+        dict: Mapping of article ID to (segment filename, offset, length)
+    """
+    index_path = os.path.join(_archive_dir(staging_dir), INDEX_FILENAME)
+    try:
+        size = os.path.getsize(index_path)
+    except FileNotFoundError:
+        return {}
+
+    read_to, index = _index_cache.get(index_path, (0, {}))
+    if read_to > size:
+        read_to, index = 0, {}
+
+    if read_to < size:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            f.seek(read_to)
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                read_to += len(line.encode('utf-8'))
+                parts = line.rstrip('\n').split('\t')
+                if len(parts) >= 4:
+                    article_id, segment, offset, length = parts[:4]
+                    index[article_id] = (segment, int(offset), int(length))
+        _index_cache[index_path] = (read_to, index)
+
+    return index
+
+def is_archived(staging_dir, article_id):
+    """Check whether an article has been moved to the archive."""
+    return article_id in load_index(staging_dir)
+
+def get_archived_article(staging_dir, article_id):
+    """
+    Read a single article back from the archive.
+
+    Args:
+        staging_dir (str): Path to the staging directory
+        article_id (str): The ID of the article
+
+    Returns:
+        dict: The archived record with 'id', 'status', 'metadata' and 'content',
+            or None if the article is not archived
+    """
+    entry = load_index(staging_dir).get(article_id)
+    if not entry:
+        return None
+
+    segment, offset, length = entry
+    with open(os.path.join(_archive_dir(staging_dir), segment), 'rb') as f:
+        f.seek(offset)
+        frame = f.read(length)
+
+    return json.loads(gzip.decompress(frame).decode('utf-8'))
+
+def _empty_summary():
+    return {
+        'total': 0,
+        'by_status': {},
+        'by_category': {},
+        'by_language': {},
+        'by_source': {},
+        'index_size': 0
+    }
+
+def get_archive_summary(staging_dir):
+    """
+    Get the running totals of archived articles.
+
+    The totals are counted from the index. summary.json caches them along
+    with the index size they cover, so only lines appended since are counted.
+
+    Returns:
+        dict: Counts by status, category, language and source
+    """
+    archive_dir = _archive_dir(staging_dir)
+    index_path = os.path.join(archive_dir, INDEX_FILENAME)
+    summary_path = os.path.join(archive_dir, SUMMARY_FILENAME)
+    try:
+        size = os.path.getsize(index_path)
+    except FileNotFoundError:
+        return _empty_summary()
+
+    summary = _empty_summary()
+    try:
+        with open(summary_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        # Summaries written before the index carried the counted fields cover the whole index
+        summary.update(cached, index_size=cached.get('index_size', size))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Error reading archive summary, counting it again from the index: {e}")
+    if summary['index_size'] > size:
+        summary = _empty_summary()
+    if summary['index_size'] == size:
+        return summary
+
+    with open(index_path, 'r', encoding='utf-8') as f:
+        f.seek(summary['index_size'])
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            summary['index_size'] += len(line.encode('utf-8'))
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) < 4:
+                continue
+            values = parts[4:5 + len(SUMMARY_FIELDS)] + ['unknown'] * (1 + len(SUMMARY_FIELDS))
+            summary['total'] += 1
+            for key, value in zip(['by_status', *(f'by_{field}' for field in SUMMARY_FIELDS)], values):
+                summary[key][value] = summary[key].get(value, 0) + 1
+
+    try:
+        write_json_atomic(summary_path, summary)
+    except OSError as e:
+        logger.warning(f"Error caching archive summary: {e}")
+    return summary
+
+def _current_segment(archive_dir):
+    """Return the name of the segment new frames should be appended to."""
+    segments = sorted(f for f in os.listdir(archive_dir) if f.startswith('segment-') and f.endswith('.gz'))
+    if segments and os.path.getsize(os.path.join(archive_dir, segments[-1])) < MAX_SEGMENT_SIZE:
+        return segments[-1]
+    number = int(segments[-1][8:-3]) + 1 if segments else 1
+    return f"segment-{number:05d}.gz"
+
+def _decision_time(metadata, status, path):
+    """Work out when an article was approved or rejected."""
+    date_str = metadata.get(f'{status}_date')
+    if date_str:
+        try:
+            return datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+def archive_articles(staging_dir, days=30, include_reviewed=True):
+    """
+    Move rejected and old reviewed articles into compressed archive segments.
+
+    Reviewed articles are only archived once they have been exported to
+    Obsidian, so nothing pending export is hidden away.
+
+    Args:
+        staging_dir (str): Path to the staging directory
+        days (int): Only archive articles decided on more than this many days ago
+        include_reviewed (bool): Whether to archive reviewed articles as well as rejected ones
+
+    Returns:
+        dict: Statistics about the archiving run
+    """
+    stats = {
+        'archived': 0,
+        'recovered': 0,
+        'skipped': 0,
+        'errors': 0,
+        'bytes_before': 0,
+        'bytes_after': 0
+    }
+
+    staging_dir = str(staging_dir)
+    cutoff = datetime.now() - timedelta(days=days)
+    sources = [('rejected', 'rejected')]
+    if include_reviewed:
+        sources.append(('reviewed', 'approved'))
+
+    with staging_lock(staging_dir, exclusive=True):
+        archive_dir = _archive_dir(staging_dir, create=True)
+        archived = load_index(staging_dir)
+        segment = _current_segment(archive_dir)
+        index_lines = []
+        archived_ids = []
+        archived_paths = []
+
+        with open(os.path.join(archive_dir, segment), 'ab') as seg:
+            for subdir, status in sources:
+                for article_id, path in list(iter_articles(staging_dir, subdir)):
+                    try:
+                        metadata_path = find_article(staging_dir, 'metadata', article_id)
+                        if article_id in archived:
+                            # Archived by a run that stopped before removing the live files
+                            archived_ids.append(article_id)
+                            archived_paths.extend(p for p in (path, metadata_path) if p)
+                            stats['recovered'] += 1
+                            continue
+
+                        metadata = {}
+                        if metadata_path:
+                            with open(metadata_path, 'r', encoding='utf-8') as f:
+                                metadata = json.load(f)
+
+                        if _decision_time(metadata, status, path) > cutoff:
+                            stats['skipped'] += 1
+                            continue
+                        if status == 'approved' and not metadata.get('exported_to_obsidian'):
+                            stats['skipped'] += 1
+                            continue
+
+                        with open(path, 'r', encoding='utf-8') as f:
+                            content = f.read()
+
+                        record = {
+                            'id': article_id,
+                            'status': status,
+                            'metadata': metadata,
+                            'content': content,
+                            'archived_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        }
+                        frame = gzip.compress(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+
+                        offset = seg.tell()
+                        seg.write(frame)
+                        fields = [status, *(metadata.get(field, 'unknown') for field in SUMMARY_FIELDS)]
+                        index_lines.append('\t'.join([article_id, segment, str(offset), str(len(frame)), *map(_index_field, fields)]) + '\n')
+                        archived_ids.append(article_id)
+                        archived_paths.append(path)
+                        if metadata_path:
+                            archived_paths.append(metadata_path)
+
+                        stats['archived'] += 1
+                        stats['bytes_after'] += len(frame)
+                        stats['bytes_before'] += os.path.getsize(path) + (os.path.getsize(metadata_path) if metadata_path else 0)
+
+                    except Exception as e:
+                        logger.error(f"Error archiving article {article_id}: {e}")
+                        stats['errors'] += 1
+
+            seg.flush()
+            os.fsync(seg.fileno())
+
+        # Only publish the offsets once the frames are safely on disk
+        if index_lines:
+            with open(os.path.join(archive_dir, INDEX_FILENAME), 'a', encoding='utf-8') as f:
+                f.writelines(index_lines)
+                f.flush()
+                os.fsync(f.fileno())
+            get_archive_summary(staging_dir)
+
+        for path in archived_paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+        # Archived articles stay searchable, but are marked as such
+        search_index = get_search_index(staging_dir)
+        for article_id in archived_ids:
+            search_index.update_status(article_id, 'archived')
+
+    # Outside the exclusive lock, which the snapshot lock would wait on
+    if archived_ids:
+        try:
+            get_snapshot(staging_dir).set_status(archived_ids, 'archived')
+        except Exception as e:
+            logger.warning(f"Error updating metadata snapshot for archived articles: {e}")
+
+    logger.info(f"Archived {stats['archived']} articles ({stats['bytes_before']} -> {stats['bytes_after']} bytes), "
+                f"{stats['recovered']} recovered, {stats['errors']} errors")
+    return stats
@@ -0,0 +1,242 @@
+"""
+Static asset post-processing for the digital garden.
+Fingerprints CSS and JavaScript filenames by content hash, rewrites the
+references in the generated pages, and writes precompressed .gz and .br
+siblings next to every text asset.
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+
+from scripts.rss_monitor.locking import write_json_atomic
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger('garden_assets')
+
+# Asset directories whose files get fingerprinted, with their extension
+FINGERPRINT_DIRS = {'css': '.css', 'js': '.js'}
+
+# Files that are worth serving precompressed
+COMPRESS_EXTENSIONS = {'.html', '.css', '.js', '.json', '.svg', '.xml', '.txt'}
+
+# Below this size compression does not pay for the extra request header overhead
+MIN_COMPRESS_SIZE = 256
+
+FINGERPRINT_LENGTH = 8
+_FINGERPRINTED_RE = re.compile(rf'\.[0-9a-f]{{{FINGERPRINT_LENGTH}}}$')
+
+# Slack for file systems with coarse mtimes when comparing against the last run
+MTIME_SLACK = 2
+
+# Whether the missing brotli package was already reported
+_brotli_warned = False
+
+def content_hash(data):
+    """Return the SHA-256 hex digest of some bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+def fingerprint_assets(output_dir):
+    """
+    Copy each CSS and JavaScript file to a name containing its content hash.
+
+    Fingerprinted copies of earlier versions are removed.
+
+    Args:
+        output_dir (Path): Root of the generated site
+
+    Returns:
+        dict: Mapping of original relative path to fingerprinted relative path
+    """
+    mapping = {}
+    for directory, ext in FINGERPRINT_DIRS.items():
+        asset_dir = output_dir / directory
+        if not asset_dir.is_dir():
+            continue
+
+        current = set()
+        sources = [p for p in asset_dir.glob(f'*{ext}') if not _FINGERPRINTED_RE.search(p.stem)]
+        for source in sorted(sources):
+            data = source.read_bytes()
+            target = source.with_name(f"{source.stem}.{content_hash(data)[:FINGERPRINT_LENGTH]}{ext}")
+            if not target.exists():
+                target.write_bytes(data)
+            current.add(target.name)
+            mapping[f"{directory}/{source.name}"] = f"{directory}/{target.name}"
+
+        for old in asset_dir.glob(f'*{ext}'):
+            if _FINGERPRINTED_RE.search(old.stem) and old.name not in current:
+                old.unlink()
+
+    return mapping
+
+def reference_rewriter(mapping):
+    """
+    Build a function that points the asset references in a page at the fingerprinted files.
+
+    References to the original name and to any earlier fingerprint are both
+    rewritten, so pages that are not regenerated on every build stay current.
+
+    Args:
+        mapping (dict): As returned by fingerprint_assets
+
+    Returns:
+        callable: Takes the text of a page and returns the rewritten text
+    """
+    patterns = []
+    for original, fingerprinted in mapping.items():
+        base, ext = os.path.splitext(original)
+        pattern = re.compile(rf'(?<=["\'/]){re.escape(base)}(?:\.[0-9a-f]{{{FINGERPRINT_LENGTH}}})?{re.escape(ext)}(?=["\'?#])')
+        patterns.append((pattern, fingerprinted))
+
+    def rewrite(text):
+        for pattern, fingerprinted in patterns:
+            text = pattern.sub(fingerprinted, text)
+        return text
+
+    return rewrite
+
+def load_asset_state(cache_dir):
+    """
+    Read the fingerprint mapping and time of the last asset run.
+
+    Args:
+        cache_dir (str): Directory for build state kept between runs
+
+    Returns:
+        dict: {'mapping': dict, 'time': float}, empty values if there was no run yet
+    """
+    try:
+        with open(Path(cache_dir) / 'assets.json', 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return {'mapping': state['mapping'], 'time': state['time']}
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        return {'mapping': {}, 'time': None}
+
+def rewrite_references(output_dir, mapping, since=None):
+    """
+    Point the asset references in the HTML pages at the fingerprinted files.
+
+    Args:
+        output_dir (Path): Root of the generated site
+        mapping (dict): As returned by fingerprint_assets
+        since (float, optional): Only pages modified after this time are read,
+            for when the mapping did not change since the pages were last rewritten
+
+    Returns:
+        int: Number of pages rewritten
+    """
+    if not mapping:
+        return 0
+
+    rewrite = reference_rewriter(mapping)
+    rewritten = 0
+    for page in output_dir.rglob('*.html'):
+        if since is not None and page.stat().st_mtime < since - MTIME_SLACK:
+            continue
+        text = page.read_text(encoding='utf-8')
+        updated = rewrite(text)
+        if updated != text:
+            page.write_text(updated, encoding='utf-8')
+            rewritten += 1
+
+    return rewritten
+
+def compress_assets(output_dir, cache_path):
+    """
+    Write .gz and .br siblings for the text assets of the site.
+
+    A file is only recompressed when its content hash differs from the one
+    recorded in the cache, so pages rewritten with identical content are
+    skipped. Siblings whose source file is gone are removed.
+
+    Args:
+        output_dir (Path): Root of the generated site
+        cache_path (Path): JSON file recording the hash of each compressed file
+
+    Returns:
+        dict: Statistics about the compression run
+    """
+    stats = {'compressed': 0, 'unchanged': 0, 'removed': 0}
+    suffixes = ['.gz'] + (['.br'] if brotli else [])
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        cache = {}
+
+    hashes = {}
+    for root, dirs, files in os.walk(output_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for filename in files:
+            path = Path(root) / filename
+            if path.suffix in ('.gz', '.br'):
+                if not path.with_suffix('').exists():
+                    path.unlink()
+                    stats['removed'] += 1
+                continue
+            if path.suffix not in COMPRESS_EXTENSIONS:
+                continue
+
+            data = path.read_bytes()
+            if len(data) < MIN_COMPRESS_SIZE:
+                continue
+
+            rel_path = path.relative_to(output_dir).as_posix()
+            digest = content_hash(data)
+            hashes[rel_path] = digest
+            if cache.get(rel_path) == digest and all(Path(f"{path}{suffix}").exists() for suffix in suffixes):
+                stats['unchanged'] += 1
+                continue
+
+            # mtime=0 keeps the output byte-identical across builds
+            Path(f"{path}.gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli:
+                Path(f"{path}.br").write_bytes(brotli.compress(data, quality=11))
+            stats['compressed'] += 1
+
+    os.makedirs(os.path.dirname(str(cache_path)), exist_ok=True)
+    write_json_atomic(cache_path, hashes)
+    return stats
+
+def process_assets(output_dir, cache_dir):
+    """
+    Run the asset stage over a generated site.
+
+    Args:
+        output_dir (str): Root of the generated site
+        cache_dir (str): Directory for build state kept between runs
+
+    Returns:
+        dict: Statistics about the asset stage
+    """
+    global _brotli_warned
+    output_dir = Path(output_dir)
+    if brotli is None and not _brotli_warned:
+        logger.warning("brotli is not installed, writing .gz files only (pip install brotli)")
+        _brotli_warned = True
+
+    previous = load_asset_state(cache_dir)
+    mapping = fingerprint_assets(output_dir)
+    # With the same fingerprints only the pages written since the last run can hold stale references
+    since = previous['time'] if mapping == previous['mapping'] else None
+    stats = {
+        'fingerprinted': len(mapping),
+        'pages_rewritten': rewrite_references(output_dir, mapping, since)
+    }
+    os.makedirs(cache_dir, exist_ok=True)
+    write_json_atomic(Path(cache_dir) / 'assets.json', {'mapping': mapping, 'time': time.time()})
+    stats.update(compress_assets(output_dir, Path(cache_dir) / 'compressed.json'))
+
+    logger.info(f"Processed assets in {output_dir}: {stats}")
+    return stats
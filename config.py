@@ -41,26 +41,8 @@ RSS_FEEDS = [
     {"url": "https://www.eleconomista.es/rss/rss-categoria.php?categoria=tecnologia", "category": "journalism", "language": "es", "source": "El Economista"},
 ]
 
-# Keywords to filter content related to AI governance
-AI_GOVERNANCE_KEYWORDS = [
-    # English keywords
-    "ai governance", "artificial intelligence governance", "ai regulation", "ai policy", 
-    "ai ethics", "responsible ai", "ai safety", "ai principles", "ai framework",
-    "algorithmic governance", "ai oversight", "ai transparency", "ai accountability",
-    
-    # Spanish keywords
-    "gobernanza de la ia", "gobernanza de la inteligencia artificial", "regulación de la ia",
-    "política de ia", "ética de la ia", "ia responsable", "seguridad de la ia",
-    
-    # Chinese keywords (simplified)
-    "人工智能治理", "人工智能监管", "人工智能政策", "人工智能伦理", "负责任的人工智能",
-    
-    # Japanese keywords
-    "AI ガバナンス", "人工知能ガバナンス", "AI 規制", "AI 政策", "AI 倫理",
-    
-    # Russian keywords
-    "управление ии", "регулирование искусственного интеллекта", "политика ии", "этика ии"
-]
+# Keywords to filter content are configured per language in feeds.json, next to pipeline.json
+# (created from the defaults in rss_monitor/core.py)
 
 # Configuration for the staging area
 STAGING_DIR = "/home/ubuntu/ai-governance-aggregator/staging"
@@ -7,31 +7,306 @@ This script connects the RSS monitoring system, Obsidian workflow, and digital g
 import os
 import sys
 import json
+import time
 import shutil
 import logging
 import argparse
+import hashlib
 import datetime
 import subprocess
+from html import escape
+from contextlib import nullcontext
 from pathlib import Path
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import modules from the project
-from scripts.rss_monitor.core import run_once, setup_directories
+from scripts.rss_monitor.core import run_once, setup_directories, use_config
+from scripts.rss_monitor.locking import write_json_atomic
+from scripts.rss_monitor.logging_setup import configure_logging
+from scripts.rss_monitor.profiling import RunProfiler
+from scripts.rss_monitor.layout import iter_articles
+from scripts.rss_monitor.watcher import FileWatcher, WatchUnavailable
 from scripts.workflow_integration import WorkflowIntegration
+from scripts.obsidian_integration.vault import iter_note_headers, read_note
+from scripts.obsidian_integration.garden_search import GardenSearchIndex
+from scripts.obsidian_integration.tag_index import build_tag_index, write_tag_index
+from scripts.obsidian_integration.related import RelatedArticles
+from scripts.obsidian_integration.assets import process_assets, load_asset_state, reference_rewriter
+from scripts.obsidian_integration.render import FragmentRenderer, resolve_links
+from scripts.obsidian_integration.links import LinkGraph
+from scripts.obsidian_integration.vault import slugify, write_text_if_changed, EXCLUDED_DIRS
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'pipeline.log')),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger('content_pipeline')
 
+# Manifest of deployed file hashes, kept inside the .git directory of the deploy clone
+DEPLOY_MANIFEST_FILENAME = 'garden-deploy.json'
+
+# Template for individual article pages
+ARTICLE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - AI Governance Digital Garden</title>
+    <meta name="description" content="{description}">
+    <link rel="stylesheet" href="../css/style.css">
+    <link rel="icon" href="../static/favicon.ico">
+</head>
+<body>
+    <header>
+        <div class="container">
+            <h1 class="site-title">AI Governance Digital Garden</h1>
+            <p class="site-description">A curated collection of AI Governance content from around the world</p>
+            
+            <nav>
+                <button id="menu-toggle" aria-expanded="false" class="mobile-menu-toggle">
+                    <span class="visually-hidden">Menu</span>
+                    <span class="hamburger"></span>
+                </button>
+                
+                <ul id="mobile-nav">
+                    <li><a href="../index.html">Home</a></li>
+                    <li><a href="../about.html">About</a></li>
+                    <li><a href="../categories.html">Categories</a></li>
+                    <li><a href="../languages.html">Languages</a></li>
+                </ul>
+            </nav>
+        </div>
+    </header>
+    
+    <div class="container">
+        <main>
+            <article class="content full-article {source_class}">
+                <h1>{title}</h1>
+                
+                <div class="article-meta">
+                    <span class="language-indicator {lang_class}">{lang}</span>
+                    <span class="source">{source}</span>
+                    <span class="date">{date}</span>
+                </div>
+                
+                <div class="tag-container">
+                    {tags}
+                </div>
+                
+                <div class="article-content">
+                    {content}
+                </div>
+                
+                <div class="article-footer">
+                    <p>Original source: <a href="{url}" target="_blank">{url}</a></p>
+                    <p>Added to AI Governance Digital Garden on {added_date}</p>
+                </div>
+            </article>
+            
+            <aside class="sidebar">
+                <div class="sidebar-section">
+                    <h2>Search</h2>
+                    <input type="search" id="search-input" class="search-input" placeholder="Search the garden..." autocomplete="off">
+                    <div id="search-results" class="search-results"></div>
+                </div>
+                
+                <div class="sidebar-section">
+                    <h2>Related Articles</h2>
+                    <ul class="related-list">
+                        {related_articles}
+                    </ul>
+                </div>
+                {backlinks}
+                <div class="sidebar-section">
+                    <h2>Filter by Tags</h2>
+                    <div class="tag-cloud">
+                        {all_tags}
+                    </div>
+                </div>
+            </aside>
+        </main>
+    </div>
+    
+    <footer>
+        <div class="container">
+            <p>AI Governance Digital Garden © 2025</p>
+            <p>Content is automatically aggregated from various sources and reviewed before publishing.</p>
+            <p>Built with <a href="https://obsidian.md/">Obsidian</a> and the <a href="https://github.com/oleeskild/obsidian-digital-garden">Digital Garden plugin</a>.</p>
+        </div>
+    </footer>
+    
+    <script src="../js/main.js"></script>
+</body>
+</html>"""
+
+# Sidebar section listing the articles that link to an article, left out when there are none
+BACKLINKS_SECTION = """
+                <div class="sidebar-section">
+                    <h2>Linked Mentions</h2>
+                    <ul class="related-list">
+                        {backlinks}
+                    </ul>
+                </div>
+"""
+
+# Template for tag listing pages
+TAG_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>#{tag} - AI Governance Digital Garden</title>
+    <meta name="description" content="AI Governance articles tagged {tag}">
+    <link rel="stylesheet" href="../css/style.css">
+    <link rel="icon" href="../static/favicon.ico">
+</head>
+<body>
+    <header>
+        <div class="container">
+            <h1 class="site-title">AI Governance Digital Garden</h1>
+            <p class="site-description">A curated collection of AI Governance content from around the world</p>
+            
+            <nav>
+                <button id="menu-toggle" aria-expanded="false" class="mobile-menu-toggle">
+                    <span class="visually-hidden">Menu</span>
+                    <span class="hamburger"></span>
+                </button>
+                
+                <ul id="mobile-nav">
+                    <li><a href="../index.html">Home</a></li>
+                    <li><a href="../about.html">About</a></li>
+                    <li><a href="../categories.html">Categories</a></li>
+                    <li><a href="../languages.html">Languages</a></li>
+                </ul>
+            </nav>
+        </div>
+    </header>
+    
+    <div class="container">
+        <div id="active-tags" class="active-tags-container" style="display: none;">
+            <h3>Active Filters:</h3>
+        </div>
+        
+        <main>
+            <section class="content">
+                <h1>#{tag}</h1>
+                <p>{count} articles</p>
+                
+                <div class="article-list">
+                    {articles}
+                </div>
+            </section>
+            
+            <aside class="sidebar">
+                <div class="sidebar-section">
+                    <h2>Filter by Tags</h2>
+                    <div class="tag-cloud">
+                        {all_tags}
+                    </div>
+                </div>
+            </aside>
+        </main>
+    </div>
+    
+    <footer>
+        <div class="container">
+            <p>AI Governance Digital Garden © 2025</p>
+            <p>Content is automatically aggregated from various sources and reviewed before publishing.</p>
+            <p>Built with <a href="https://obsidian.md/">Obsidian</a> and the <a href="https://github.com/oleeskild/obsidian-digital-garden">Digital Garden plugin</a>.</p>
+        </div>
+    </footer>
+    
+    <script src="../js/main.js"></script>
+</body>
+</html>"""
+
+
+# Listing pages (index, categories, languages, sources) are streamed in three parts:
+# the head, one article card at a time, and the tail
+LISTING_PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - AI Governance Digital Garden</title>
+    <meta name="description" content="{description}">
+    <link rel="stylesheet" href="{base}css/style.css">
+    <link rel="icon" href="{base}static/favicon.ico">
+</head>
+<body>
+    <header>
+        <div class="container">
+            <h1 class="site-title">AI Governance Digital Garden</h1>
+            <p class="site-description">A curated collection of AI Governance content from around the world</p>
+            
+            <nav>
+                <button id="menu-toggle" aria-expanded="false" class="mobile-menu-toggle">
+                    <span class="visually-hidden">Menu</span>
+                    <span class="hamburger"></span>
+                </button>
+                
+                <ul id="mobile-nav">
+                    <li><a href="{base}index.html">Home</a></li>
+                    <li><a href="{base}about.html">About</a></li>
+                    <li><a href="{base}categories.html">Categories</a></li>
+                    <li><a href="{base}languages.html">Languages</a></li>
+                </ul>
+            </nav>
+        </div>
+    </header>
+    
+    <div class="container">
+        <div id="active-tags" class="active-tags-container" style="display: none;">
+            <h3>Active Filters:</h3>
+        </div>
+        
+        <main>
+            <section class="content">
+                <h1>{heading}</h1>
+                <p>{summary}</p>
+                
+                <div class="article-list">
+"""
+
+LISTING_PAGE_TAIL = """                </div>
+                
+                {pagination}
+            </section>
+            
+            <aside class="sidebar">
+                <div class="sidebar-section">
+                    <h2>Search</h2>
+                    <input type="search" id="search-input" class="search-input" placeholder="Search the garden..." autocomplete="off">
+                    <div id="search-results" class="search-results"></div>
+                </div>
+                
+                <div class="sidebar-section">
+                    <h2>Filter by Tags</h2>
+                    <div class="tag-cloud">
+                        {all_tags}
+                    </div>
+                </div>
+            </aside>
+        </main>
+    </div>
+    
+    <footer>
+        <div class="container">
+            <p>AI Governance Digital Garden © 2025</p>
+            <p>Content is automatically aggregated from various sources and reviewed before publishing.</p>
+            <p>Built with <a href="https://obsidian.md/">Obsidian</a> and the <a href="https://github.com/oleeskild/obsidian-digital-garden">Digital Garden plugin</a>.</p>
+        </div>
+    </footer>
+    
+    <script src="{base}js/main.js"></script>
+</body>
+</html>"""
+
+# Bump when the listing templates change, so every listing page is rewritten once
+LISTING_TEMPLATE_VERSION = 1
+
+# Number of article cards per listing page
+DEFAULT_LISTING_PAGE_SIZE = 20
+
+
 class ContentPipeline:
     """Class to manage the automated content pipeline."""
     
@@ -45,12 +320,24 @@ class ContentPipeline:
         self.config_path = config_path
         self.load_config()
         
+        # The feed registry lives next to the configuration file
+        use_config(config_path)
+        
         # Set up paths
         self.project_root = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.staging_dir = Path(self.config['staging_dir'])
         self.obsidian_vault_path = Path(self.config['obsidian_vault_path'])
         self.digital_garden_path = Path(self.config['digital_garden_path'])
         
+        # Build state that must survive between runs but is not part of the published site
+        self.build_cache_dir = self.staging_dir / 'garden-cache'
+        
+        # Set to a RunProfiler to profile each stage of a run
+        self.profiler = None
+        
+        # Points asset references at the fingerprinted files of the last build
+        self.rewrite_assets = reference_rewriter({})
+        
         # Initialize workflow integration
         self.workflow = WorkflowIntegration(
             self.staging_dir,
@@ -117,30 +404,41 @@ class ContentPipeline:
             'errors': []
         }
         
+        # Profile files describe the latest run only
+        if self.profiler:
+            self.profiler.stages.clear()
+        
         try:
             # Step 1: Run RSS monitoring
             logger.info("Running RSS monitoring...")
-            rss_stats = run_once()
+            with self.profile_stage('rss_monitoring'):
+                rss_stats = run_once()
             stats['rss_monitoring'] = rss_stats
             
             # Step 2: Run workflow integration
             logger.info("Running workflow integration...")
-            workflow_stats = self.workflow.run_complete_workflow(
-                auto_approve=self.config.get('auto_approve', False)
-            )
+            with self.profile_stage('workflow'):
+                workflow_stats = self.workflow.run_complete_workflow(
+                    auto_approve=self.config.get('auto_approve', False)
+                )
             stats['workflow'] = workflow_stats
             
             # Step 3: Generate digital garden website
             logger.info("Generating digital garden website...")
-            digital_garden_success = self.generate_digital_garden()
+            with self.profile_stage('digital_garden'):
+                digital_garden_success = self.generate_digital_garden()
             stats['digital_garden'] = digital_garden_success
             
             # Step 4: Deploy to GitHub Pages if configured
             if self.config.get('auto_publish', False) and self.config.get('github_pages_repo'):
                 logger.info("Deploying to GitHub Pages...")
-                github_pages_success = self.deploy_to_github_pages()
+                with self.profile_stage('github_pages'):
+                    github_pages_success = self.deploy_to_github_pages()
                 stats['github_pages'] = github_pages_success
             
+            if self.profiler:
+                stats['profile'] = self.profiler.write_summary()
+            
             logger.info(f"Pipeline run completed: {stats}")
             return stats
         
@@ -150,6 +448,18 @@ class ContentPipeline:
             stats['errors'].append(error_msg)
             return stats
     
+    def profile_stage(self, name):
+        """
+        Profile a stage of the run if profiling is enabled.
+        
+        Args:
+            name (str): Name of the stage
+            
+        Returns:
+            A context manager wrapping the stage
+        """
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+    
     def generate_digital_garden(self):
         """
         Generate the digital garden website from Obsidian content.
@@ -163,10 +473,40 @@ class ContentPipeline:
             
             # Create articles directory if it doesn't exist
             articles_dir = self.digital_garden_path / 'articles'
-            articles_dir.mkdir(exist_ok=True)
+            articles_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Pages are written with the fingerprinted asset names of the last build, so unchanged pages compare equal
+            self.rewrite_assets = reference_rewriter(load_asset_state(self.build_cache_dir)['mapping'])
+            
+            # Notes are streamed from their headers and never all held in memory: one
+            # pass feeds the related articles, link graph and search index, which keep
+            # only what they derive from each note, and the pages read notes again one by one
+            headers = self.load_vault_headers()
+            tag_index = build_tag_index(headers)
+            related = RelatedArticles(self.build_cache_dir / 'related.json')
+            link_graph = LinkGraph(self.build_cache_dir / 'links.json')
+            search_index = GardenSearchIndex()
+            for note in self.iter_vault_notes(headers):
+                related.add(note)
+                link_graph.add(note)
+                search_index.add(note)
+            
+            # Build article pages from the notes in the Obsidian vault
+            self.generate_article_pages(headers, articles_dir, tag_index, related.compute()[0], link_graph.build()[0])
+            
+            # Write the tag index and one listing page per tag
+            write_tag_index(tag_index, self.digital_garden_path / 'tags' / 'index.json')
+            self.generate_tag_pages(headers, tag_index)
+            
+            # Write the paginated index, category, language and source listings
+            if headers:
+                self.generate_listing_pages(headers, tag_index)
             
-            # Copy example article templates for demonstration
-            example_articles = [
+            # Write the prebuilt client-side search index
+            search_index.write(self.digital_garden_path / 'search')
+            
+            # Fall back to example articles for demonstration while the vault is empty
+            example_articles = [] if headers else [
                 '2025-04-07-unesco-new-ai-ethics-framework.html',
                 '2025-04-05-new-research-ai-governance-models.html',
                 '2025-04-03-g20-ai-governance-framework.html',
@@ -174,93 +514,6 @@ class ContentPipeline:
                 '2025-04-01-japan-ai-ethics-guidelines.html'
             ]
             
-            # Create a simple article template
-            article_template = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - AI Governance Digital Garden</title>
-    <meta name="description" content="{description}">
-    <link rel="stylesheet" href="../css/style.css">
-    <link rel="icon" href="../static/favicon.ico">
-</head>
-<body>
-    <header>
-        <div class="container">
-            <h1 class="site-title">AI Governance Digital Garden</h1>
-            <p class="site-description">A curated collection of AI Governance content from around the world</p>
-            
-            <nav>
-                <button id="menu-toggle" aria-expanded="false" class="mobile-menu-toggle">
-                    <span class="visually-hidden">Menu</span>
-                    <span class="hamburger"></span>
-                </button>
-                
-                <ul id="mobile-nav">
-                    <li><a href="../index.html">Home</a></li>
-                    <li><a href="../about.html">About</a></li>
-                    <li><a href="../categories.html">Categories</a></li>
-                    <li><a href="../languages.html">Languages</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-    
-    <div class="container">
-        <main>
-            <article class="content full-article {source_class}">
-                <h1>{title}</h1>
-                
-                <div class="article-meta">
-                    <span class="language-indicator {lang_class}">{lang}</span>
-                    <span class="source">{source}</span>
-                    <span class="date">{date}</span>
-                </div>
-                
-                <div class="tag-container">
-                    {tags}
-                </div>
-                
-                <div class="article-content">
-                    {content}
-                </div>
-                
-                <div class="article-footer">
-                    <p>Original source: <a href="{url}" target="_blank">{url}</a></p>
-                    <p>Added to AI Governance Digital Garden on {added_date}</p>
-                </div>
-            </article>
-            
-            <aside class="sidebar">
-                <div class="sidebar-section">
-                    <h2>Related Articles</h2>
-                    <ul class="related-list">
-                        {related_articles}
-                    </ul>
-                </div>
-                
-                <div class="sidebar-section">
-                    <h2>Filter by Tags</h2>
-                    <div class="tag-cloud">
-                        {all_tags}
-                    </div>
-                </div>
-            </aside>
-        </main>
-    </div>
-    
-    <footer>
-        <div class="container">
-            <p>AI Governance Digital Garden © 2025</p>
-            <p>Content is automatically aggregated from various sources and reviewed before publishing.</p>
-            <p>Built with <a href="https://obsidian.md/">Obsidian</a> and the <a href="https://github.com/oleeskild/obsidian-digital-garden">Digital Garden plugin</a>.</p>
-        </div>
-    </footer>
-    
-    <script src="../js/main.js"></script>
-</body>
-</html>"""
             
             # Create example articles
             for i, article_filename in enumerate(example_articles):
@@ -296,6 +549,7 @@ class ContentPipeline:
                     'related_articles': ''.join([f'<li><a href="{rel_art}">{rel_title}</a></li>' for rel_art, rel_title in 
                                               [(art, ' '.join(art.split('-')[3:]).replace('.html', '').split('-')) 
                                                for art in example_articles if art != article_filename][:3]]),
+                    'backlinks': '',
                     'content': f"""<p>This is a sample article about {title}. In a real implementation, this content would be generated from the Obsidian vault.</p>
                     <p>The article would include <span class="highlight">highlighted key points</span> as specified by the user preferences.</p>
                     <p>It would also include <span class="highlight">longer excerpts with detailed information</span> about the topic.</p>
@@ -311,7 +565,7 @@ class ContentPipeline:
                 
                 # Create article file
                 with open(article_path, 'w', encoding='utf-8') as f:
-                    f.write(article_template.format(**article_data))
+                    f.write(ARTICLE_TEMPLATE.format(**article_data))
             
             # Create categories and languages directories
             (self.digital_garden_path / 'categories').mkdir(exist_ok=True)
@@ -326,6 +580,9 @@ class ContentPipeline:
             with open(static_dir / 'favicon.ico', 'wb') as f:
                 f.write(b'\x00\x00\x01\x00\x01\x00\x01\x01\x00\x00\x01\x00\x18\x00\x30\x00\x00\x00\x16\x00\x00\x00\x28\x00\x00\x00\x01\x00\x00\x00\x01\x00\x00\x00\x01\x00\x18\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00')
             
+            # Fingerprint CSS/JS and write precompressed copies of the text assets
+            process_assets(self.digital_garden_path, self.build_cache_dir)
+            
             logger.info(f"Generated digital garden website at {self.digital_garden_path}")
             return True
         
@@ -333,6 +590,345 @@ class ContentPipeline:
             logger.error(f"Error generating digital garden: {e}")
             return False
     
+    def load_vault_headers(self):
+        """
+        Read the frontmatter of the article notes that make up the digital garden.
+        
+        Returns:
+            list: Note headers as returned by read_note_header, newest first, one per garden page
+        """
+        headers = {}
+        for header in iter_note_headers(self.obsidian_vault_path):
+            # The same article can be in the vault twice (export and import); publish it once
+            headers.setdefault(header['page'], header)
+        
+        return sorted(headers.values(), key=lambda h: h['date'], reverse=True)
+    
+    def iter_vault_notes(self, headers):
+        """
+        Read the article notes that make up the digital garden, one at a time.
+        
+        Args:
+            headers (list): Note headers as returned by load_vault_headers
+            
+        Yields:
+            dict: Notes from the Obsidian vault, in the order of the headers
+        """
+        for header in headers:
+            try:
+                yield read_note(Path(header['path']), self.obsidian_vault_path)
+            except Exception as e:
+                logger.error(f"Error reading vault note {header['path']}: {e}")
+    
+    def render_tag_cloud(self, tag_index, base='../'):
+        """
+        Render the tag cloud from the tag index, most used tags first.
+        
+        Args:
+            tag_index (dict): Index as returned by build_tag_index
+            base (str): Relative path from the page to the site root
+            
+        Returns:
+            str: HTML for the tag cloud
+        """
+        return ''.join([
+            f'<a href="{base}tags/{slugify(tag["name"])}.html" class="tag" data-tag="{escape(tag["name"])}">{escape(tag["name"])} <span class="tag-count">{tag["count"]}</span></a>'
+            for tag in tag_index['tags']
+        ])
+    
+    def render_article_card(self, note, base='../'):
+        """
+        Render a note as an article card for listing pages.
+        
+        Args:
+            note (dict): The note to render
+            base (str): Relative path from the page to the site root
+            
+        Returns:
+            str: HTML for the article card
+        """
+        lang = (note['language'] or 'en').split('-')[0].lower()
+        href = f"{base}articles/{note['page']}"
+        tags = ''.join([f'<a href="{base}tags/{slugify(tag)}.html" class="tag" data-tag="{escape(tag)}">{escape(tag)}</a>' for tag in note['tags']])
+        
+        return f"""<article class="article" data-article="{escape(note['page'])}" data-tags="{escape(','.join(note['tags']))}">
+                        <h2 class="article-title"><a href="{href}">{escape(note['title'])}</a></h2>
+                        <div class="article-meta">
+                            <span class="language-indicator lang-{lang}">{lang.upper()}</span>
+                            <span class="source">{escape(note['source'])}</span>
+                            <span class="date">{escape(note['date'].split(' ')[0])}</span>
+                        </div>
+                        <div class="tag-container">{tags}</div>
+                        <div class="article-excerpt">
+                            <p>{escape(note['summary'])}</p>
+                            <a href="{href}" class="read-more">Read more →</a>
+                        </div>
+                    </article>"""
+    
+    def generate_tag_pages(self, headers, tag_index):
+        """
+        Write one listing page per tag from the tag index.
+        
+        As with the listings, a tag page is only rendered when its articles
+        (or their files, or the tag cloud) changed since the last build,
+        reading the notes of its cards one at a time.
+        
+        Args:
+            headers (list): Note headers as returned by load_vault_headers, in tag index order
+            tag_index (dict): Index as returned by build_tag_index
+        """
+        tags_dir = self.digital_garden_path / 'tags'
+        tags_dir.mkdir(parents=True, exist_ok=True)
+        all_tags = self.render_tag_cloud(tag_index)
+        cache_path = self.build_cache_dir / 'tag-pages.json'
+        
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (FileNotFoundError, ValueError):
+            previous = {}
+        
+        tag_cloud_hash = hashlib.md5(all_tags.encode('utf-8')).hexdigest()
+        signatures = {}
+        written = 0
+        
+        for tag in tag_index['tags']:
+            filename = f"{slugify(tag['name'])}.html"
+            articles = [headers[number] for number in tag_index['postings'][tag['name']]]
+            signature = hashlib.md5(json.dumps([
+                LISTING_TEMPLATE_VERSION, tag['name'], tag_cloud_hash,
+                [[header['page'], header['stamp']] for header in articles]
+            ]).encode('utf-8')).hexdigest()
+            signatures[filename] = signature
+            if previous.get(filename) == signature and (tags_dir / filename).exists():
+                continue
+            
+            page = TAG_PAGE_TEMPLATE.format(
+                tag=escape(tag['name']),
+                count=tag['count'],
+                articles='\n'.join(self.render_article_card(note) for note in self.iter_vault_notes(articles)),
+                all_tags=all_tags
+            )
+            write_text_if_changed(tags_dir / filename, self.rewrite_assets(page))
+            written += 1
+        
+        self.build_cache_dir.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(cache_path, signatures)
+        
+        # Remove pages for tags that are no longer used
+        current_pages = {f"{slugify(tag['name'])}.html" for tag in tag_index['tags']}
+        for page in tags_dir.glob('*.html'):
+            if page.name not in current_pages:
+                page.unlink()
+        
+        logger.info(f"Generated {len(tag_index['tags'])} tag pages in {tags_dir}, {written} rendered")
+    
+    def generate_listing_pages(self, headers, tag_index):
+        """
+        Write the paginated index, category, language and source listings.
+        
+        Listings are grouped and paginated from the note headers alone. A page
+        is only rewritten when its window of articles (or their files, the
+        page count or the tag cloud) changed since the last build, and is
+        then streamed to disk one article card at a time, reading each note
+        as its card is written.
+        
+        Args:
+            headers (list): Note headers as returned by load_vault_headers, newest first
+            tag_index (dict): Index as returned by build_tag_index
+            
+        Returns:
+            dict: Statistics about the listing pages
+        """
+        stats = {'pages': 0, 'written': 0, 'removed': 0}
+        page_size = self.config.get('listing_page_size', DEFAULT_LISTING_PAGE_SIZE)
+        cache_path = self.build_cache_dir / 'listings.json'
+        
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (FileNotFoundError, ValueError):
+            previous = {}
+        
+        tag_cloud_hash = hashlib.md5(json.dumps(tag_index['tags'], sort_keys=True).encode('utf-8')).hexdigest()
+        tag_clouds = {base: self.render_tag_cloud(tag_index, base) for base in ('', '../')}
+        signatures = {}
+        overviews = {}
+        
+        for directory, name, title, group in self.iter_listing_groups(headers):
+            base = '../' if directory else ''
+            if directory:
+                overviews.setdefault(directory, []).append((name, title, len(group)))
+            total_pages = max(1, (len(group) + page_size - 1) // page_size)
+            
+            for number in range(1, total_pages + 1):
+                window = group[(number - 1) * page_size:number * page_size]
+                rel_path = f"{directory}/{self.listing_filename(name, number)}" if directory else self.listing_filename(name, number)
+                signature = hashlib.md5(json.dumps([
+                    LISTING_TEMPLATE_VERSION, title, number, total_pages, len(group), tag_cloud_hash,
+                    [[header['page'], header['stamp']] for header in window]
+                ]).encode('utf-8')).hexdigest()
+                signatures[rel_path] = signature
+                stats['pages'] += 1
+                
+                output_path = self.digital_garden_path / rel_path
+                if previous.get(rel_path) == signature and output_path.exists():
+                    continue
+                
+                self.write_listing_page(output_path, window, base=base, title=title, name=name,
+                                        number=number, total_pages=total_pages, total=len(group),
+                                        all_tags=tag_clouds[base])
+                stats['written'] += 1
+        
+        # One overview page per dimension, linking to the first page of each listing
+        for directory, groups in overviews.items():
+            links = ''.join(
+                f'<li><a href="{directory}/{self.listing_filename(name, 1)}">{escape(title)}</a> <span class="tag-count">{count}</span></li>'
+                for name, title, count in groups
+            )
+            page = (LISTING_PAGE_HEAD.format(base='', title=directory.title(), description=escape(f"AI Governance articles by {directory}"),
+                                             heading=directory.title(), summary=f"{len(groups)} {directory}")
+                    + f'<ul class="listing-overview">{links}</ul>\n'
+                    + LISTING_PAGE_TAIL.format(base='', pagination='', all_tags=tag_clouds['']))
+            write_text_if_changed(self.digital_garden_path / f"{directory}.html", self.rewrite_assets(page))
+        
+        # Remove pages that fell off the end of a listing, or whose group is gone
+        for rel_path in set(previous) - set(signatures):
+            try:
+                (self.digital_garden_path / rel_path).unlink()
+                stats['removed'] += 1
+            except FileNotFoundError:
+                pass
+        
+        self.build_cache_dir.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(cache_path, signatures)
+        
+        logger.info(f"Generated listing pages: {stats}")
+        return stats
+    
+    def iter_listing_groups(self, headers):
+        """
+        Group note headers into listings, keeping the newest-first order of each group.
+        
+        Args:
+            headers (list): Note headers as returned by load_vault_headers
+            
+        Yields:
+            tuple: (directory, file name stem, title, headers) for each listing
+        """
+        yield '', 'index', 'Latest Articles', headers
+        
+        dimensions = [
+            ('categories', lambda header: header['category'] or 'uncategorized', lambda key: key.replace('_', ' ').title()),
+            ('languages', lambda header: (header['language'] or 'unknown').split('-')[0].lower(), lambda key: key.upper()),
+            ('sources', lambda header: header['source'] or 'Unknown', lambda key: key)
+        ]
+        for directory, key_of, label in dimensions:
+            groups = {}
+            for header in headers:
+                groups.setdefault(key_of(header), []).append(header)
+            for key in sorted(groups):
+                yield directory, slugify(key), label(key), groups[key]
+    
+    def listing_filename(self, name, number):
+        """Return the file name of page `number` of a listing, e.g. 'index.html' or 'index-2.html'."""
+        return f"{name}.html" if number == 1 else f"{name}-{number}.html"
+    
+    def write_listing_page(self, output_path, window, base, title, name, number, total_pages, total, all_tags):
+        """
+        Stream one listing page to disk.
+        
+        The page is written to a temporary file card by card and moved into
+        place when complete, so readers never see a half-written page.
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        pagination = ''
+        if total_pages > 1:
+            links = []
+            if number > 1:
+                links.append(f'<a href="{self.listing_filename(name, number - 1)}" class="pagination-prev">← Newer</a>')
+            links.append(f'<span class="pagination-status">Page {number} of {total_pages}</span>')
+            if number < total_pages:
+                links.append(f'<a href="{self.listing_filename(name, number + 1)}" class="pagination-next">Older →</a>')
+            pagination = f'<nav class="pagination">{"".join(links)}</nav>'
+        
+        temp_path = output_path.with_name(f".{output_path.name}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(LISTING_PAGE_HEAD.format(
+                base=base,
+                title=escape(title),
+                description=escape(f"AI Governance articles: {title}"),
+                heading=escape(title),
+                summary=f"{total} articles"
+            ))
+            for header in window:
+                try:
+                    note = read_note(Path(header['path']), self.obsidian_vault_path)
+                except Exception as e:
+                    logger.error(f"Error reading vault note {header['path']}: {e}")
+                    continue
+                f.write(self.render_article_card(note, base))
+                f.write('\n')
+            f.write(LISTING_PAGE_TAIL.format(base=base, pagination=pagination, all_tags=all_tags))
+        os.replace(temp_path, output_path)
+    
+    def generate_article_pages(self, headers, articles_dir, tag_index, related, link_graph):
+        """
+        Write one HTML page per vault note, reading the notes one at a time.
+        
+        Note bodies are rendered from markdown through the fragment cache, so
+        only notes whose text changed since the last build are converted.
+        
+        Args:
+            headers (list): Note headers as returned by load_vault_headers
+            articles_dir (Path): Output directory for the article pages
+            tag_index (dict): Index as returned by build_tag_index
+            related (dict): Related pages per page, as returned by compute_related
+            link_graph (dict): Graph as returned by build_link_graph
+        """
+        source_classes = {
+            'journalism': 'source-journalism',
+            'international_org': 'source-international',
+            'international': 'source-international',
+            'academic': 'source-academic',
+            'government': 'source-government',
+            'ngo': 'source-ngo'
+        }
+        all_tags = self.render_tag_cloud(tag_index)
+        headers_by_page = {header['page']: header for header in headers}
+        
+        renderer = FragmentRenderer(self.build_cache_dir / 'fragments')
+        written = 0
+        
+        for note in self.iter_vault_notes(headers):
+            lang = (note['language'] or 'en').split('-')[0].lower()
+            related_notes = [headers_by_page[page] for page in related.get(note['page'], []) if page in headers_by_page]
+            backlinks = ''.join([f'<li><a href="{page}">{escape(headers_by_page[page]["title"])}</a></li>' for page in link_graph['backlinks'].get(note['page'], [])])
+            
+            article_data = {
+                'title': escape(note['title']),
+                'description': escape(note['summary'][:160]),
+                'source': escape(note['source']),
+                'source_class': source_classes.get(note['category'], 'source-journalism'),
+                'date': escape(note['date'].split(' ')[0]),
+                'lang': lang.upper(),
+                'lang_class': f"lang-{lang}",
+                'url': escape(note['url']),
+                'added_date': escape(note['added_date']),
+                'tags': ''.join([f'<a href="../tags/{slugify(tag)}.html" class="tag" data-tag="{escape(tag)}">{escape(tag)}</a>' for tag in note['tags']]),
+                'all_tags': all_tags,
+                'related_articles': ''.join([f'<li><a href="{other["page"]}">{escape(other["title"])}</a></li>' for other in related_notes]),
+                'backlinks': BACKLINKS_SECTION.format(backlinks=backlinks) if backlinks else '',
+                'content': resolve_links(renderer.render(note['summary'] + '\n\n' + note['content']), link_graph['targets'])
+            }
+            
+            if write_text_if_changed(articles_dir / note['page'], self.rewrite_assets(ARTICLE_TEMPLATE.format(**article_data))):
+                written += 1
+        
+        renderer.prune()
+        logger.info(f"Generated {len(headers)} article pages in {articles_dir}, {written} changed")
+    
     def deploy_to_github_pages(self):
         """
         Deploy the digital garden website to GitHub Pages.
@@ -340,26 +936,318 @@ class ContentPipeline:
         Returns:
             bool: True if deployment was successful, False otherwise
         """
+        repo_url = self.config.get('github_pages_repo')
+        if not repo_url:
+            logger.warning("GitHub Pages repository URL not configured")
+            return False
+        
+        clone_dir = Path(self.config.get('github_pages_clone_dir') or self.project_root / 'github_pages_clone')
+        stats = self.publish_changes(repo_url, clone_dir)
+        return stats['success']
+    
+    def publish_changes(self, repo_url, clone_dir):
+        """
+        Push the changes in the digital garden to a Git repository.
+        
+        A working clone of the repository is kept between runs, together with
+        a manifest of the hashes of the files deployed from the garden. Only
+        files whose hash changed are copied and staged, and files that
+        disappeared from the garden are deleted. Files in the repository that
+        were never deployed from the garden (e.g. CNAME) are left alone.
+        
+        Args:
+            repo_url (str): URL or path of the repository to push to
+            clone_dir (Path): Location of the persistent working clone
+            
+        Returns:
+            dict: Statistics about the deployment
+        """
+        stats = {
+            'success': False,
+            'files': 0,
+            'changed': 0,
+            'removed': 0,
+            'commit': None
+        }
+        
+        try:
+            clone_dir = Path(clone_dir)
+            if not (clone_dir / '.git').exists():
+                clone_dir.parent.mkdir(parents=True, exist_ok=True)
+                subprocess.run(['git', 'clone', '--quiet', str(repo_url), str(clone_dir)], check=True)
+            else:
+                subprocess.run(['git', 'fetch', '--quiet', 'origin'], cwd=clone_dir, check=True)
+                upstream = subprocess.run(['git', 'rev-parse', '--verify', '--quiet', '@{u}'], cwd=clone_dir, capture_output=True, text=True)
+                if upstream.returncode == 0:
+                    subprocess.run(['git', 'reset', '--quiet', '--hard', '@{u}'], cwd=clone_dir, check=True)
+            
+            head = self._git_head(clone_dir)
+            manifest_path = clone_dir / '.git' / DEPLOY_MANIFEST_FILENAME
+            manifest = self._load_deploy_manifest(manifest_path)
+            
+            # The manifest only describes the clone if nobody else pushed in between
+            output_files = self._hash_output_files(manifest.get('files', {}))
+            if manifest.get('commit') != head:
+                deployed = {}
+                for rel_path, entry in output_files.items():
+                    target = clone_dir / rel_path
+                    if target.is_file():
+                        deployed[rel_path] = self._file_hash(target)
+            else:
+                deployed = {rel_path: entry['hash'] for rel_path, entry in manifest.get('files', {}).items()}
+            
+            changed = [rel_path for rel_path, entry in output_files.items() if deployed.get(rel_path) != entry['hash']]
+            removed = [rel_path for rel_path in deployed if rel_path not in output_files]
+            stats['files'] = len(output_files)
+            stats['changed'] = len(changed)
+            stats['removed'] = len(removed)
+            
+            for rel_path in changed:
+                target = clone_dir / rel_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(self.digital_garden_path / rel_path, target)
+            for rel_path in removed:
+                try:
+                    (clone_dir / rel_path).unlink()
+                except FileNotFoundError:
+                    pass
+            
+            # Stage just the touched paths, in batches to stay under the command line limit
+            touched = changed + removed
+            for i in range(0, len(touched), 500):
+                subprocess.run(['git', 'add', '--all', '--', *touched[i:i + 500]], cwd=clone_dir, check=True)
+            
+            staged = subprocess.run(['git', 'diff', '--cached', '--quiet'], cwd=clone_dir)
+            if touched and staged.returncode != 0:
+                subprocess.run(['git', 'commit', '--quiet', '-m', f"Update digital garden {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"], cwd=clone_dir, check=True)
+                subprocess.run(['git', 'push', '--quiet', 'origin', 'HEAD'], cwd=clone_dir, check=True)
+                head = self._git_head(clone_dir)
+            
+            # Record what is deployed only once the push went through
+            write_json_atomic(manifest_path, {'commit': head, 'files': output_files})
+            
+            stats['commit'] = head
+            stats['success'] = True
+            logger.info(f"Deployed digital garden to {repo_url}: {stats['changed']} changed, {stats['removed']} removed of {stats['files']} files")
+            return stats
+        
+        except Exception as e:
+            logger.error(f"Error deploying to GitHub Pages: {e}")
+            return stats
+    
+    def _git_head(self, repo_dir):
+        """Return the commit checked out in a repository, or None if it has no commits yet."""
+        result = subprocess.run(['git', 'rev-parse', '--verify', '--quiet', 'HEAD'], cwd=repo_dir, capture_output=True, text=True)
+        return result.stdout.strip() or None
+    
+    def _load_deploy_manifest(self, manifest_path):
+        """Load the manifest of the last deployment, or an empty one."""
         try:
-            repo_url = self.config.get('github_pages_repo')
-            if not repo_url:
-                logger.warning("GitHub Pages repository URL not configured")
-                return False
-            
-            # Create a temporary directory for the GitHub Pages repository
-            temp_dir = self.project_root / 'temp_github_pages'
-            os.makedirs(temp_dir, exist_ok=True)
-            
-            # Clone the repository
-            subprocess.run(['git', 'clone', repo_url, temp_dir], check=True)
-            
-            # Copy the digital garden files to the repository
-            for item in os.listdir(self.digital_garden_path):
-                source = self.digital_garden_path / item
-                destination = temp_dir / item
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Error reading deploy manifest {manifest_path}: {e}")
+            return {}
+    
+    def _file_hash(self, path):
+        """Compute the SHA-256 of a file."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _hash_output_files(self, previous):
+        """
+        Hash every file of the generated garden.
+        
+        Files whose size and modification time match the previous manifest
+        are not read again.
+        
+        Args:
+            previous (dict): File entries of the previous manifest
+            
+        Returns:
+            dict: Mapping of relative path to {'size', 'mtime_ns', 'hash'}
+        """
+        files = {}
+        for root, dirs, filenames in os.walk(self.digital_garden_path):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for filename in filenames:
+                path = Path(root) / filename
+                rel_path = path.relative_to(self.digital_garden_path).as_posix()
+                stat = path.stat()
+                entry = previous.get(rel_path)
+                if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                    files[rel_path] = entry
+                else:
+                    files[rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': self._file_hash(path)}
+        return files
+    
+    def run_continuously(self):
+        """Run the full pipeline at the configured interval."""
+        interval = self.config.get('run_interval', 3600)
+        logger.info(f"Running content pipeline every {interval} seconds")
+        
+        try:
+            while True:
+                start_time = datetime.datetime.now()
+                self.run_full_pipeline()
                 
-                if os.path.isdir(source):
-                    shutil.copytree(source, destination, dirs_exist_ok=True)
+                elapsed = (datetime.datetime.now() - start_time).total_seconds()
+                sleep_time = max(0, interval - elapsed)
+                if sleep_time > 0:
+                    logger.info(f"Sleeping for {sleep_time:.2f} seconds")
+                    time.sleep(sleep_time)
+        
+        except KeyboardInterrupt:
+            logger.info("Content pipeline stopped by user")
+    
+    def watch_ignored(self, path):
+        """Tell whether a path is irrelevant to the watch mode (hidden, temporary or excluded files)."""
+        name = os.path.basename(path)
+        return name.startswith('.') or name.endswith(('.tmp', '~')) or name in EXCLUDED_DIRS
+    
+    def process_changes(self, changed):
+        """
+        Bring the vault and the digital garden up to date with a change set.
+        
+        Args:
+            changed (set): Paths of changed files, as returned by FileWatcher.wait
+            
+        Returns:
+            dict: Statistics about the processing
+        """
+        stats = {
+            'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'changed_files': len(changed),
+            'workflow': {},
+            'digital_garden': False,
+            'github_pages': False,
+            'errors': []
+        }
+        
+        try:
+            article_ids = {'new': set(), 'reviewed': set()}
+            for path in changed:
+                path = Path(path)
+                for subdir, ids in article_ids.items():
+                    directory = self.staging_dir / subdir
+                    if path == directory or directory in path.parents:
+                        if path.suffix == '.md':
+                            ids.add(path.stem)
+                        elif path == directory:
+                            # Events were lost, so every article in the directory is a candidate
+                            ids.update(article_id for article_id, _ in iter_articles(self.staging_dir, subdir))
+            
+            if article_ids['new'] or article_ids['reviewed']:
+                stats['workflow'] = self.workflow.process_changed_articles(
+                    article_ids['new'], article_ids['reviewed'],
+                    auto_approve=self.config.get('auto_approve', False)
+                )
+            
+            stats['digital_garden'] = self.generate_digital_garden()
+            
+            if self.config.get('auto_publish', False) and self.config.get('github_pages_repo'):
+                stats['github_pages'] = self.deploy_to_github_pages()
+            
+            logger.info(f"Processed change set: {stats}")
+            return stats
+        
+        except Exception as e:
+            error_msg = f"Error processing change set: {e}"
+            logger.error(error_msg)
+            stats['errors'].append(error_msg)
+            return stats
+    
+    def run_watch(self):
+        """
+        Watch the staging area and the vault, and publish changes as they happen.
+        
+        Feeds are still fetched at the configured interval. Between feed runs
+        the pipeline sleeps until files change under staging/new,
+        staging/reviewed or the vault, then exports and rebuilds only what the
+        debounced change set touched. Changes made while a round runs,
+        including the pipeline's own writes, do not start another round.
+        Falls back to run_continuously where inotify is not available.
+        """
+        interval = self.config.get('run_interval', 3600)
+        try:
+            watcher = FileWatcher(
+                [self.staging_dir / 'new', self.staging_dir / 'reviewed', self.obsidian_vault_path],
+                ignore=self.watch_ignored
+            )
+        except (WatchUnavailable, OSError) as e:
+            logger.warning(f"Watch mode is not available ({e}), running every {interval} seconds instead")
+            return self.run_continuously()
+        
+        logger.info(f"Watching for changes, fetching feeds every {interval} seconds")
+        next_run = time.monotonic()
+        try:
+            while True:
+                changed = watcher.wait(max(0, next_run - time.monotonic()))
+                if changed is None:
+                    self.run_full_pipeline()
+                    next_run = time.monotonic() + interval
                 else:
-                    shutil
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+                    self.process_changes(changed)
+                
+                # The round's own writes (approved articles, vault imports, the daily
+                # note) are not changes to process again; an edit saved while the round
+                # ran is picked up by the next feed run, which reconciles everything
+                dropped = watcher.discard()
+                if dropped:
+                    logger.debug(f"Dropped {dropped} changes made while processing")
+        
+        except KeyboardInterrupt:
+            logger.info("Content pipeline stopped by user")
+        finally:
+            watcher.close()
+
+
+def main():
+    """Main entry point for the content pipeline."""
+    parser = argparse.ArgumentParser(description='AI Governance Content Pipeline')
+    parser.add_argument('command', choices=['setup', 'run', 'continuous', 'watch', 'generate', 'deploy'], help='Command to run')
+    parser.add_argument('--config', default='/home/ubuntu/ai-governance-aggregator/config/pipeline.json', help='Path to configuration file')
+    parser.add_argument('--profile', nargs='?', const='', metavar='DIR', help='Profile each stage and write .pstats, collapsed stacks and a summary to DIR (default: profiles/<timestamp>)')
+    
+    # Parse arguments
+    args = parser.parse_args()
+    
+    # Set up logging
+    configure_logging()
+    
+    # Initialize the pipeline
+    pipeline = ContentPipeline(args.config)
+    if args.profile is not None:
+        pipeline.profiler = RunProfiler(args.profile or None)
+    
+    # Execute the appropriate command
+    if args.command == 'setup':
+        success = pipeline.setup()
+    elif args.command == 'run':
+        stats = pipeline.run_full_pipeline()
+        success = not stats['errors']
+    elif args.command == 'continuous':
+        pipeline.run_continuously()
+        success = True
+    elif args.command == 'watch':
+        pipeline.run_watch()
+        success = True
+    elif args.command == 'generate':
+        with pipeline.profile_stage('digital_garden'):
+            success = pipeline.generate_digital_garden()
+    else:  # 'deploy'
+        with pipeline.profile_stage('github_pages'):
+            success = pipeline.deploy_to_github_pages()
+    
+    if pipeline.profiler and args.command in ('generate', 'deploy'):
+        print(f"Profile summary written to {pipeline.profiler.write_summary()}")
+    
+    return 0 if success else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,26 +11,24 @@ import time
 import logging
 import datetime
 import hashlib
-import requests
-from bs4 import BeautifulSoup
-import markdown
+from .locking import LeaseManager, article_lock, write_json_atomic, write_text_atomic
+from .layout import article_path, find_article
+from .archive import is_archived
+from .search import get_search_index, mark_index_stale
+from .snapshot import get_snapshot
+from .registry import FeedRegistry, registry_path, write_registry_file
+from .health import FeedHealth
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'rss_monitor.log')),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger('rss_monitor')
 
 # Configuration
 STAGING_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'staging')
 OBSIDIAN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'obsidian-integration')
 
-# RSS feeds to monitor (simplified for testing)
+# Download and extract the full text of each article instead of using mock content
+FETCH_ARTICLE_CONTENT = os.environ.get('RSS_FETCH_ARTICLE_CONTENT', '').lower() in ('1', 'true', 'yes')
+
+# RSS feeds to monitor when there is no registry file (simplified for testing)
 RSS_FEEDS = [
     # Journalism Sources
     {"url": "https://rss.nytimes.com/services/xml/rss/nyt/Technology.xml", "category": "journalism", "language": "en-us", "source": "The New York Times"},
@@ -46,24 +44,32 @@ RSS_FEEDS = [
     {"url": "https://hai.stanford.edu/news/rss.xml", "category": "academic", "language": "en", "source": "Stanford HAI"}
 ]
 
-# Keywords to filter content related to AI governance
-AI_GOVERNANCE_KEYWORDS = [
+# Keywords to filter content related to AI governance, by language, when there is
+# no registry file. An article is checked against its feed's language, the
+# languages whose scripts appear in it, and English.
+AI_GOVERNANCE_KEYWORDS = {
     # English keywords
-    "ai governance", "artificial intelligence governance", "ai regulation", "ai policy", 
-    "ai ethics", "responsible ai", "ai safety", "ai principles", "ai framework",
+    "en": [
+        "ai governance", "artificial intelligence governance", "ai regulation", "ai policy",
+        "ai ethics", "responsible ai", "ai safety", "ai principles", "ai framework"
+    ],
     
     # Spanish keywords
-    "gobernanza de la ia", "gobernanza de la inteligencia artificial",
+    "es": ["gobernanza de la ia", "gobernanza de la inteligencia artificial"],
     
     # Chinese keywords (simplified)
-    "人工智能治理", "人工智能监管",
+    "zh": ["人工智能治理", "人工智能监管"],
     
     # Japanese keywords
-    "AI ガバナンス", "人工知能ガバナンス",
+    "ja": ["AI ガバナンス", "人工知能ガバナンス"],
     
     # Russian keywords
-    "управление ии", "регулирование искусственного интеллекта"
-]
+    "ru": ["управление ии", "регулирование искусственного интеллекта"]
+}
+
+# Feeds and keywords in effect, loaded from the registry file on first use
+_registry = None
+_registry_path = registry_path()
 
 # Obsidian template
 OBSIDIAN_TEMPLATE = """---
@@ -101,9 +107,46 @@ def setup_directories():
     os.makedirs(os.path.join(STAGING_DIR, 'reviewed'), exist_ok=True)
     os.makedirs(os.path.join(STAGING_DIR, 'rejected'), exist_ok=True)
     os.makedirs(os.path.join(STAGING_DIR, 'metadata'), exist_ok=True)
+    os.makedirs(os.path.join(STAGING_DIR, 'leases'), exist_ok=True)
+    os.makedirs(os.path.join(STAGING_DIR, 'locks'), exist_ok=True)
+    os.makedirs(os.path.join(STAGING_DIR, 'feed-health'), exist_ok=True)
+    
+    # The registry file starts out as a copy of the defaults below, which are not kept anywhere else
+    if not os.path.exists(_registry_path):
+        write_registry_file(_registry_path, RSS_FEEDS, AI_GOVERNANCE_KEYWORDS)
+        logger.info(f"Created feed registry {_registry_path} from the default feeds and keywords")
+    
     logger.info(f"Directory structure set up at {STAGING_DIR}")
 
-def is_relevant_to_ai_governance(title, description, content):
+def use_config(config_path):
+    """
+    Use the registry file next to a loaded pipeline configuration file.
+    
+    Args:
+        config_path (str): Path of the pipeline.json in use
+    """
+    global _registry, _registry_path
+    path = registry_path(config_path)
+    if path != _registry_path:
+        _registry_path = path
+        _registry = None
+
+def get_registry():
+    """
+    Get the feed registry.
+    
+    RSS_FEEDS and AI_GOVERNANCE_KEYWORDS are used until a registry file
+    (feeds.json next to pipeline.json) exists; setup_directories creates it from them.
+    
+    Returns:
+        FeedRegistry: The registry of the current process
+    """
+    global _registry
+    if _registry is None:
+        _registry = FeedRegistry(RSS_FEEDS, AI_GOVERNANCE_KEYWORDS, _registry_path)
+    return _registry
+
+def is_relevant_to_ai_governance(title, description, content, language=None):
     """
     Check if the content is relevant to AI governance based on keywords.
     
@@ -111,17 +154,12 @@ def is_relevant_to_ai_governance(title, description, content):
         title (str): The title of the article
         description (str): The description or summary of the article
         content (str): The full content of the article
+        language (str, optional): The declared language of the article
         
     Returns:
         bool: True if the content is relevant to AI governance, False otherwise
     """
-    combined_text = f"{title} {description} {content}".lower()
-    
-    for keyword in AI_GOVERNANCE_KEYWORDS:
-        if keyword.lower() in combined_text:
-            return True
-    
-    return False
+    return get_registry().matcher.match(f"{title} {description} {content}", language) is not None
 
 def fetch_article_content(url):
     """
@@ -134,6 +172,10 @@ def fetch_article_content(url):
         str: The full content of the article
     """
     try:
+        if FETCH_ARTICLE_CONTENT:
+            from .fetcher import fetch_articles
+            return fetch_articles([url]).get(url, '')
+        
         # For testing purposes, return a mock content
         return f"This is a mock article content for {url}. It contains information about AI governance and regulation."
     except Exception as e:
@@ -155,13 +197,27 @@ def generate_file_id(url, title, date):
     unique_string = f"{url}_{title}_{date}"
     return hashlib.md5(unique_string.encode()).hexdigest()
 
-def process_feed_entry(entry, feed_metadata):
+def is_known_entry(entry):
+    """
+    Check whether a feed entry is already in the staging area or the archive.
+    
+    Args:
+        entry (dict): The feed entry
+        
+    Returns:
+        bool: True if the entry does not need to be fetched again
+    """
+    file_id = generate_file_id(entry.get('link', ''), entry.get('title', ''), entry.get('published', ''))
+    return bool(find_article(STAGING_DIR, 'metadata', file_id)) or is_archived(STAGING_DIR, file_id)
+
+def process_feed_entry(entry, feed_metadata, content=None):
     """
     Process a single feed entry and save it to the staging area if relevant.
     
     Args:
         entry (dict): The feed entry to process
         feed_metadata (dict): Metadata about the feed
+        content (str, optional): Article text fetched in advance; fetched here if not given
         
     Returns:
         bool: True if the entry was processed and saved, False otherwise
@@ -176,11 +232,14 @@ def process_feed_entry(entry, feed_metadata):
         # Try to get a more detailed description if available
         description = entry.get('description', summary)
         
-        # Fetch full content
-        content = fetch_article_content(link)
+        # Fetch full content, unless it was fetched with the rest of the batch
+        if content is None:
+            content = fetch_article_content(link)
         
         # Check if the content is relevant to AI governance
-        if not is_relevant_to_ai_governance(title, description, content):
+        # An entry's own language (e.g. xml:lang on its title) overrides the feed's
+        language = entry.get('language') or (entry.get('title_detail') or {}).get('language') or feed_metadata.get('language')
+        if not is_relevant_to_ai_governance(title, description, content, language):
             logger.debug(f"Article '{title}' is not relevant to AI governance")
             return False
         
@@ -200,11 +259,6 @@ def process_feed_entry(entry, feed_metadata):
             'processed_date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
         
-        # Save metadata
-        metadata_path = os.path.join(STAGING_DIR, 'metadata', f"{file_id}.json")
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
-        
         # Create markdown content
         md_content = OBSIDIAN_TEMPLATE.format(
             title=title,
@@ -218,10 +272,42 @@ def process_feed_entry(entry, feed_metadata):
             content=content
         )
         
-        # Save to staging area
-        file_path = os.path.join(STAGING_DIR, 'new', f"{file_id}.md")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(md_content)
+        # Save metadata and the article together so other workers never see half of it
+        with article_lock(STAGING_DIR, file_id):
+            # Don't resurrect an article a reviewer has already decided on
+            if is_archived(STAGING_DIR, file_id):
+                logger.debug(f"Article '{title}' is already archived, skipping")
+                return False
+            
+            existing_path = find_article(STAGING_DIR, 'metadata', file_id)
+            if existing_path:
+                with open(existing_path, 'r', encoding='utf-8') as f:
+                    existing = json.load(f)
+                if existing.get('status'):
+                    logger.debug(f"Article '{title}' was already {existing['status']}, skipping")
+                    return False
+            
+            metadata_path = existing_path or article_path(STAGING_DIR, 'metadata', file_id, create=True)
+            file_path = find_article(STAGING_DIR, 'new', file_id) or article_path(STAGING_DIR, 'new', file_id, create=True)
+
+            write_json_atomic(metadata_path, metadata)
+            write_text_atomic(file_path, md_content)
+        
+        # Keep the search index in step with the staging area
+        try:
+            get_search_index(STAGING_DIR).index_document(
+                file_id, 'staging', title, description, content, status='new',
+                source=feed_metadata['source'], language=feed_metadata['language'], date=published,
+                category=feed_metadata['category']
+            )
+        except Exception as e:
+            logger.warning(f"Error indexing article '{title}' for search: {e}")
+            mark_index_stale(STAGING_DIR)
+        
+        try:
+            get_snapshot(STAGING_DIR).record([(metadata, 'new')])
+        except Exception as e:
+            logger.warning(f"Error adding article '{title}' to the metadata snapshot: {e}")
         
         logger.info(f"Saved article '{title}' to {file_path}")
         return True
@@ -232,64 +318,137 @@ def process_feed_entry(entry, feed_metadata):
 
 def fetch_and_process_feeds():
     """
-    Fetch and process all RSS feeds defined in the configuration.
+    Fetch and process all RSS feeds in the feed registry.
     
     Returns:
         dict: Statistics about the processing
     """
+    # Pick up edits to the registry file made since the last cycle
+    registry = get_registry()
+    changes = registry.reload()
+    
+    # Feeds that keep failing are backed off instead of being retried every cycle
+    health = FeedHealth(STAGING_DIR)
+    for url in (changes or {}).get('removed', []):
+        health.forget(hashlib.md5(url.encode()).hexdigest())
+    
     stats = {
-        'total_feeds': len(RSS_FEEDS),
+        'total_feeds': len(registry.feeds),
         'processed_feeds': 0,
         'failed_feeds': 0,
+        'skipped_feeds': 0,
+        'backed_off_feeds': 0,
         'total_entries': 0,
         'relevant_entries': 0,
         'errors': []
     }
     
-    # For testing purposes, create mock entries
-    for feed_config in RSS_FEEDS:
-        try:
-            logger.info(f"Processing feed: {feed_config['url']}")
-            
-            # Create mock entries
-            mock_entries = [
-                {
-                    'title': f"AI Governance Framework by {feed_config['source']}",
-                    'link': f"https://example.com/{feed_config['source'].lower().replace(' ', '-')}/ai-governance-framework",
-                    'published': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'summary': f"A new AI governance framework has been proposed by {feed_config['source']}."
-                },
-                {
-                    'title': f"Ethical Considerations in AI Development - {feed_config['source']}",
-                    'link': f"https://example.com/{feed_config['source'].lower().replace(' ', '-')}/ethical-ai",
-                    'published': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'summary': f"Experts at {feed_config['source']} discuss ethical considerations in AI development."
-                }
-            ]
-            
-            # Process each entry
-            entries_processed = 0
-            relevant_entries = 0
+    # Feeds are leased until the end of the run, so that several fetch workers
+    # running at the same time split the feed list between them
+    feed_leases = LeaseManager(STAGING_DIR, namespace='feeds')
+    held = []
+    renewed_at = time.monotonic()
+    
+    try:
+        # For testing purposes, create mock entries. Every feed is read first, so
+        # that the articles of all feeds are downloaded in one batch.
+        pending = []
+        for url, feed_config in list(registry.feeds.items()):
+            feed_key = registry.feed_state[url]['key']
+            renewed_at = _keep_leases(feed_leases, held, renewed_at)
             
-            for entry in mock_entries:
-                entries_processed += 1
-                if process_feed_entry(entry, feed_config):
-                    relevant_entries += 1
+            if not feed_leases.claim(feed_key):
+                logger.info(f"Skipping feed {feed_config['url']}, it is being processed by another worker")
+                stats['skipped_feeds'] += 1
+                continue
+            held.append(feed_key)
             
-            logger.info(f"Processed {entries_processed} entries from {feed_config['url']}, {relevant_entries} relevant to AI governance")
+            start_time = time.monotonic()
+            try:
+                if not health.allow(feed_key):
+                    logger.debug(f"Skipping feed {feed_config['url']}, it is backed off after repeated failures")
+                    stats['backed_off_feeds'] += 1
+                    continue
+                
+                logger.info(f"Processing feed: {feed_config['url']}")
+                
+                # Create mock entries
+                mock_entries = [
+                    {
+                        'title': f"AI Governance Framework by {feed_config['source']}",
+                        'link': f"https://example.com/{feed_config['source'].lower().replace(' ', '-')}/ai-governance-framework",
+                        'published': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                        'summary': f"A new AI governance framework has been proposed by {feed_config['source']}."
+                    },
+                    {
+                        'title': f"Ethical Considerations in AI Development - {feed_config['source']}",
+                        'link': f"https://example.com/{feed_config['source'].lower().replace(' ', '-')}/ethical-ai",
+                        'published': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                        'summary': f"Experts at {feed_config['source']} discuss ethical considerations in AI development."
+                    }
+                ]
+                pending.append((feed_key, feed_config, mock_entries, time.monotonic() - start_time))
             
-            stats['processed_feeds'] += 1
-            stats['total_entries'] += entries_processed
-            stats['relevant_entries'] += relevant_entries
+            except Exception as e:
+                _record_feed_error(stats, health, feed_key, feed_config, e, time.monotonic() - start_time)
+        
+        # Fetch the articles of all feeds concurrently, with one connection pool and one
+        # extraction pool for the whole run; staged articles are not fetched again
+        contents = {}
+        if FETCH_ARTICLE_CONTENT and pending:
+            # Imported here so that runs without fetching never load requests and bs4
+            from .fetcher import fetch_articles
+            pending = [(feed_key, feed_config, [entry for entry in entries if not is_known_entry(entry)], latency)
+                       for feed_key, feed_config, entries, latency in pending]
+            contents = fetch_articles([entry['link'] for _, _, entries, _ in pending for entry in entries])
+            renewed_at = _keep_leases(feed_leases, held, renewed_at)
+        
+        for feed_key, feed_config, entries, latency in pending:
+            try:
+                # Process each entry
+                entries_processed = 0
+                relevant_entries = 0
+                
+                for entry in entries:
+                    entries_processed += 1
+                    if process_feed_entry(entry, feed_config, content=contents.get(entry['link'])):
+                        relevant_entries += 1
+                
+                logger.info(f"Processed {entries_processed} entries from {feed_config['url']}, {relevant_entries} relevant to AI governance")
+                
+                stats['processed_feeds'] += 1
+                stats['total_entries'] += entries_processed
+                stats['relevant_entries'] += relevant_entries
+                health.record(feed_key, feed_config, True, latency)
             
-        except Exception as e:
-            error_msg = f"Error processing feed {feed_config['url']}: {e}"
-            logger.error(error_msg)
-            stats['failed_feeds'] += 1
-            stats['errors'].append(error_msg)
+            except Exception as e:
+                _record_feed_error(stats, health, feed_key, feed_config, e, latency)
+    
+    finally:
+        for key in held:
+            feed_leases.release(key)
     
     return stats
 
+def _keep_leases(feed_leases, held, renewed_at):
+    """Renew the leases held for the run once half their lifetime has passed; returns when they were last renewed."""
+    if time.monotonic() - renewed_at <= feed_leases.ttl / 2:
+        return renewed_at
+    for key in held:
+        feed_leases.renew(key)
+    return time.monotonic()
+
+def _record_feed_error(stats, health, feed_key, feed_config, error, latency):
+    """Count a feed that could not be processed and record the failure in its health."""
+    error_msg = f"Error processing feed {feed_config['url']}: {error}"
+    logger.error(error_msg)
+    stats['failed_feeds'] += 1
+    stats['errors'].append(error_msg)
+    try:
+        health.record(feed_key, feed_config, False, latency, error=str(error))
+    except Exception as health_error:
+        logger.warning(f"Error recording health of feed {feed_config['url']}: {health_error}")
+
 def run_monitor(interval=3600):
     """
     Run the RSS feed monitor continuously with a specified interval.
@@ -332,4 +491,6 @@ def run_once():
     return stats
 
 if __name__ == "__main__":
+    from .logging_setup import configure_logging
+    configure_logging()
     run_monitor()
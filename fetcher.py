@@ -0,0 +1,358 @@
+"""
+Concurrent article fetcher for the RSS feed monitor.
+Downloads article pages with bounded concurrency, per-request deadlines
+and a size cap enforced while streaming, then extracts the main text in
+a process pool so HTML parsing does not hold up the downloads. The
+concurrency per host adapts to how the host responds (AIMD), and what was
+learned about a host carries over to the next batch.
+"""
+
+import re
+import time
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger('rss_fetcher')
+
+# Downloads in flight overall
+MAX_CONCURRENCY = 8
+
+# Downloads in flight per host start at INITIAL_PER_HOST. Every response
+# that comes back quickly raises the limit by about one per round of
+# requests, up to MAX_PER_HOST. A throttling response (429 or 5xx) halves it,
+# and a slow response shrinks it a little.
+INITIAL_PER_HOST = 2
+MAX_PER_HOST = 6
+THROTTLE_DECREASE = 0.5
+SLOW_DECREASE = 0.8
+SLOW_RESPONSE = 5.0
+
+# Throttled requests are retried after the host's Retry-After, or this many seconds
+MAX_RETRIES = 3
+DEFAULT_RETRY_AFTER = 1.0
+MAX_RETRY_AFTER = 120.0
+
+# Seconds to connect, to wait for the next chunk of a response, and for the
+# whole download of one article. requests enforces the first two; the total
+# is checked between chunks, so a download ends within REQUEST_TIMEOUT + READ_TIMEOUT.
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 10
+REQUEST_TIMEOUT = 30
+
+# Stop reading a page after this many bytes; article text is near the top anyway
+MAX_CONTENT_BYTES = 2 * 1024 * 1024
+
+# Truncate the extracted text to this many characters
+MAX_TEXT_LENGTH = 20000
+
+# Worker processes for main-content extraction
+EXTRACT_WORKERS = 2
+
+USER_AGENT = 'AI-Governance-Aggregator/1.0 (+https://github.com/hxfxrx/AI-Governance-aggregator)'
+
+# Elements that never hold article text
+_BOILERPLATE_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'iframe', 'svg', 'button']
+_BOILERPLATE_RE = re.compile(r'(^|[-_])(comments?|share|social|related|promo|subscribe|newsletter|cookies?|banner|sidebar|footer|nav|navbar|menu|ad|ads|advert)([-_]|$)', re.I)
+
+def extract_main_content(html, encoding=None, max_length=MAX_TEXT_LENGTH):
+    """
+    Extract the readable article text from an HTML page.
+
+    Uses a readability-style heuristic: boilerplate elements are dropped,
+    then the <article> element is used if there is one, otherwise the block
+    whose paragraphs contain the most text.
+
+    Args:
+        html (bytes): The page HTML
+        encoding (str, optional): Encoding declared in the HTTP headers
+        max_length (int): Maximum length of the returned text
+
+    Returns:
+        str: The article text, paragraphs separated by blank lines
+    """
+    soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding)
+
+    for tag in soup(_BOILERPLATE_TAGS):
+        tag.decompose()
+    for tag in soup.find_all(attrs={'class': _BOILERPLATE_RE}):
+        if tag.name not in ('body', 'article', 'main'):
+            tag.decompose()
+
+    container = soup.find('article') or soup.find('main')
+    if container is None:
+        scores = {}
+        for paragraph in soup.find_all('p'):
+            parent = paragraph.parent
+            if parent is not None:
+                scores[parent] = scores.get(parent, 0) + len(paragraph.get_text(strip=True))
+        container = max(scores, key=scores.get) if scores else (soup.body or soup)
+
+    paragraphs = [p.get_text(' ', strip=True) for p in container.find_all(['p', 'h2', 'h3', 'li'])]
+    paragraphs = [p for p in paragraphs if len(p) > 1]
+    text = '\n\n'.join(paragraphs) if paragraphs else container.get_text(' ', strip=True)
+
+    if len(text) > max_length:
+        text = text[:max_length].rsplit(' ', 1)[0] + ' …'
+    return text
+
+def download_page(session, url, max_bytes=MAX_CONTENT_BYTES, timeout=REQUEST_TIMEOUT):
+    """
+    Download a page, giving up on the rest once it grows past max_bytes.
+
+    Args:
+        session (requests.Session): Session to download with
+        url (str): The URL of the page
+        max_bytes (int): Maximum number of bytes to read
+        timeout (int): Seconds allowed for the whole download, checked between chunks
+
+    Returns:
+        tuple: (body bytes, declared encoding, truncated flag), or None if
+            the URL does not point at an HTML page
+    """
+    deadline = time.monotonic() + timeout
+    with session.get(url, stream=True, timeout=(CONNECT_TIMEOUT, min(READ_TIMEOUT, timeout))) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', 'text/html')
+        if 'html' not in content_type:
+            logger.debug(f"Skipping {url}, content type is {content_type}")
+            return None
+
+        chunks = []
+        size = 0
+        truncated = False
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                truncated = True
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Download of {url} took longer than {timeout}s")
+
+        body = b''.join(chunks)[:max_bytes]
+        return body, response.encoding if 'charset' in content_type else None, truncated
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date.
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class HostLimiter:
+    """
+    Additive-increase/multiplicative-decrease limit on the downloads in flight to one host.
+
+    A limiter outlives the batch it was created in. Each batch runs in its
+    own event loop, so the condition requests wait on is replaced when a new
+    loop starts using the limiter, while the limit and pause carry over.
+    """
+
+    def __init__(self, initial=INITIAL_PER_HOST, maximum=MAX_PER_HOST):
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self._loop = None
+        self._condition = None
+
+    @property
+    def condition(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # The requests of the previous batch have all finished
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self.in_flight = 0
+        return self._condition
+
+    async def acquire(self):
+        """Wait for a free slot on the host."""
+        condition = self.condition
+        async with condition:
+            while True:
+                pause = self.paused_until - time.monotonic()
+                if pause <= 0 and self.in_flight < max(1, int(self.limit)):
+                    self.in_flight += 1
+                    return
+                try:
+                    await asyncio.wait_for(condition.wait(), pause if pause > 0 else None)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(self, started, throttled=False, retry_after=None, failed=False):
+        """
+        Free a slot and adjust the limit to the outcome of the request.
+
+        Only requests started after the last decrease can decrease the limit
+        again, so a burst of throttled responses to one round of requests
+        halves it once rather than once per response.
+
+        Args:
+            started (float): Monotonic time the request was sent
+            throttled (bool): Whether the host answered with 429 or 5xx
+            retry_after (float, optional): Seconds the host asked us to wait
+            failed (bool): Whether the request failed for another reason
+        """
+        async with self.condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                if started > self.last_decrease:
+                    self.limit = max(1.0, self.limit * THROTTLE_DECREASE)
+                    self.last_decrease = now
+                pause = min(MAX_RETRY_AFTER, retry_after if retry_after is not None else DEFAULT_RETRY_AFTER)
+                self.paused_until = max(self.paused_until, now + pause)
+            elif not failed:
+                if now - started > SLOW_RESPONSE:
+                    if started > self.last_decrease:
+                        self.limit = max(1.0, self.limit * SLOW_DECREASE)
+                        self.last_decrease = now
+                else:
+                    self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            self.condition.notify_all()
+
+# Limiters of the hosts fetched from by this process, so that a host throttled
+# while fetching one feed's articles is not hit at full speed by the next batch
+_host_limiters = {}
+
+def get_host_limiter(host):
+    """Get the limiter of a host, creating it on first use."""
+    host = host.lower()
+    if host not in _host_limiters:
+        _host_limiters[host] = HostLimiter()
+    return _host_limiters[host]
+
+def _is_throttling(error):
+    response = getattr(error, 'response', None)
+    return response is not None and (response.status_code == 429 or response.status_code >= 500)
+
+async def _fetch_one(url, session, semaphore, extract_pool, stats):
+    limiter = get_host_limiter(urlsplit(url).netloc)
+
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.acquire()
+        started = time.monotonic()
+        try:
+            async with semaphore:
+                started = time.monotonic()
+                # Not wrapped in wait_for: cancelling the await would not stop the download thread,
+                # which has to run into the requests timeouts while holding its slot
+                page = await asyncio.to_thread(download_page, session, url)
+        except requests.HTTPError as e:
+            if not _is_throttling(e):
+                await limiter.release(started, failed=True)
+                logger.warning(f"Error fetching article content from {url}: {e}")
+                stats['failed'] += 1
+                return url, ''
+
+            await limiter.release(started, throttled=True, retry_after=parse_retry_after(e.response.headers.get('Retry-After')))
+            stats['throttled'] += 1
+            if attempt < MAX_RETRIES:
+                stats['retries'] += 1
+                continue
+            logger.warning(f"Giving up on {url} after {attempt + 1} throttled attempts: {e}")
+            stats['failed'] += 1
+            return url, ''
+        except Exception as e:
+            await limiter.release(started, failed=True)
+            logger.warning(f"Error fetching article content from {url}: {e}")
+            stats['failed'] += 1
+            return url, ''
+
+        await limiter.release(started)
+        break
+
+    if page is None:
+        stats['skipped'] += 1
+        return url, ''
+
+    body, encoding, truncated = page
+    stats['bytes'] += len(body)
+    if truncated:
+        stats['truncated'] += 1
+
+    # Parsing is CPU-bound, so it runs in the process pool rather than on the event loop
+    try:
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(extract_pool, extract_main_content, body, encoding)
+    except Exception as e:
+        logger.warning(f"Error extracting article content from {url}: {e}")
+        stats['failed'] += 1
+        return url, ''
+
+    stats['fetched'] += 1
+    return url, text
+
+async def fetch_articles_async(urls):
+    """
+    Fetch and extract a batch of articles concurrently.
+
+    The per-host limits start from what earlier batches learned about each host.
+
+    Args:
+        urls (list): Article URLs
+
+    Returns:
+        tuple: ({url: article text, '' on failure}, statistics dict)
+    """
+    stats = {'requested': 0, 'fetched': 0, 'failed': 0, 'skipped': 0, 'truncated': 0, 'bytes': 0,
+             'throttled': 0, 'retries': 0, 'host_limits': {}}
+    urls = list(dict.fromkeys(urls))
+    stats['requested'] = len(urls)
+    if not urls:
+        return {}, stats
+
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    adapter = requests.adapters.HTTPAdapter(pool_connections=MAX_CONCURRENCY, pool_maxsize=MAX_CONCURRENCY)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    # The pool lives for one batch; its worker processes start on the first extraction
+    extract_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+    try:
+        results = await asyncio.gather(*[_fetch_one(url, session, semaphore, extract_pool, stats) for url in urls])
+    finally:
+        session.close()
+        extract_pool.shutdown(wait=True)
+
+    hosts = {urlsplit(url).netloc.lower() for url in urls}
+    stats['host_limits'] = {host: round(get_host_limiter(host).limit, 2) for host in sorted(hosts)}
+
+    return dict(results), stats
+
+def fetch_articles(urls):
+    """
+    Fetch and extract a batch of articles concurrently from synchronous code.
+
+    Args:
+        urls (list): Article URLs
+
+    Returns:
+        dict: Mapping of URL to article text ('' if it could not be fetched)
+    """
+    start_time = time.time()
+    contents, stats = asyncio.run(fetch_articles_async(urls))
+    logger.info(f"Fetched {stats['fetched']}/{stats['requested']} articles in {time.time() - start_time:.2f}s "
+                f"({stats['failed']} failed, {stats['truncated']} truncated, {stats['throttled']} throttled, {stats['bytes']} bytes)")
+    return contents
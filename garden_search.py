@@ -0,0 +1,144 @@
+"""
+Static search index for the digital garden.
+Builds a term -> postings index from the vault notes and writes it as
+small JSON shards keyed by term prefix, so the browser only downloads
+the shards a query needs.
+"""
+
+import os
+import logging
+from pathlib import Path
+
+from scripts.rss_monitor.search import tokenize, is_cjk
+from scripts.obsidian_integration.vault import write_json_if_changed
+
+logger = logging.getLogger('garden_search')
+
+INDEX_VERSION = 1
+
+# Latin/Cyrillic terms are sharded by their first two characters, CJK bigrams by their first
+PREFIX_LENGTH = 2
+
+# Term weights per field
+FIELD_WEIGHTS = {'title': 5, 'summary': 2, 'content': 1}
+
+def shard_key(term):
+    """
+    Get the shard a term belongs to.
+
+    Args:
+        term (str): An index term produced by tokenize()
+
+    Returns:
+        str: The shard key
+    """
+    if is_cjk(term):
+        return term[:1]
+    return term[:PREFIX_LENGTH]
+
+def _shard_filename(key):
+    """Encode a shard key as a portable filename."""
+    return ''.join(c if c.isascii() and c.isalnum() else f"_{ord(c):x}" for c in key) + '.json'
+
+class GardenSearchIndex:
+    """Class to build the search index from a stream of notes."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.docs = []
+        self.shards = {}
+
+    def add(self, note):
+        """
+        Add the postings of a note. Only its postings and listing fields are kept.
+
+        Args:
+            note (dict): A note as returned by vault.iter_vault_notes, with a 'page'
+        """
+        doc_number = len(self.docs)
+        self.docs.append([note['title'], f"articles/{note['page']}", note['source'], note['date'].split(' ')[0], note['language']])
+
+        scores = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(note[field]):
+                scores[term] = scores.get(term, 0) + weight
+
+        for term, score in scores.items():
+            self.shards.setdefault(shard_key(term), {}).setdefault(term, []).append([doc_number, score])
+
+    def write(self, output_dir):
+        """
+        Write the sharded search index for the notes added.
+
+        Args:
+            output_dir (str): Directory to write the index into, e.g. <garden>/search
+
+        Returns:
+            dict: Statistics about the written index
+        """
+        return _write_index(self.docs, self.shards, output_dir)
+
+def build_search_index(notes):
+    """
+    Build the postings for a set of notes.
+
+    Args:
+        notes (iterable): Notes as returned by vault.iter_vault_notes, each with a 'page'
+
+    Returns:
+        tuple: (docs list, {shard key: {term: [[doc number, score], ...]}})
+    """
+    index = GardenSearchIndex()
+    for note in notes:
+        index.add(note)
+    return index.docs, index.shards
+
+def write_search_index(notes, output_dir):
+    """
+    Write the sharded search index for the digital garden.
+
+    Args:
+        notes (iterable): Notes to index
+        output_dir (str): Directory to write the index into, e.g. <garden>/search
+
+    Returns:
+        dict: Statistics about the written index
+    """
+    docs, shards = build_search_index(notes)
+    return _write_index(docs, shards, output_dir)
+
+def _write_index(docs, shards, output_dir):
+    output_dir = Path(output_dir)
+    (output_dir / 'shards').mkdir(parents=True, exist_ok=True)
+
+    stats = {
+        'documents': len(docs),
+        'shards': len(shards),
+        'written': 0,
+        'removed': 0
+    }
+
+    shard_files = {}
+    for key, postings in shards.items():
+        filename = _shard_filename(key)
+        shard_files[key] = filename
+        if write_json_if_changed(output_dir / 'shards' / filename, postings):
+            stats['written'] += 1
+
+    # Remove shards for prefixes that no longer occur
+    current = set(shard_files.values())
+    for existing in os.listdir(output_dir / 'shards'):
+        # Precompressed siblings are kept with their shard
+        if existing not in current and os.path.splitext(existing)[0] not in current:
+            os.remove(output_dir / 'shards' / existing)
+            stats['removed'] += 1
+
+    write_json_if_changed(output_dir / 'docs.json', docs)
+    write_json_if_changed(output_dir / 'manifest.json', {
+        'version': INDEX_VERSION,
+        'prefix_length': PREFIX_LENGTH,
+        'shards': shard_files
+    })
+
+    logger.info(f"Wrote search index for {stats['documents']} notes: {stats['shards']} shards, {stats['written']} updated, {stats['removed']} removed")
+    return stats
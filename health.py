@@ -0,0 +1,192 @@
+"""
+Per-feed health tracking and circuit breaking for the RSS feed monitor.
+Records the outcome and latency of every feed fetch, and backs off from
+feeds that keep failing: after a run of failures a feed is skipped until
+its backoff expires, then probed once before it is trusted again.
+"""
+
+import os
+import json
+import math
+import time
+import logging
+
+from .locking import article_lock, write_json_atomic
+
+logger = logging.getLogger('rss_health')
+
+HEALTH_DIRNAME = 'feed-health'
+
+# Breaker states
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# Consecutive failures before a feed is skipped
+FAILURE_THRESHOLD = 3
+
+# Backoff after the threshold is reached, doubling with every further failure
+BASE_BACKOFF = 15 * 60
+MAX_BACKOFF = 24 * 3600
+
+# Number of recent fetches success rate and latency percentiles are computed over
+HEALTH_WINDOW = 50
+
+def backoff_for(consecutive_failures):
+    """Return the backoff in seconds after a number of consecutive failures."""
+    exponent = max(0, consecutive_failures - FAILURE_THRESHOLD)
+    return min(MAX_BACKOFF, BASE_BACKOFF * 2 ** min(exponent, 16))
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of a list of numbers, or None if it is empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+class FeedHealth:
+    """Class to track the health of each feed in the staging area."""
+
+    def __init__(self, staging_dir):
+        """
+        Initialize the health tracker.
+
+        Args:
+            staging_dir (str): Path to the staging directory
+        """
+        self.staging_dir = str(staging_dir)
+        self.health_dir = os.path.join(self.staging_dir, HEALTH_DIRNAME)
+        os.makedirs(self.health_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.health_dir, f"{key}.json")
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable health record {key}: {e}")
+            return None
+
+    def allow(self, key, now=None):
+        """
+        Check whether a feed should be fetched now.
+
+        A feed whose backoff has expired is moved to half-open and let
+        through for a single probe.
+
+        Args:
+            key (str): The feed key
+            now (float, optional): Current time
+
+        Returns:
+            bool: True if the feed should be fetched
+        """
+        now = now or time.time()
+        with article_lock(self.staging_dir, f"health:{key}"):
+            record = self._read(key)
+            if not record or record.get('state') != OPEN:
+                return True
+            if now < record.get('open_until', 0):
+                return False
+
+            record['state'] = HALF_OPEN
+            write_json_atomic(self._path(key), record)
+            logger.info(f"Probing feed {record.get('url')} after {record['consecutive_failures']} consecutive failures")
+            return True
+
+    def record(self, key, feed_config, success, latency, error=None, now=None):
+        """
+        Record the outcome of a feed fetch.
+
+        Args:
+            key (str): The feed key
+            feed_config (dict): The feed's registry entry
+            success (bool): Whether the fetch succeeded
+            latency (float): Seconds the fetch took
+            error (str, optional): The error, for failed fetches
+            now (float, optional): Current time
+
+        Returns:
+            dict: The updated health record
+        """
+        now = now or time.time()
+        with article_lock(self.staging_dir, f"health:{key}"):
+            record = self._read(key) or {
+                'state': CLOSED,
+                'consecutive_failures': 0,
+                'successes': 0,
+                'failures': 0,
+                'recent': []
+            }
+            record['url'] = feed_config['url']
+            record['source'] = feed_config.get('source', '')
+            record['recent'] = (record['recent'] + [[round(now, 3), success, round(latency, 3)]])[-HEALTH_WINDOW:]
+
+            if success:
+                if record['state'] != CLOSED:
+                    logger.info(f"Feed {feed_config['url']} recovered after {record['consecutive_failures']} consecutive failures")
+                record['state'] = CLOSED
+                record['consecutive_failures'] = 0
+                record['successes'] += 1
+                record['last_success'] = now
+                record.pop('open_until', None)
+            else:
+                record['consecutive_failures'] += 1
+                record['failures'] += 1
+                record['last_failure'] = now
+                record['last_error'] = error
+                if record['state'] == HALF_OPEN or record['consecutive_failures'] >= FAILURE_THRESHOLD:
+                    backoff = backoff_for(record['consecutive_failures'])
+                    record['state'] = OPEN
+                    record['open_until'] = now + backoff
+                    logger.warning(f"Feed {feed_config['url']} failed {record['consecutive_failures']} times in a row, "
+                                   f"skipping it for {backoff / 60:.0f} minutes")
+
+            write_json_atomic(self._path(key), record)
+            return record
+
+    def forget(self, key):
+        """Remove the health record of a feed that is no longer monitored."""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def list_health(self):
+        """
+        Summarize the health of every tracked feed.
+
+        Returns:
+            list: Dictionaries with the state, success rate, latency
+                percentiles and failure counts of each feed
+        """
+        summaries = []
+        for filename in sorted(os.listdir(self.health_dir)):
+            if not filename.endswith('.json'):
+                continue
+            record = self._read(filename[:-5])
+            if not record:
+                continue
+
+            recent = record.get('recent', [])
+            latencies = [latency for _, success, latency in recent if success]
+            summaries.append({
+                'key': filename[:-5],
+                'url': record.get('url', ''),
+                'source': record.get('source', ''),
+                'state': record.get('state', CLOSED),
+                'success_rate': sum(1 for _, success, _ in recent if success) / len(recent) if recent else None,
+                'p50_latency': percentile(latencies, 0.5),
+                'p95_latency': percentile(latencies, 0.95),
+                'consecutive_failures': record.get('consecutive_failures', 0),
+                'successes': record.get('successes', 0),
+                'failures': record.get('failures', 0),
+                'last_success': record.get('last_success'),
+                'last_error': record.get('last_error'),
+                'open_until': record.get('open_until')
+            })
+        return summaries
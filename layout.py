@@ -0,0 +1,211 @@
+"""
+Directory layout handling for the staging area.
+Supports the original flat layout (new/<id>.md) and an optional two-level
+hash-prefix layout (new/ab/cd/<id>.md) for very large archives.
+"""
+
+import os
+import json
+import shutil
+import logging
+
+from .locking import staging_lock, write_json_atomic
+
+logger = logging.getLogger('staging_layout')
+
+FLAT = 'flat'
+SHARDED = 'sharded'
+LAYOUTS = (FLAT, SHARDED)
+
+# Staging subdirectories that hold per-article files, with their file extension
+ARTICLE_DIRS = {
+    'new': '.md',
+    'reviewed': '.md',
+    'rejected': '.md',
+    'metadata': '.json'
+}
+
+LAYOUT_FILENAME = 'layout.json'
+
+# Cache of staging_dir -> (layout file mtime, layout)
+_layout_cache = {}
+
+def get_layout(staging_dir):
+    """
+    Get the layout of a staging area.
+
+    Args:
+        staging_dir (str): Path to the staging directory
+
+    Returns:
+        str: FLAT or SHARDED
+    """
+    layout_path = os.path.join(str(staging_dir), LAYOUT_FILENAME)
+    try:
+        mtime = os.stat(layout_path).st_mtime_ns
+    except FileNotFoundError:
+        return FLAT
+
+    cached = _layout_cache.get(layout_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(layout_path, 'r', encoding='utf-8') as f:
+            layout = json.load(f).get('layout', FLAT)
+    except Exception as e:
+        logger.error(f"Error reading staging layout from {layout_path}: {e}")
+        layout = FLAT
+
+    _layout_cache[layout_path] = (mtime, layout)
+    return layout
+
+def shard_dir(article_id):
+    """
+    Return the relative shard directory for an article ID.
+
+    Args:
+        article_id (str): The article ID (an md5 hex digest)
+
+    Returns:
+        str: e.g. 'ab/cd' for ID 'abcd...'
+    """
+    return os.path.join(article_id[:2], article_id[2:4])
+
+def _path_for_layout(staging_dir, subdir, article_id, ext, layout):
+    base = os.path.join(str(staging_dir), subdir)
+    if layout == SHARDED:
+        return os.path.join(base, shard_dir(article_id), f"{article_id}{ext}")
+    return os.path.join(base, f"{article_id}{ext}")
+
+def article_path(staging_dir, subdir, article_id, ext=None, create=False):
+    """
+    Get the path where an article file lives under the current layout.
+
+    Args:
+        staging_dir (str): Path to the staging directory
+        subdir (str): 'new', 'reviewed', 'rejected' or 'metadata'
+        article_id (str): The article ID
+        ext (str, optional): File extension, defaults to the subdirectory's extension
+        create (bool): Whether to create the parent directory
+
+    Returns:
+        str: Path to the article file
+    """
+    ext = ext or ARTICLE_DIRS.get(subdir, '.md')
+    path = _path_for_layout(staging_dir, subdir, article_id, ext, get_layout(staging_dir))
+    if create:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def find_article(staging_dir, subdir, article_id, ext=None):
+    """
+    Find an existing article file, looking in the current layout first and
+    falling back to the other one (e.g. for files written mid-migration).
+
+    Returns:
+        str: Path to the file, or None if it doesn't exist
+    """
+    ext = ext or ARTICLE_DIRS.get(subdir, '.md')
+    layout = get_layout(staging_dir)
+    for candidate in (layout, SHARDED if layout == FLAT else FLAT):
+        path = _path_for_layout(staging_dir, subdir, article_id, ext, candidate)
+        if os.path.exists(path):
+            return path
+    return None
+
+def iter_articles(staging_dir, subdir, ext=None):
+    """
+    Iterate over the article files in a staging subdirectory.
+
+    Both flat files and shard directories are visited, so a partially
+    migrated staging area is still listed completely.
+
+    Yields:
+        tuple: (article_id, path)
+    """
+    ext = ext or ARTICLE_DIRS.get(subdir, '.md')
+    base = os.path.join(str(staging_dir), subdir)
+    if not os.path.isdir(base):
+        return
+
+    with os.scandir(base) as top:
+        for entry in top:
+            if entry.is_file():
+                if entry.name.endswith(ext) and not entry.name.startswith('.'):
+                    yield entry.name[:-len(ext)], entry.path
+            elif entry.is_dir() and len(entry.name) == 2:
+                with os.scandir(entry.path) as level1:
+                    for shard in level1:
+                        if not (shard.is_dir() and len(shard.name) == 2):
+                            continue
+                        with os.scandir(shard.path) as level2:
+                            for f in level2:
+                                if f.name.endswith(ext) and not f.name.startswith('.'):
+                                    yield f.name[:-len(ext)], f.path
+
+def count_articles(staging_dir, subdir, ext=None):
+    """Count the article files in a staging subdirectory."""
+    return sum(1 for _ in iter_articles(staging_dir, subdir, ext))
+
+def _remove_empty_shards(base):
+    """Remove shard directories left empty after a migration."""
+    for level1 in os.listdir(base):
+        level1_path = os.path.join(base, level1)
+        if not (os.path.isdir(level1_path) and len(level1) == 2):
+            continue
+        for level2 in os.listdir(level1_path):
+            level2_path = os.path.join(level1_path, level2)
+            if os.path.isdir(level2_path) and not os.listdir(level2_path):
+                os.rmdir(level2_path)
+        if not os.listdir(level1_path):
+            os.rmdir(level1_path)
+
+def migrate_layout(staging_dir, target=SHARDED):
+    """
+    Move every article file in the staging area to the target layout.
+
+    Holds the staging lock exclusively, so no worker writes articles
+    while files are being moved.
+
+    Args:
+        staging_dir (str): Path to the staging directory
+        target (str): FLAT or SHARDED
+
+    Returns:
+        dict: Statistics about the migration
+    """
+    if target not in LAYOUTS:
+        raise ValueError(f"Unknown staging layout: {target}")
+
+    stats = {
+        'layout': target,
+        'moved': 0,
+        'errors': 0
+    }
+
+    staging_dir = str(staging_dir)
+    with staging_lock(staging_dir, exclusive=True):
+        for subdir, ext in ARTICLE_DIRS.items():
+            base = os.path.join(staging_dir, subdir)
+            os.makedirs(base, exist_ok=True)
+
+            for article_id, path in list(iter_articles(staging_dir, subdir, ext)):
+                target_path = _path_for_layout(staging_dir, subdir, article_id, ext, target)
+                if path == target_path:
+                    continue
+                try:
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                    shutil.move(path, target_path)
+                    stats['moved'] += 1
+                except Exception as e:
+                    logger.error(f"Error moving {path} to {target_path}: {e}")
+                    stats['errors'] += 1
+
+            if target == FLAT:
+                _remove_empty_shards(base)
+
+        write_json_atomic(os.path.join(staging_dir, LAYOUT_FILENAME), {'layout': target})
+
+    logger.info(f"Migrated staging area at {staging_dir} to {target} layout: {stats['moved']} files moved, {stats['errors']} errors")
+    return stats
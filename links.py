@@ -0,0 +1,139 @@
+"""
+Wikilink graph of the vault notes published in the digital garden.
+Keeps each note's outgoing [[links]] in a cache keyed by content hash, so
+only changed notes are parsed again, and resolves links and backlinks
+through a title index in time linear in the number of notes and links.
+"""
+
+import os
+import re
+import json
+import logging
+from pathlib import Path
+
+from scripts.rss_monitor.locking import write_json_atomic
+from scripts.obsidian_integration.render import WIKILINK_RE
+
+logger = logging.getLogger('garden_links')
+
+# Bump when link extraction changes, so cached links are parsed again
+LINK_GRAPH_VERSION = 1
+
+_WIKILINK_RE = re.compile(WIKILINK_RE)
+
+# Links inside code are not links
+_CODE_RE = re.compile(r'```.*?```|~~~.*?~~~|`[^`\n]*`', re.DOTALL)
+
+def extract_links(text):
+    """
+    Extract the targets of the wikilinks in a markdown text.
+
+    Args:
+        text (str): The markdown
+
+    Returns:
+        list: Link targets in order of first appearance, without duplicates
+    """
+    text = _CODE_RE.sub('', text)
+    return list(dict.fromkeys(match.group(1).strip() for match in _WIKILINK_RE.finditer(text)))
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if cache.get('version') != LINK_GRAPH_VERSION:
+        return {}
+    return cache.get('notes', {})
+
+class LinkGraph:
+    """Class to build the link graph of a stream of notes, parsing only notes that changed."""
+
+    def __init__(self, cache_path):
+        """
+        Initialize an empty graph.
+
+        Args:
+            cache_path (Path): JSON file holding the outgoing links of each note
+        """
+        self.cache_path = cache_path
+        self.cached = _load_cache(cache_path)
+        self.stats = {'parsed': 0, 'cached': 0, 'removed': 0, 'links': 0, 'unresolved': 0}
+        self.entries = {}
+        self.pages = []
+        self.file_names = {}
+        self.titles = {}
+
+    def add(self, note):
+        """
+        Add a note, taking its outgoing links from the cache if its content did not change.
+
+        Only the links and the names the note can be linked by are kept, not the note.
+
+        Args:
+            note (dict): A note as returned by iter_vault_notes
+        """
+        entry = self.cached.get(note['rel_path'])
+        if entry and entry.get('hash') == note['content_hash']:
+            self.stats['cached'] += 1
+        else:
+            entry = {'hash': note['content_hash'], 'links': extract_links(note['body'])}
+            self.stats['parsed'] += 1
+        self.entries[note['rel_path']] = entry
+        self.pages.append((note['page'], note['rel_path']))
+
+        # A note can be linked by its title or its file name, compared casefolded
+        self.file_names[Path(note['path']).stem.casefold()] = note['page']
+        self.titles[note['title'].casefold()] = note['page']
+
+    def build(self):
+        """
+        Resolve the links of the notes added.
+
+        Returns:
+            tuple: (graph, statistics dict). The graph has 'targets' (casefolded
+                title or file name -> page, titles taking precedence), 'outgoing'
+                and 'backlinks' (page -> list of pages) and 'unresolved'
+                (page -> link targets that name no note).
+        """
+        stats = self.stats
+        stats['removed'] = len(set(self.cached) - set(self.entries))
+
+        targets = dict(self.file_names)
+        targets.update(self.titles)
+        graph = {'targets': targets, 'outgoing': {}, 'backlinks': {}, 'unresolved': {}}
+        for page, rel_path in self.pages:
+            outgoing = graph['outgoing'].setdefault(page, [])
+            for target in self.entries[rel_path]['links']:
+                linked = targets.get(target.casefold())
+                if linked is None:
+                    graph['unresolved'].setdefault(page, []).append(target)
+                    stats['unresolved'] += 1
+                elif linked != page and linked not in outgoing:
+                    outgoing.append(linked)
+                    graph['backlinks'].setdefault(linked, []).append(page)
+                    stats['links'] += 1
+
+        if stats['parsed'] or stats['removed'] or not os.path.exists(self.cache_path):
+            os.makedirs(os.path.dirname(str(self.cache_path)), exist_ok=True)
+            write_json_atomic(self.cache_path, {'version': LINK_GRAPH_VERSION, 'notes': self.entries})
+
+        logger.info(f"Built link graph: {stats}")
+        return graph, stats
+
+def build_link_graph(notes, cache_path):
+    """
+    Build the link graph of the notes, parsing only notes that changed.
+
+    Args:
+        notes (iterable): Notes as returned by iter_vault_notes
+        cache_path (Path): JSON file holding the outgoing links of each note
+
+    Returns:
+        tuple: (graph, statistics dict) as returned by LinkGraph.build
+    """
+    graph = LinkGraph(cache_path)
+    for note in notes:
+        graph.add(note)
+    return graph.build()
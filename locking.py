@@ -0,0 +1,283 @@
+"""
+Advisory locking and lease management for the staging area.
+Allows several fetch workers and reviewers on the same host to share
+one staging directory without corrupting each other's files.
+"""
+
+import os
+import json
+import time
+import fcntl
+import socket
+import hashlib
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger('staging_locks')
+
+# Number of lock files article locks are spread over
+LOCK_STRIPES = 256
+
+# Default lease lifetime in seconds
+DEFAULT_LEASE_TTL = 300
+
+def _lock_dir(staging_dir):
+    """Return (and create) the directory holding the lock files."""
+    lock_dir = os.path.join(staging_dir, 'locks')
+    os.makedirs(lock_dir, exist_ok=True)
+    return lock_dir
+
+def _stripe_for(key):
+    """Map a key to one of the lock stripes."""
+    return int(hashlib.md5(key.encode()).hexdigest()[:8], 16) % LOCK_STRIPES
+
+@contextmanager
+def _flock(path, mode):
+    """Hold an flock on the given file for the duration of the block."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, mode)
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+@contextmanager
+def staging_lock(staging_dir, exclusive=False):
+    """
+    Lock the staging area as a whole.
+
+    Regular operations take this lock shared; maintenance tasks that move
+    many files at once (migrations, archiving) take it exclusively.
+
+    Args:
+        staging_dir (str): Path to the staging directory
+        exclusive (bool): Whether to take the lock exclusively
+    """
+    path = os.path.join(_lock_dir(staging_dir), 'staging.lock')
+    with _flock(path, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH):
+        yield
+
+@contextmanager
+def article_lock(staging_dir, article_id):
+    """
+    Lock a single article while its files are written or moved.
+
+    Args:
+        staging_dir (str): Path to the staging directory
+        article_id (str): The ID of the article to lock
+    """
+    stripe_path = os.path.join(_lock_dir(staging_dir), f"article-{_stripe_for(article_id):03d}.lock")
+    with staging_lock(staging_dir):
+        with _flock(stripe_path, fcntl.LOCK_EX):
+            yield
+
+def write_text_atomic(path, text):
+    """
+    Write a text file atomically so concurrent readers never see a partial file.
+
+    Args:
+        path (str): Destination path
+        text (str): The content to write
+    """
+    path = str(path)
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def write_json_atomic(path, data):
+    """
+    Write a JSON file atomically.
+
+    Args:
+        path (str): Destination path
+        data (dict): The data to serialize
+    """
+    write_text_atomic(path, json.dumps(data, ensure_ascii=False, indent=2))
+
+def default_owner():
+    """Return an owner string identifying this worker process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class LeaseManager:
+    """Class to hand out time-limited leases on article IDs (or any other key)."""
+
+    def __init__(self, staging_dir, namespace='articles', owner=None, ttl=DEFAULT_LEASE_TTL):
+        """
+        Initialize the lease manager.
+
+        Args:
+            staging_dir (str): Path to the staging directory
+            namespace (str): Lease namespace, e.g. 'articles' or 'feeds'
+            owner (str, optional): Identifier of this worker, defaults to host:pid
+            ttl (int): Lease lifetime in seconds
+        """
+        self.staging_dir = str(staging_dir)
+        self.namespace = namespace
+        self.owner = owner or default_owner()
+        self.ttl = ttl
+        self.lease_dir = os.path.join(self.staging_dir, 'leases', namespace)
+        os.makedirs(self.lease_dir, exist_ok=True)
+
+    def _lease_path(self, key):
+        return os.path.join(self.lease_dir, f"{key}.json")
+
+    @contextmanager
+    def _key_lock(self, key):
+        with article_lock(self.staging_dir, f"{self.namespace}:{key}"):
+            yield
+
+    def _read_lease(self, key):
+        try:
+            with open(self._lease_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable lease {key}: {e}")
+            return None
+
+    def _is_stale(self, lease, now=None):
+        """Check whether a lease has expired or its owner process is gone."""
+        now = now or time.time()
+        if lease.get('expires_at', 0) <= now:
+            return True
+
+        # A lease held by a dead process on this host can be taken over immediately
+        host, _, pid = lease.get('owner', '').rpartition(':')
+        if host == socket.gethostname() and pid.isdigit():
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                return True
+            except PermissionError:
+                pass
+        return False
+
+    def claim(self, key):
+        """
+        Claim a lease on a key.
+
+        Args:
+            key (str): The key to claim, usually an article ID
+
+        Returns:
+            bool: True if this worker now holds the lease, False if another worker does
+        """
+        with self._key_lock(key):
+            now = time.time()
+            lease = self._read_lease(key)
+            if lease and lease.get('owner') != self.owner and not self._is_stale(lease, now):
+                return False
+
+            write_json_atomic(self._lease_path(key), {
+                'key': key,
+                'owner': self.owner,
+                'claimed_at': now,
+                'expires_at': now + self.ttl
+            })
+            return True
+
+    def claim_many(self, keys, limit=None):
+        """
+        Claim leases on as many of the given keys as possible.
+
+        Args:
+            keys (iterable): Keys to claim
+            limit (int, optional): Stop after this many successful claims
+
+        Returns:
+            list: The keys that were claimed
+        """
+        claimed = []
+        for key in keys:
+            if limit is not None and len(claimed) >= limit:
+                break
+            if self.claim(key):
+                claimed.append(key)
+        return claimed
+
+    def renew(self, key):
+        """
+        Extend a lease held by this worker.
+
+        Returns:
+            bool: True if the lease was renewed, False if it is no longer ours
+        """
+        with self._key_lock(key):
+            lease = self._read_lease(key)
+            if not lease or lease.get('owner') != self.owner:
+                return False
+            lease['expires_at'] = time.time() + self.ttl
+            write_json_atomic(self._lease_path(key), lease)
+            return True
+
+    def release(self, key):
+        """Release a lease held by this worker."""
+        with self._key_lock(key):
+            lease = self._read_lease(key)
+            if lease and lease.get('owner') == self.owner:
+                try:
+                    os.remove(self._lease_path(key))
+                except FileNotFoundError:
+                    pass
+
+    @contextmanager
+    def lease(self, key):
+        """
+        Hold a lease for the duration of a block.
+
+        Yields:
+            bool: Whether the lease was obtained
+        """
+        claimed = self.claim(key)
+        try:
+            yield claimed
+        finally:
+            if claimed:
+                self.release(key)
+
+    def list_leases(self):
+        """
+        List all current leases in this namespace.
+
+        Returns:
+            list: Lease dictionaries, each with an added 'stale' flag
+        """
+        leases = []
+        now = time.time()
+        for filename in os.listdir(self.lease_dir):
+            if filename.endswith('.json'):
+                lease = self._read_lease(filename[:-5])
+                if lease:
+                    lease['stale'] = self._is_stale(lease, now)
+                    leases.append(lease)
+        return leases
+
+    def expire_stale(self):
+        """
+        Remove expired leases.
+
+        Returns:
+            int: Number of leases removed
+        """
+        removed = 0
+        for filename in os.listdir(self.lease_dir):
+            if not filename.endswith('.json'):
+                continue
+            key = filename[:-5]
+            with self._key_lock(key):
+                lease = self._read_lease(key)
+                if lease is None or self._is_stale(lease):
+                    try:
+                        os.remove(self._lease_path(key))
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+
+        if removed:
+            logger.info(f"Expired {removed} stale {self.namespace} leases")
+        return removed
@@ -1,6 +1,11 @@
 // AI Governance Digital Garden
 // JavaScript for tag filtering and interactive elements
 
+/**
+ * Site root, derived from the location of this script (js/main.js)
+ */
+const SITE_ROOT = document.currentScript ? new URL('..', document.currentScript.src).href : '';
+
 document.addEventListener('DOMContentLoaded', function() {
   // Tag filtering functionality
   setupTagFiltering();
@@ -10,17 +15,44 @@ document.addEventListener('DOMContentLoaded', function() {
   
   // Mobile navigation toggle
   setupMobileNav();
+  
+  // Search over the prebuilt index
+  setupSearch();
 });
 
 /**
  * Sets up tag filtering functionality
+ * Each article gets a tag bitmask once (from the prebuilt tags/index.json,
+ * or from its data-tags as a fallback); filtering is then a bitwise AND
  */
 function setupTagFiltering() {
   const tagLinks = document.querySelectorAll('.tag');
-  const articles = document.querySelectorAll('.article');
+  const articles = Array.from(document.querySelectorAll('.article'));
   const activeTagsContainer = document.getElementById('active-tags');
   let activeTags = new Set();
   
+  // Pages without article cards let tag links navigate to their tag pages
+  if (articles.length === 0 || !activeTagsContainer) {
+    return;
+  }
+  
+  const WORD_BITS = 32;
+  let tagBits = new Map();
+  let nextBit = 0;
+  let articleMasks = [];
+  
+  computeMasks(null);
+  
+  fetch(SITE_ROOT + 'tags/index.json')
+    .then(response => response.ok ? response.json() : null)
+    .then(index => {
+      if (index) {
+        computeMasks(index);
+        filterArticles(activeTags);
+      }
+    })
+    .catch(() => {});
+  
   // Add click event to each tag
   tagLinks.forEach(tag => {
     tag.addEventListener('click', function(e) {
@@ -45,6 +77,60 @@ function setupTagFiltering() {
     });
   });
   
+  /**
+   * Assigns tag bits and computes each article's mask
+   */
+  function computeMasks(index) {
+    tagBits = new Map();
+    nextBit = 0;
+    const indexMasks = new Map();
+    
+    if (index) {
+      index.tags.forEach(tag => {
+        tagBits.set(tag.name, tag.bit);
+        nextBit = Math.max(nextBit, tag.bit + 1);
+      });
+      index.articles.forEach(article => indexMasks.set(article.page, article.mask));
+    }
+    
+    articleMasks = articles.map(article => {
+      const page = article.getAttribute('data-article');
+      if (page && indexMasks.has(page)) {
+        return indexMasks.get(page);
+      }
+      return maskFor((article.getAttribute('data-tags') || '').split(','), true);
+    });
+  }
+  
+  /**
+   * Builds a mask for a list of tags
+   * Unseen tags get a new bit when assign is set and are left out otherwise,
+   * so a query for a tag no article has matches nothing
+   */
+  function maskFor(tags, assign) {
+    const mask = [];
+    
+    tags.forEach(tag => {
+      if (!tag) {
+        return;
+      }
+      if (!tagBits.has(tag)) {
+        if (!assign) {
+          return;
+        }
+        tagBits.set(tag, nextBit++);
+      }
+      const bit = tagBits.get(tag);
+      const word = Math.floor(bit / WORD_BITS);
+      while (mask.length <= word) {
+        mask.push(0);
+      }
+      mask[word] |= 1 << (bit % WORD_BITS);
+    });
+    
+    return mask;
+  }
+  
   /**
    * Updates the display of active tags
    */
@@ -65,7 +151,14 @@ function setupTagFiltering() {
     tags.forEach(tag => {
       const tagElement = document.createElement('span');
       tagElement.classList.add('active-tag');
-      tagElement.innerHTML = `${tag} <button class="remove-tag" data-tag="${tag}">×</button>`;
+      tagElement.textContent = `${tag} `;
+      
+      const removeButton = document.createElement('button');
+      removeButton.classList.add('remove-tag');
+      removeButton.setAttribute('data-tag', tag);
+      removeButton.textContent = '×';
+      tagElement.appendChild(removeButton);
+      
       activeTagsContainer.appendChild(tagElement);
     });
     
@@ -76,7 +169,11 @@ function setupTagFiltering() {
         activeTags.delete(tagToRemove);
         
         // Update tag links to reflect removed tag
-        document.querySelector(`.tag[data-tag="${tagToRemove}"]`).classList.remove('active');
+        document.querySelectorAll('.tag').forEach(tag => {
+          if (tag.getAttribute('data-tag') === tagToRemove) {
+            tag.classList.remove('active');
+          }
+        });
         
         // Update display and filter
         updateActiveTagsDisplay(activeTags);
@@ -87,6 +184,7 @@ function setupTagFiltering() {
   
   /**
    * Filters articles based on active tags
+   * An article is shown if it has at least one active tag
    */
   function filterArticles(tags) {
     if (tags.size === 0) {
@@ -97,12 +195,16 @@ function setupTagFiltering() {
       return;
     }
     
-    // Check each article against active tags
-    articles.forEach(article => {
-      const articleTags = article.getAttribute('data-tags').split(',');
+    const query = maskFor(Array.from(tags), false);
+    
+    // Check each article's mask against the active tags
+    articles.forEach((article, i) => {
+      const mask = articleMasks[i];
+      let hasActiveTag = false;
       
-      // Check if article has at least one active tag
-      const hasActiveTag = Array.from(tags).some(tag => articleTags.includes(tag));
+      for (let word = 0; word < query.length && !hasActiveTag; word++) {
+        hasActiveTag = ((mask[word] || 0) & query[word]) !== 0;
+      }
       
       // Show or hide based on tag match
       article.style.display = hasActiveTag ? 'block' : 'none';
@@ -161,60 +263,183 @@ function detectLanguage() {
   return userLang.split('-')[0]; // Get primary language code
 }
 
+/**
+ * Tokenization matching the site build: NFKC + casefolding,
+ * words for alphabetic scripts and bigrams for Chinese/Japanese
+ */
+// Characters whose case folding differs from lowercasing (ß, final sigma,
+// Greek iota subscripts, ...); uppercasing and lowercasing them again folds them
+const FOLD_RE = /[ßςͅǰΐΰẖ-ẙὐ-ὖᾀ-ᾯᾲ-ᾴᾶᾷᾼ-ῄῆῇῌ-ῗῢ-ῧῲ-ῴῶῷῼᲀ-ᲈ]/gu;
+const CJK_RANGES = '぀-ヿ㐀-䶿一-鿿豈-﫿ㇰ-ㇿ';
+const CJK_RE = new RegExp(`[${CJK_RANGES}]`, 'u');
+const TOKEN_RE = new RegExp(`[${CJK_RANGES}]+|(?:(?![${CJK_RANGES}])[\\p{L}\\p{M}\\p{N}_])+`, 'gu');
+
+function casefold(text) {
+  return text.normalize('NFKC').toLowerCase()
+    .replace(FOLD_RE, c => c.toUpperCase().toLowerCase())
+    .replace(/ς/g, 'σ');
+}
+
+function tokenize(text) {
+  const tokens = [];
+  const runs = casefold(text).match(TOKEN_RE) || [];
+  
+  runs.forEach(run => {
+    if (CJK_RE.test(run[0])) {
+      if (run.length === 1) {
+        tokens.push(run);
+      } else {
+        for (let i = 0; i < run.length - 1; i++) {
+          tokens.push(run.slice(i, i + 2));
+        }
+      }
+    } else {
+      tokens.push(run);
+    }
+  });
+  
+  return tokens;
+}
+
 /**
  * Search functionality
+ * Uses the prebuilt, prefix-sharded index in search/ and only fetches
+ * the shards the query's terms fall into
  */
 function setupSearch() {
   const searchInput = document.getElementById('search-input');
   const searchResults = document.getElementById('search-results');
+  const cache = new Map();
+  let latestQuery = 0;
+  let debounceTimer = null;
   
   if (searchInput && searchResults) {
     searchInput.addEventListener('input', function() {
-      const query = this.value.toLowerCase();
+      const query = this.value;
+      clearTimeout(debounceTimer);
       
-      if (query.length < 2) {
+      if (query.trim().length < 2) {
         searchResults.innerHTML = '';
         return;
       }
       
-      // Get all articles
-      const articles = document.querySelectorAll('.article');
-      let results = [];
-      
-      // Search through articles
-      articles.forEach(article => {
-        const title = article.querySelector('.article-title').textContent.toLowerCase();
-        const excerpt = article.querySelector('.article-excerpt').textContent.toLowerCase();
+      debounceTimer = setTimeout(() => {
+        const queryNumber = ++latestQuery;
         
-        if (title.includes(query) || excerpt.includes(query)) {
-          results.push({
-            title: article.querySelector('.article-title').textContent,
-            url: article.querySelector('.article-title a').getAttribute('href')
+        runQuery(query)
+          .then(results => {
+            // Ignore responses to queries the user has already typed past
+            if (queryNumber === latestQuery) {
+              displaySearchResults(results);
+            }
+          })
+          .catch(() => {
+            searchResults.innerHTML = '<p>Search is unavailable</p>';
           });
-        }
-      });
-      
-      // Display results
-      displaySearchResults(results);
+      }, 150);
     });
+  }
+  
+  function loadJSON(path) {
+    if (!cache.has(path)) {
+      cache.set(path, fetch(SITE_ROOT + path).then(response => response.ok ? response.json() : null));
+    }
+    return cache.get(path);
+  }
+  
+  function shardKey(term, prefixLength) {
+    return CJK_RE.test(term[0]) ? term[0] : term.slice(0, prefixLength);
+  }
+  
+  async function runQuery(query) {
+    const tokens = tokenize(query).filter(token => token.length >= 2 || CJK_RE.test(token));
+    if (tokens.length === 0) {
+      return [];
+    }
     
-    function displaySearchResults(results) {
-      searchResults.innerHTML = '';
-      
-      if (results.length === 0) {
-        searchResults.innerHTML = '<p>No results found</p>';
-        return;
+    const manifest = await loadJSON('search/manifest.json');
+    if (!manifest) {
+      return [];
+    }
+    
+    let scores = null;
+    
+    for (let i = 0; i < tokens.length; i++) {
+      const term = tokens[i];
+      const shardFile = manifest.shards[shardKey(term, manifest.prefix_length)];
+      if (!shardFile) {
+        return [];
       }
       
-      const resultsList = document.createElement('ul');
+      const shard = await loadJSON('search/shards/' + shardFile) || {};
+      
+      // The last term matches as a prefix so results appear while typing
+      const isPrefix = i === tokens.length - 1 && !CJK_RE.test(term[0]);
+      const terms = isPrefix ? Object.keys(shard).filter(t => t.startsWith(term)) : (shard[term] ? [term] : []);
       
-      results.forEach(result => {
-        const listItem = document.createElement('li');
-        listItem.innerHTML = `<a href="${result.url}">${result.title}</a>`;
-        resultsList.appendChild(listItem);
+      const termScores = new Map();
+      terms.forEach(t => {
+        shard[t].forEach(([doc, score]) => {
+          termScores.set(doc, (termScores.get(doc) || 0) + score);
+        });
       });
       
-      searchResults.appendChild(resultsList);
+      // Every term has to match
+      if (scores === null) {
+        scores = termScores;
+      } else {
+        scores.forEach((score, doc) => {
+          if (termScores.has(doc)) {
+            scores.set(doc, score + termScores.get(doc));
+          } else {
+            scores.delete(doc);
+          }
+        });
+      }
+      
+      if (scores.size === 0) {
+        return [];
+      }
+    }
+    
+    const docs = await loadJSON('search/docs.json');
+    
+    return Array.from(scores.entries())
+      .sort((a, b) => b[1] - a[1])
+      .slice(0, 20)
+      .map(([doc]) => ({
+        title: docs[doc][0],
+        url: SITE_ROOT + docs[doc][1],
+        source: docs[doc][2],
+        date: docs[doc][3]
+      }));
+  }
+  
+  function displaySearchResults(results) {
+    searchResults.innerHTML = '';
+    
+    if (results.length === 0) {
+      searchResults.innerHTML = '<p>No results found</p>';
+      return;
     }
+    
+    const resultsList = document.createElement('ul');
+    
+    results.forEach(result => {
+      const listItem = document.createElement('li');
+      const link = document.createElement('a');
+      link.href = result.url;
+      link.textContent = result.title;
+      listItem.appendChild(link);
+      
+      const meta = document.createElement('span');
+      meta.classList.add('search-result-meta');
+      meta.textContent = ` ${result.source} · ${result.date}`;
+      listItem.appendChild(meta);
+      
+      resultsList.appendChild(listItem);
+    });
+    
+    searchResults.appendChild(resultsList);
   }
 }
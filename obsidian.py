@@ -3,7 +3,6 @@ Obsidian integration module for the AI Governance content aggregator.
 Handles the formatting and preparation of content for Obsidian and Digital Garden publishing.
 """
 
-import os
 import re
 import json
 import shutil
@@ -11,30 +10,31 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'obsidian_integration.log')),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger('obsidian_integration')
 
+def _is_current_copy(source_path, target_path):
+    """Whether target_path is a copy of source_path made by shutil.copy2 since it last changed."""
+    try:
+        source, target = source_path.stat(), target_path.stat()
+    except FileNotFoundError:
+        return False
+    return source.st_size == target.st_size and source.st_mtime_ns == target.st_mtime_ns
+
 class ObsidianIntegration:
     """Class to handle integration with Obsidian for digital garden publishing."""
     
-    def __init__(self, obsidian_vault_path, digital_garden_path=None):
+    def __init__(self, obsidian_vault_path, digital_garden_path=None, search_index=None):
         """
         Initialize the Obsidian integration.
         
         Args:
             obsidian_vault_path (str): Path to the Obsidian vault
             digital_garden_path (str, optional): Path to the digital garden directory
+            search_index (SearchIndex, optional): Full-text index to update as articles are imported
         """
         self.obsidian_vault_path = Path(obsidian_vault_path)
         self.digital_garden_path = Path(digital_garden_path) if digital_garden_path else None
+        self.search_index = search_index
         
         # Create directories if they don't exist
         self.obsidian_vault_path.mkdir(parents=True, exist_ok=True)
@@ -228,71 +228,94 @@ tags: [daily-note]
             str: Path to the imported article in Obsidian
         """
         try:
-            article_path = Path(article_path)
-            
-            # Read the article content
-            with open(article_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract frontmatter
-            frontmatter = {}
-            frontmatter_match = re.search(r'---\n(.*?)\n---', content, re.DOTALL)
-            if frontmatter_match:
-                frontmatter_text = frontmatter_match.group(1)
-                for line in frontmatter_text.split('\n'):
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        frontmatter[key.strip()] = value.strip()
-            
-            # Determine category
-            if not category:
-                category = frontmatter.get('category', 'Uncategorized')
-            
-            # Map category to Obsidian directory
-            category_mapping = {
-                'journalism': 'Journalism',
-                'international_org': 'International Organizations',
-                'ngo': 'NGOs',
-                'government': 'Government',
-                'academic': 'Academic',
-                'zh-cn': 'Chinese Sources',
-                'ja': 'Japanese Sources',
-                'ru': 'Russian Sources',
-                'es': 'Spanish Sources'
-            }
-            
-            obsidian_category = category_mapping.get(category, category)
-            
-            # Create target directory if it doesn't exist
-            target_dir = self.obsidian_vault_path / "AI Governance" / obsidian_category
-            target_dir.mkdir(exist_ok=True)
-            
-            # Generate filename
-            title = frontmatter.get('title', article_path.stem)
-            date = frontmatter.get('date', datetime.now().strftime('%Y-%m-%d'))
-            
-            # Clean title for filename
-            clean_title = re.sub(r'[^\w\s-]', '', title)
-            clean_title = re.sub(r'[\s]+', ' ', clean_title).strip()
-            clean_title = clean_title.replace(' ', '-')
-            
-            # Create filename with date prefix
-            if ' ' in date:
-                date = date.split(' ')[0]  # Get just the date part
-            
-            filename = f"{date} - {clean_title}.md"
-            target_path = target_dir / filename
-            
-            # Copy the file
-            shutil.copy2(article_path, target_path)
-            
-            logger.info(f"Imported article from {article_path} to {target_path}")
-            return str(target_path)
+            target_path, _ = self._import_article(article_path, category)
+            return target_path
         
         except Exception as e:
             logger.error(f"Error importing article {article_path}: {e}")
             return None
     
+    def _import_article(self, article_path, category):
+        """
+        Import an article unless the vault already has an up-to-date copy.
+        
+        Returns:
+            tuple: (path to the article in Obsidian, whether it was copied)
+        """
+        article_path = Path(article_path)
+        
+        # Read the article content
+        with open(article_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # Extract frontmatter
+        frontmatter = {}
+        frontmatter_match = re.search(r'---\n(.*?)\n---', content, re.DOTALL)
+        if frontmatter_match:
+            frontmatter_text = frontmatter_match.group(1)
+            for line in frontmatter_text.split('\n'):
+                if ':' in line:
+                    key, value = line.split(':', 1)
+                    frontmatter[key.strip()] = value.strip()
+        
+        # Determine category
+        if not category:
+            category = frontmatter.get('category', 'Uncategorized')
+        
+        # Map category to Obsidian directory
+        category_mapping = {
+            'journalism': 'Journalism',
+            'international_org': 'International Organizations',
+            'ngo': 'NGOs',
+            'government': 'Government',
+            'academic': 'Academic',
+            'zh-cn': 'Chinese Sources',
+            'ja': 'Japanese Sources',
+            'ru': 'Russian Sources',
+            'es': 'Spanish Sources'
+        }
+        
+        obsidian_category = category_mapping.get(category, category)
+        
+        # Create target directory if it doesn't exist
+        target_dir = self.obsidian_vault_path / "AI Governance" / obsidian_category
+        target_dir.mkdir(exist_ok=True)
+        
+        # Generate filename
+        title = frontmatter.get('title', article_path.stem)
+        date = frontmatter.get('date', datetime.now().strftime('%Y-%m-%d'))
+        
+        # Clean title for filename
+        clean_title = re.sub(r'[^\w\s-]', '', title)
+        clean_title = re.sub(r'[\s]+', ' ', clean_title).strip()
+        clean_title = clean_title.replace(' ', '-')
+        
+        # Create filename with date prefix
+        if ' ' in date:
+            date = date.split(' ')[0]  # Get just the date part
+        
+        filename = f"{date} - {clean_title}.md"
+        target_path = target_dir / filename
+        
+        # The copy keeps the article's modification time, so a copy of the same
+        # size and time was made from this version and is already indexed
+        if _is_current_copy(article_path, target_path):
+            logger.debug(f"Skipped unchanged article {article_path}")
+            return str(target_path), False
+        
+        # Copy the file
+        shutil.copy2(article_path, target_path)
+        
+        # Index the imported note for full-text search
+        if self.search_index:
+            try:
+                self.search_index.index_file(target_path)
+            except Exception as e:
+                logger.warning(f"Error indexing {target_path} for search: {e}")
+        
+        logger.info(f"Imported article from {article_path} to {target_path}")
+        return str(target_path), True
+    
     def batch_import(self, source_dir, category_mapping=None):
         """
         Import multiple articles from a directory.
@@ -307,6 +330,7 @@ tags: [daily-note]
         stats = {
             'total': 0,
             'imported': 0,
+            'unchanged': 0,
             'errors': 0,
             'articles': []
         }
@@ -314,8 +338,8 @@ tags: [daily-note]
         try:
             source_dir = Path(source_dir)
             
-            # Get all markdown files
-            markdown_files = list(source_dir.glob('*.md'))
+            # Get all markdown files, including those in a sharded staging layout (ab/cd/<id>.md)
+            markdown_files = list(source_dir.glob('*.md')) + list(source_dir.glob('??/??/*.md'))
             stats['total'] = len(markdown_files)
             
             for file_path in markdown_files:
@@ -326,9 +350,9 @@ tags: [daily-note]
                     if category_mapping and article_id in category_mapping:
                         category = category_mapping[article_id]
                     
-                    imported_path = self.import_article(file_path, category)
+                    imported_path, copied = self._import_article(file_path, category)
                     
-                    if imported_path:
+                    if copied:
                         stats['imported'] += 1
                         stats['articles'].append({
                             'id': article_id,
@@ -336,7 +360,7 @@ tags: [daily-note]
                             'destination': imported_path
                         })
                     else:
-                        stats['errors'] += 1
+                        stats['unchanged'] += 1
                 
                 except Exception as e:
                     logger.error(f"Error importing {file_path}: {e}")
@@ -2,13 +2,13 @@
 Command-line interface for the Obsidian integration module.
 """
 
-import os
 import sys
 import argparse
 import json
 import logging
 from pathlib import Path
 from obsidian_integration.obsidian import ObsidianIntegration
+from rss_monitor.logging_setup import configure_logging
 
 def main():
     """Main entry point for the Obsidian integration CLI."""
@@ -42,14 +42,7 @@ def main():
     args = parser.parse_args()
     
     # Set up logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'obsidian_cli.log')),
-            logging.StreamHandler()
-        ]
-    )
+    configure_logging()
     logger = logging.getLogger('obsidian_cli')
     
     # Execute the appropriate command
@@ -92,7 +85,7 @@ def main():
         integration = ObsidianIntegration(args.vault_path)
         stats = integration.batch_import(args.source_dir, category_mapping)
         
-        print(f"Batch import completed: {stats['imported']} of {stats['total']} articles imported, {stats['errors']} errors")
+        print(f"Batch import completed: {stats['imported']} of {stats['total']} articles imported, {stats['unchanged']} unchanged, {stats['errors']} errors")
         if stats['imported'] > 0:
             print("\nImported articles:")
             for article in stats['articles']:
@@ -0,0 +1,135 @@
+"""
+Profiling hooks for pipeline runs.
+Wraps each stage of a run in cProfile and a low-overhead stack sampler,
+and writes per-stage .pstats files, collapsed-stack files (for flame
+graphs) and a summary of the top functions by cumulative time.
+"""
+
+import os
+import io
+import sys
+import time
+import pstats
+import cProfile
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger('profiling')
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+
+# Number of functions listed per stage in the summary
+TOP_FUNCTIONS = 25
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'profiles')
+
+def default_profile_dir():
+    """Return a new timestamped directory under <project root>/profiles."""
+    return os.path.join(PROFILE_DIR, datetime.now().strftime('%Y%m%d-%H%M%S'))
+
+class StackSampler:
+    """Sample the stack of one thread at a fixed interval and count identical stacks."""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = {}
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='stack-sampler', daemon=True)
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                key = ';'.join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def write_collapsed(self, path):
+        """Write the samples in collapsed-stack format ('frame;frame;frame count' per line)."""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.counts.items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
+
+class RunProfiler:
+    """Class to profile the stages of a run and write the results to a directory."""
+
+    def __init__(self, output_dir=None, top=TOP_FUNCTIONS):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir (str, optional): Directory for the profile files, a new
+                timestamped directory under profiles/ by default
+            top (int): Number of functions to list per stage in the summary
+        """
+        self.output_dir = output_dir or default_profile_dir()
+        self.top = top
+        self.stages = []
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Profile a stage of the run.
+
+        Writes <name>.pstats and <name>.collapsed to the output directory.
+
+        Args:
+            name (str): Name of the stage, used for the file names
+        """
+        profile = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident())
+        start_time = time.perf_counter()
+
+        sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            sampler.stop()
+            elapsed = time.perf_counter() - start_time
+
+            stats_path = os.path.join(self.output_dir, f"{name}.pstats")
+            profile.dump_stats(stats_path)
+            sampler.write_collapsed(os.path.join(self.output_dir, f"{name}.collapsed"))
+            self.stages.append((name, elapsed, stats_path))
+            logger.info(f"Profiled stage '{name}' ({elapsed:.2f}s) to {stats_path}")
+
+    def write_summary(self):
+        """
+        Write summary.txt with the wall time and top functions of each stage.
+
+        Returns:
+            str: Path to the summary file
+        """
+        summary_path = os.path.join(self.output_dir, 'summary.txt')
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(f"Profile of run at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            for name, elapsed, _ in self.stages:
+                f.write(f"{name:30} {elapsed:10.3f}s\n")
+
+            for name, elapsed, stats_path in self.stages:
+                output = io.StringIO()
+                stats = pstats.Stats(stats_path, stream=output)
+                stats.strip_dirs().sort_stats('cumulative').print_stats(self.top)
+                f.write(f"\n=== {name} ({elapsed:.3f}s), top {self.top} by cumulative time ===\n")
+                f.write(output.getvalue())
+
+        logger.info(f"Wrote profile summary to {summary_path}")
+        return summary_path
@@ -0,0 +1,184 @@
+"""
+File-backed registry of the feeds to monitor and the relevance keywords.
+The registry file (feeds.json, next to pipeline.json) is checked between monitor cycles
+and reloaded when it changes, so feeds and keywords can be edited without
+restarting a running monitor.
+"""
+
+import os
+import json
+import hashlib
+import logging
+
+from .relevance import KeywordMatcher
+from .locking import write_json_atomic
+
+logger = logging.getLogger('rss_registry')
+
+REGISTRY_FILENAME = 'feeds.json'
+
+# Configuration directory of the project, used when no configuration file was loaded
+DEFAULT_CONFIG_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'config'
+)
+
+# Fields every feed entry must have
+FEED_FIELDS = ('url', 'category', 'language', 'source')
+
+class RegistryError(ValueError):
+    """Raised when the registry file is malformed."""
+
+def load_registry_file(path):
+    """
+    Read and validate a registry file.
+
+    Args:
+        path (str): Path to the registry file
+
+    Returns:
+        tuple: (list of feed dicts, dict of language code to keyword list)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise RegistryError(f"invalid JSON: {e}")
+
+    feeds = data.get('feeds')
+    keywords = data.get('keywords')
+    if not isinstance(feeds, list):
+        raise RegistryError("'feeds' must be a list")
+    if not isinstance(keywords, dict) or not all(isinstance(terms, list) for terms in keywords.values()):
+        raise RegistryError("'keywords' must map language codes to lists of keywords")
+
+    urls = set()
+    for index, feed in enumerate(feeds):
+        missing = [field for field in FEED_FIELDS if not isinstance(feed, dict) or not feed.get(field)]
+        if missing:
+            raise RegistryError(f"feed {index} is missing {', '.join(missing)}")
+        if feed['url'] in urls:
+            raise RegistryError(f"feed {feed['url']} is listed twice")
+        urls.add(feed['url'])
+
+    return feeds, keywords
+
+def write_registry_file(path, feeds, keywords):
+    """
+    Write a registry file, e.g. to seed it with the built-in defaults.
+
+    Args:
+        path (str): Path to the registry file
+        feeds (list): Feed dicts
+        keywords (dict): Mapping of language code to a list of keywords
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    write_json_atomic(path, {'feeds': feeds, 'keywords': keywords})
+
+def registry_path(config_path=None):
+    """
+    Get the path of the registry file.
+
+    Args:
+        config_path (str, optional): Path of the loaded pipeline.json
+
+    Returns:
+        str: RSS_FEED_REGISTRY if set, else feeds.json next to config_path,
+            else feeds.json in the project's config directory
+    """
+    if os.environ.get('RSS_FEED_REGISTRY'):
+        return os.environ['RSS_FEED_REGISTRY']
+    config_dir = os.path.dirname(os.path.abspath(config_path)) if config_path else DEFAULT_CONFIG_DIR
+    return os.path.join(config_dir, REGISTRY_FILENAME)
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+class FeedRegistry:
+    """The current feeds, keyword matcher and per-feed state of the monitor."""
+
+    def __init__(self, default_feeds, default_keywords, path=None):
+        """
+        Initialize the registry with the built-in defaults, then load the file if there is one.
+
+        Args:
+            default_feeds (list): Feeds to use while there is no registry file
+            default_keywords (dict): Keywords to use while there is no registry file
+            path (str, optional): Path to the registry file, registry_path() by default
+        """
+        self.path = path or registry_path()
+        self.signature = None
+        # Signature of a file that failed to load, so it is not reported again every cycle
+        self.failed_signature = None
+        self.feeds = {}
+        self.feed_state = {}
+        self.matcher = KeywordMatcher({})
+        self.apply(default_feeds, default_keywords)
+        self.reload()
+
+    def apply(self, feeds, keywords):
+        """
+        Switch to a new set of feeds and keywords.
+
+        The state of feeds whose configuration did not change is kept, and
+        only the keyword languages that changed are recompiled. The new feeds
+        and matcher are built first and switched to together.
+
+        Args:
+            feeds (list): Feed dicts
+            keywords (dict): Mapping of language code to a list of keywords
+
+        Returns:
+            dict: The URLs of the added, removed and changed feeds, and the recompiled languages
+        """
+        new_feeds = {feed['url']: dict(feed) for feed in feeds}
+        changes = {
+            'added': [url for url in new_feeds if url not in self.feeds],
+            'removed': [url for url in self.feeds if url not in new_feeds],
+            'changed': [url for url in new_feeds if url in self.feeds and new_feeds[url] != self.feeds[url]]
+        }
+
+        feed_state = {}
+        for url in new_feeds:
+            if url in self.feed_state and url not in changes['changed']:
+                feed_state[url] = self.feed_state[url]
+            else:
+                feed_state[url] = {'key': hashlib.md5(url.encode()).hexdigest()}
+
+        matcher, languages = self.matcher.updated(keywords)
+        changes['languages'] = sorted(languages)
+        self.feeds, self.feed_state, self.matcher = new_feeds, feed_state, matcher
+        return changes
+
+    def reload(self):
+        """
+        Reload the registry file if it changed since the last check.
+
+        A file that cannot be read or fails validation is ignored, and the
+        current configuration stays in effect until the file is fixed. The
+        error is logged once per version of the file.
+
+        Returns:
+            dict: The changes made, or None if nothing was reloaded
+        """
+        signature = _file_signature(self.path)
+        if signature is None or signature in (self.signature, self.failed_signature):
+            return None
+
+        try:
+            feeds, keywords = load_registry_file(self.path)
+        except Exception as e:
+            self.failed_signature = signature
+            logger.error(f"Error loading feed registry from {self.path}, keeping the current feeds: {e}")
+            return None
+
+        self.signature = signature
+        self.failed_signature = None
+        changes = self.apply(feeds, keywords)
+        logger.info(f"Loaded feed registry from {self.path}: {len(self.feeds)} feeds, "
+                    f"{len(changes['added'])} added, {len(changes['removed'])} removed, {len(changes['changed'])} changed, "
+                    f"keywords recompiled for {changes['languages'] or 'no languages'}")
+        return changes
@@ -0,0 +1,238 @@
+"""
+Related articles for the digital garden.
+Represents each vault note as a TF-IDF vector and finds its nearest
+neighbours by cosine similarity. Vectors and neighbour lists are cached
+per article, keyed by content hash, so a build only recomputes the
+articles that changed and the articles whose neighbours they affect.
+"""
+
+import os
+import json
+import math
+import logging
+
+from scripts.rss_monitor.search import tokenize
+from scripts.rss_monitor.locking import write_json_atomic
+
+logger = logging.getLogger('garden_related')
+
+CACHE_VERSION = 1
+
+# Number of related articles shown per page
+DEFAULT_TOP_K = 3
+
+# Term weights per field; titles say more about the topic than body text
+FIELD_WEIGHTS = {'title': 3, 'summary': 2, 'content': 1}
+
+# Only the highest weighted terms of each article take part in matching
+MAX_TERMS = 64
+
+# Recompute everything once the corpus size drifts this far from the last full run,
+# since the IDF weights the cached neighbours were scored with are then out of date
+MAX_CORPUS_DRIFT = 0.2
+
+def term_counts(note):
+    """
+    Count the weighted terms of a note.
+
+    Args:
+        note (dict): A note as returned by vault.read_note
+
+    Returns:
+        dict: Mapping of term to weighted count
+    """
+    counts = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in tokenize(note[field]):
+            counts[term] = counts.get(term, 0) + weight
+    return counts
+
+def build_vectors(counts_by_page):
+    """
+    Turn term counts into pruned, L2-normalized TF-IDF vectors.
+
+    Args:
+        counts_by_page (dict): Mapping of page to term counts
+
+    Returns:
+        tuple: (page -> {term: weight}, term -> [(page, weight), ...] postings)
+    """
+    doc_freq = {}
+    for counts in counts_by_page.values():
+        for term in counts:
+            doc_freq[term] = doc_freq.get(term, 0) + 1
+
+    total = len(counts_by_page)
+    vectors = {}
+    postings = {}
+    for page, counts in counts_by_page.items():
+        weights = {
+            term: (1 + math.log(count)) * math.log((1 + total) / (1 + doc_freq[term]))
+            for term, count in counts.items()
+        }
+        top = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:MAX_TERMS]
+        norm = math.sqrt(sum(weight * weight for _, weight in top))
+        if not norm:
+            vectors[page] = {}
+            continue
+        vectors[page] = {term: weight / norm for term, weight in top}
+        for term, weight in vectors[page].items():
+            postings.setdefault(term, []).append((page, weight))
+
+    return vectors, postings
+
+def similarities(page, vectors, postings):
+    """
+    Score every article sharing a term with the given one.
+
+    Walks the postings of the article's terms only, so the cost depends on
+    how many articles overlap rather than on the size of the corpus.
+
+    Returns:
+        dict: Mapping of other page to cosine similarity
+    """
+    scores = {}
+    for term, weight in vectors[page].items():
+        for other, other_weight in postings[term]:
+            if other != page:
+                scores[other] = scores.get(other, 0.0) + weight * other_weight
+    return scores
+
+def top_k(scores, k):
+    """Return the k best [page, score] pairs, ties broken by page name."""
+    best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+    return [[page, round(score, 6)] for page, score in best]
+
+def _load_cache(cache_path, k):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == CACHE_VERSION and cache.get('k') == k:
+            return cache
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Error reading related articles cache {cache_path}: {e}")
+    return {'version': CACHE_VERSION, 'k': k, 'corpus_size': 0, 'articles': {}}
+
+class RelatedArticles:
+    """Class to find the related articles of a stream of notes, reusing cached results."""
+
+    def __init__(self, cache_path, k=DEFAULT_TOP_K):
+        """
+        Initialize an empty set of articles.
+
+        Args:
+            cache_path (str): Path of the JSON cache file
+            k (int): Number of related articles per note
+        """
+        self.cache_path = cache_path
+        self.k = k
+        self.cache = _load_cache(cache_path, k)
+        self.hashes = {}
+        self.counts_by_page = {}
+        self.changed = set()
+
+    def add(self, note):
+        """
+        Add a note, counting its terms unless the cache has them for its content.
+
+        Only the content hash and term counts are kept, not the note.
+
+        Args:
+            note (dict): A note as returned by vault.read_note
+        """
+        page = note['page']
+        entry = self.cache['articles'].get(page)
+        self.hashes[page] = note['content_hash']
+        if entry and entry['hash'] == note['content_hash']:
+            self.counts_by_page[page] = entry['counts']
+            self.changed.discard(page)
+        else:
+            self.counts_by_page[page] = term_counts(note)
+            self.changed.add(page)
+
+    def compute(self):
+        """
+        Find the related articles of every note added.
+
+        An article is recomputed when its content hash changed, when one of its
+        cached neighbours changed or disappeared, or when a changed article now
+        scores higher than its weakest cached neighbour.
+
+        Returns:
+            tuple: (page -> list of related pages, statistics dict)
+        """
+        k = self.k
+        cached = self.cache['articles']
+        pages = set(self.hashes)
+        changed = self.changed
+
+        stats = {
+            'articles': len(pages),
+            'changed': len(changed),
+            'recomputed': 0,
+            'full_rebuild': False
+        }
+
+        removed = set(cached) - pages
+        vectors, postings = build_vectors(self.counts_by_page)
+
+        previous_size = self.cache.get('corpus_size') or 0
+        if not previous_size or abs(len(pages) - previous_size) > MAX_CORPUS_DRIFT * previous_size:
+            stale = set(pages)
+            stats['full_rebuild'] = True
+        else:
+            stale = set(changed)
+            affected = changed | removed
+            changed_scores = {page: similarities(page, vectors, postings) for page in changed}
+            for page in pages - changed:
+                neighbours = cached[page]['related']
+                if any(other in affected for other, _ in neighbours):
+                    stale.add(page)
+                    continue
+                threshold = neighbours[-1][1] if len(neighbours) >= k else 0.0
+                if any(scores.get(page, 0.0) > threshold for scores in changed_scores.values()):
+                    stale.add(page)
+
+        articles = {}
+        for page in self.hashes:
+            if page in stale:
+                related = top_k(similarities(page, vectors, postings), k)
+                stats['recomputed'] += 1
+            else:
+                related = cached[page]['related']
+            articles[page] = {
+                'hash': self.hashes[page],
+                'counts': self.counts_by_page[page],
+                'related': related
+            }
+
+        if stale or removed:
+            os.makedirs(os.path.dirname(str(self.cache_path)) or '.', exist_ok=True)
+            write_json_atomic(self.cache_path, {
+                'version': CACHE_VERSION,
+                'k': k,
+                'corpus_size': len(pages) if stats['full_rebuild'] else previous_size,
+                'articles': articles
+            })
+
+        logger.info(f"Related articles for {stats['articles']} notes: {stats['changed']} changed, {stats['recomputed']} recomputed")
+        return {page: [other for other, _ in entry['related']] for page, entry in articles.items()}, stats
+
+def compute_related(notes, cache_path, k=DEFAULT_TOP_K):
+    """
+    Find the related articles of every note, reusing cached results.
+
+    Args:
+        notes (iterable): Notes as returned by vault.iter_vault_notes, each with a 'page'
+        cache_path (str): Path of the JSON cache file
+        k (int): Number of related articles per note
+
+    Returns:
+        tuple: (page -> list of related pages, statistics dict)
+    """
+    related = RelatedArticles(cache_path, k)
+    for note in notes:
+        related.add(note)
+    return related.compute()
@@ -0,0 +1,174 @@
+"""
+Keyword relevance filter for the RSS feed monitor.
+Keywords are grouped by language and compiled into one pattern per
+language. An article is only matched against the keywords of its declared
+language, of the languages whose keywords are written in the scripts that
+appear in its text, and of English.
+"""
+
+import re
+import logging
+
+from .search import normalize
+
+logger = logging.getLogger('rss_relevance')
+
+# Checked for every article, since English terms turn up in all languages
+FALLBACK_LANGUAGE = 'en'
+
+# Languages without spaces between words, where keyword parts may run together
+UNSPACED_LANGUAGES = {'zh', 'ja'}
+
+# Script ranges of normalized (NFKC, casefolded) text
+SCRIPTS = [
+    ('kana', re.compile('[぀-ヿㇰ-ㇿ]')),
+    ('han', re.compile('[㐀-䶿一-鿿豈-﫿]')),
+    ('cyrillic', re.compile('[Ѐ-ӿ]')),
+    ('latin', re.compile('[a-zß-öø-ɏ]'))
+]
+
+def language_code(language):
+    """Reduce a feed language tag such as 'zh-cn' or 'en-US' to its base code."""
+    return (language or '').split('-')[0].split('_')[0].lower()
+
+def detect_scripts(text):
+    """
+    Detect the scripts that appear in a normalized text.
+
+    Args:
+        text (str): NFKC-normalized, casefolded text
+
+    Returns:
+        set: Script names from SCRIPTS
+    """
+    return {script for script, pattern in SCRIPTS if pattern.search(text)}
+
+def keyword_scripts(term):
+    """
+    Get the scripts a keyword is written in.
+
+    Latin letters mixed into another script (e.g. "AI" in a Japanese
+    term) do not count, so Latin text is not routed to that language.
+    """
+    scripts = detect_scripts(term)
+    return scripts - {'latin'} if len(scripts) > 1 else scripts
+
+class KeywordMatcher:
+    """Per-language compiled keyword patterns."""
+
+    def __init__(self, keywords):
+        """
+        Compile the keyword patterns.
+
+        Args:
+            keywords (dict): Mapping of language code to a list of keywords
+        """
+        self.keywords = {}
+        self.patterns = {}
+        self.scripts = {}
+        self.update(keywords)
+
+    def update(self, keywords):
+        """
+        Replace the keywords, recompiling only the languages whose keywords changed.
+
+        Args:
+            keywords (dict): Mapping of language code to a list of keywords
+
+        Returns:
+            set: Codes of the languages that were recompiled or removed
+        """
+        merged = {}
+        for language, terms in keywords.items():
+            merged.setdefault(language_code(language), set()).update(normalize(term) for term in terms)
+
+        changed = set(self.keywords) - set(merged)
+        for code in changed:
+            self.keywords.pop(code)
+            self.patterns.pop(code, None)
+            self.scripts.pop(code, None)
+
+        for code, terms in merged.items():
+            if self.keywords.get(code) == terms:
+                continue
+            changed.add(code)
+            self.keywords[code] = terms
+            self.scripts[code] = set().union(*(keyword_scripts(term) for term in terms))
+            pattern = self._compile(code, terms)
+            if pattern:
+                self.patterns[code] = pattern
+            else:
+                self.patterns.pop(code, None)
+
+        return changed
+
+    def updated(self, keywords):
+        """
+        Build a matcher for other keywords, leaving this one as it is.
+
+        The compiled patterns of languages whose keywords did not change are reused.
+
+        Args:
+            keywords (dict): Mapping of language code to a list of keywords
+
+        Returns:
+            tuple: (the new KeywordMatcher, set of recompiled or removed language codes)
+        """
+        matcher = KeywordMatcher({})
+        matcher.keywords = dict(self.keywords)
+        matcher.patterns = dict(self.patterns)
+        matcher.scripts = dict(self.scripts)
+        changed = matcher.update(keywords)
+        return matcher, changed
+
+    @staticmethod
+    def _compile(code, terms):
+        separator = r'\s*' if code in UNSPACED_LANGUAGES else r'\s+'
+        alternatives = set()
+        for term in terms:
+            parts = term.split()
+            if parts:
+                alternatives.add(separator.join(re.escape(part) for part in parts))
+        if not alternatives:
+            return None
+        # Longest first, so the alternation does not stop at a shorter prefix
+        return re.compile('|'.join(sorted(alternatives, key=len, reverse=True)))
+
+    def languages_for(self, text, language=None):
+        """
+        Get the languages to check a normalized text against.
+
+        Besides the declared language and English, these are the languages
+        whose keywords are written in a script that appears in the text, so
+        e.g. Chinese text in an English feed is still checked against the
+        Chinese keywords, but never against the Cyrillic ones.
+
+        Args:
+            text (str): NFKC-normalized, casefolded text
+            language (str, optional): Declared language of the text
+
+        Returns:
+            list: Language codes that have keywords
+        """
+        scripts = detect_scripts(text)
+        languages = {code for code, keyword_scripts in self.scripts.items() if keyword_scripts & scripts}
+        languages.update((language_code(language), FALLBACK_LANGUAGE))
+        return [code for code in languages if code in self.patterns]
+
+    def match(self, text, language=None):
+        """
+        Find the first keyword in a text.
+
+        Args:
+            text (str): The text to check
+            language (str, optional): Declared language of the text
+
+        Returns:
+            str: The matched text, or None if no keyword matches
+        """
+        text = normalize(text)
+        for code in self.languages_for(text, language):
+            found = self.patterns[code].search(text)
+            if found:
+                return found.group(0)
+        return None
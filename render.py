@@ -0,0 +1,144 @@
+"""
+Markdown rendering of vault notes for the digital garden.
+Converts note bodies, including Obsidian wikilinks and ==highlights==, to
+HTML fragments, and caches each fragment on disk by the hash of its
+markdown and the renderer version so unchanged notes are never converted
+again.
+"""
+
+import os
+import re
+import hashlib
+import logging
+from html import escape, unescape
+
+from scripts.rss_monitor.locking import write_text_atomic
+
+logger = logging.getLogger('garden_render')
+
+# Bump whenever the renderer's output changes, so cached fragments are rebuilt
+RENDERER_VERSION = 1
+
+MARKDOWN_EXTENSIONS = ['extra', 'sane_lists']
+
+# [[Target]], [[Target|Alias]], [[Target#Heading]] and embeds ![[Target]]
+WIKILINK_RE = r'!?\[\[([^\[\]|#]+)(?:#[^\[\]|]*)?(?:\|([^\[\]]+))?\]\]'
+HIGHLIGHT_RE = r'(==)(?!=)(.+?)=='
+
+# Rendered wikilinks, resolved to page URLs after the fragment is taken from the cache
+_INTERNAL_LINK_RE = re.compile(r'<a class="internal-link" data-wikilink="([^"]*)">')
+
+def _create_markdown():
+    # Imported on the first cache miss, so builds without changed notes never load markdown
+    import markdown
+    import xml.etree.ElementTree as etree
+    from markdown.inlinepatterns import InlineProcessor, SimpleTagInlineProcessor
+
+    class WikiLinkProcessor(InlineProcessor):
+        def handleMatch(self, m, data):
+            link = etree.Element('a')
+            link.set('class', 'internal-link')
+            link.set('data-wikilink', m.group(1).strip())
+            link.text = (m.group(2) or m.group(1)).strip()
+            return link, m.start(0), m.end(0)
+
+    class ObsidianExtension(markdown.Extension):
+        def extendMarkdown(self, md):
+            # Ahead of the standard link and emphasis patterns
+            md.inlinePatterns.register(WikiLinkProcessor(WIKILINK_RE, md), 'wikilink', 175)
+            md.inlinePatterns.register(SimpleTagInlineProcessor(HIGHLIGHT_RE, 'mark'), 'highlight', 65)
+
+    return markdown.Markdown(extensions=MARKDOWN_EXTENSIONS + [ObsidianExtension()], output_format='html')
+
+def fragment_key(text):
+    """Return the cache key of the fragment for a markdown text."""
+    return hashlib.sha256(f"{RENDERER_VERSION}\0{text}".encode('utf-8')).hexdigest()
+
+def resolve_links(html, pages):
+    """
+    Point the wikilinks in a rendered fragment at the pages they name.
+
+    Args:
+        html (str): A rendered fragment
+        pages (dict): Mapping of casefolded note title to page filename
+
+    Returns:
+        str: The fragment, with an href on every link whose target is a known page
+    """
+    def resolve(match):
+        page = pages.get(unescape(match.group(1)).casefold())
+        if not page:
+            return match.group(0)
+        return f'<a class="internal-link" href="{escape(page)}" data-wikilink="{match.group(1)}">'
+
+    return _INTERNAL_LINK_RE.sub(resolve, html)
+
+class FragmentRenderer:
+    """Class to render markdown to HTML fragments through an on-disk cache."""
+
+    def __init__(self, cache_dir):
+        """
+        Initialize the renderer.
+
+        Args:
+            cache_dir (Path): Directory holding the cached fragments
+        """
+        self.cache_dir = str(cache_dir)
+        self.used = set()
+        self.stats = {'rendered': 0, 'cached': 0, 'pruned': 0}
+        self._markdown = None
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.html")
+
+    def render(self, text):
+        """
+        Render markdown to an HTML fragment, from the cache if it was rendered before.
+
+        Args:
+            text (str): The markdown
+
+        Returns:
+            str: The HTML fragment, with wikilinks left unresolved
+        """
+        key = fragment_key(text)
+        self.used.add(key)
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                html = f.read()
+            self.stats['cached'] += 1
+            return html
+        except FileNotFoundError:
+            pass
+
+        if self._markdown is None:
+            self._markdown = _create_markdown()
+        html = self._markdown.reset().convert(text)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_text_atomic(path, html)
+        self.stats['rendered'] += 1
+        return html
+
+    def prune(self):
+        """
+        Remove cached fragments that were not used since the renderer was created.
+
+        Only call this after rendering every note of a build.
+
+        Returns:
+            dict: Statistics about the rendering
+        """
+        if os.path.isdir(self.cache_dir):
+            for shard in os.listdir(self.cache_dir):
+                shard_dir = os.path.join(self.cache_dir, shard)
+                if not os.path.isdir(shard_dir):
+                    continue
+                for filename in os.listdir(shard_dir):
+                    if filename.endswith('.html') and filename[:-5] not in self.used:
+                        os.remove(os.path.join(shard_dir, filename))
+                        self.stats['pruned'] += 1
+
+        logger.info(f"Rendered notes: {self.stats}")
+        return self.stats
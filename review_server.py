@@ -0,0 +1,341 @@
+"""
+Local HTTP review server for the staging area.
+Serves paginated listings, search and review decisions as JSON from one
+long-running process. The metadata of the articles awaiting review is
+loaded once and kept in memory, changes made by other processes are
+picked up through the search index, and every response carries an ETag
+so clients can revalidate a page with a conditional request.
+"""
+
+import os
+import json
+import bisect
+import logging
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from .staging import STAGING_DIR, iter_new_articles, get_new_article, approve_article, reject_article
+from .layout import find_article
+from .search import get_search_index
+
+logger = logging.getLogger('review_server')
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 500
+
+# Largest request body accepted, e.g. for a batch of decisions
+MAX_BODY_BYTES = 1024 * 1024
+
+DECISIONS = {'approve': approve_article, 'reject': reject_article}
+FILTERS = ('source', 'language', 'category')
+
+class BadRequest(ValueError):
+    """Raised when a request has invalid parameters or body."""
+
+def _sort_key(article_id, metadata):
+    return (metadata.get('date') or '', article_id)
+
+class ReviewStore:
+    """In-memory view of the articles awaiting review."""
+
+    def __init__(self):
+        """Load the articles awaiting review."""
+        self.search_index = get_search_index(STAGING_DIR)
+        self.articles = {}
+        self.order = []
+        self.version = 0
+        self.index_version = None
+        self._filtered = {}
+        # Keeps ETags of an earlier server run from matching
+        self.instance = os.urandom(4).hex()
+        self.load()
+
+    def _set_articles(self, articles):
+        self.articles = articles
+        # Oldest first, so removals are a bisect and pages are read from the end
+        self.order = sorted(_sort_key(article_id, metadata) for article_id, metadata in articles.items())
+        self._changed()
+
+    def _changed(self):
+        self.version += 1
+        self._filtered = {}
+
+    def load(self):
+        """Read the metadata of every article awaiting review."""
+        self.index_version = self.search_index.data_version()
+        self._set_articles({metadata['id']: metadata for metadata in iter_new_articles()})
+        logger.info(f"Loaded {len(self.articles)} articles awaiting review")
+
+    def refresh(self):
+        """
+        Pick up articles staged or reviewed by other processes.
+
+        Does nothing unless another connection committed to the search
+        index since the last check. Only the metadata of articles that are
+        not in memory yet is read.
+        """
+        index_version = self.search_index.data_version()
+        if index_version == self.index_version:
+            return
+        self.index_version = index_version
+
+        articles = {}
+        for row in self.search_index.iter_documents('staging', 'new'):
+            metadata = self.articles.get(row['doc_id']) or get_new_article(row['doc_id'])
+            if metadata:
+                articles[row['doc_id']] = metadata
+        # Articles the index does not cover are kept while they are still awaiting review
+        for article_id in self.articles.keys() - articles.keys():
+            if find_article(STAGING_DIR, 'new', article_id):
+                articles[article_id] = self.articles[article_id]
+
+        if articles.keys() != self.articles.keys():
+            self._set_articles(articles)
+
+    def etag(self, index=False):
+        """
+        Return the ETag of the current state.
+
+        Args:
+            index (bool): Whether the response also depends on the rest of the
+                search index (vault notes and reviewed articles)
+        """
+        if index:
+            return f'"{self.instance}-{self.version}-{self.index_version}"'
+        return f'"{self.instance}-{self.version}"'
+
+    def _matching(self, filters):
+        """Return the sort keys of the articles matching the filters, newest first."""
+        key = tuple(sorted(filters.items()))
+        if key not in self._filtered:
+            self._filtered[key] = [
+                entry for entry in reversed(self.order)
+                if all(self.articles[entry[1]].get(field) == value for field, value in filters.items())
+            ]
+        return self._filtered[key]
+
+    def page(self, limit, offset, filters):
+        """
+        Get a page of articles awaiting review, newest first.
+
+        Args:
+            limit (int): Maximum number of articles
+            offset (int): Number of articles to skip
+            filters (dict): Field values the articles must have
+
+        Returns:
+            dict: The total number of matching articles and the page
+        """
+        filters = {field: value for field, value in filters.items() if value}
+        if filters:
+            matching = self._matching(filters)
+            total = len(matching)
+            entries = matching[offset:offset + limit]
+        else:
+            total = len(self.order)
+            end = max(0, total - offset)
+            entries = self.order[max(0, end - limit):end][::-1]
+
+        return {
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'articles': [self.articles[article_id] for _, article_id in entries]
+        }
+
+    def article(self, article_id):
+        """Get the metadata and markdown of an article awaiting review, or None."""
+        metadata = self.articles.get(article_id)
+        path = find_article(STAGING_DIR, 'new', article_id) if metadata else None
+        if not path:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return dict(metadata, content=f.read())
+
+    def decide(self, article_id, decision):
+        """
+        Approve or reject an article.
+
+        Args:
+            article_id (str): The ID of the article
+            decision (str): 'approve' or 'reject'
+
+        Returns:
+            bool: True if the decision was recorded, False otherwise
+        """
+        if decision not in DECISIONS:
+            raise BadRequest(f"unknown decision {decision!r}")
+        if not DECISIONS[decision](article_id):
+            return False
+
+        metadata = self.articles.pop(article_id, None)
+        if metadata:
+            entry = _sort_key(article_id, metadata)
+            position = bisect.bisect_left(self.order, entry)
+            if position < len(self.order) and self.order[position] == entry:
+                del self.order[position]
+            self._changed()
+        return True
+
+def _param(params, name, default=None):
+    values = params.get(name)
+    return values[0] if values else default
+
+def _int_param(params, name, default, maximum=None):
+    value = _param(params, name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer")
+    if value < 0:
+        raise BadRequest(f"{name} must not be negative")
+    return min(value, maximum) if maximum else value
+
+class ReviewRequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of the review API.
+
+    GET  /api/articles?limit=&offset=&source=&language=&category=
+    GET  /api/articles/<id>
+    GET  /api/search?q=&limit=&offset=&kind=&status=
+    POST /api/articles/<id>/approve and /api/articles/<id>/reject
+    POST /api/decisions with {"decisions": [{"id": ..., "decision": "approve" or "reject"}]}
+    """
+
+    server_version = 'ReviewServer/1.0'
+
+    # A stalled client cannot hold up the server for long
+    timeout = 30
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, status, payload, etag=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_cached(self, etag, build):
+        """Answer 304 if the client's copy is current, otherwise build and send the payload."""
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        payload = build()
+        if payload is None:
+            self._send_json(404, {'error': 'not found'})
+        else:
+            self._send_json(200, payload, etag)
+
+    def _read_body(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            raise BadRequest("invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise BadRequest("request body too large")
+        try:
+            return json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            raise BadRequest(f"invalid JSON: {e}")
+
+    def _handle(self, method):
+        store = self.server.store
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        params = parse_qs(url.query)
+
+        try:
+            store.refresh()
+
+            if method == 'GET' and parts == ['api', 'articles']:
+                limit = _int_param(params, 'limit', DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+                offset = _int_param(params, 'offset', 0)
+                filters = {field: _param(params, field) for field in FILTERS}
+                self._send_cached(store.etag(), lambda: store.page(limit, offset, filters))
+
+            elif method == 'GET' and len(parts) == 3 and parts[:2] == ['api', 'articles']:
+                self._send_cached(store.etag(), lambda: store.article(parts[2]))
+
+            elif method == 'GET' and parts == ['api', 'search']:
+                query = _param(params, 'q', '')
+                limit = _int_param(params, 'limit', DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+                offset = _int_param(params, 'offset', 0)
+                self._send_cached(store.etag(index=True), lambda: {
+                    'query': query,
+                    'results': store.search_index.search(query, limit=limit, offset=offset,
+                                                         kind=_param(params, 'kind'), status=_param(params, 'status'))
+                })
+
+            elif method == 'POST' and len(parts) == 4 and parts[:2] == ['api', 'articles'] and parts[3] in DECISIONS:
+                if store.decide(parts[2], parts[3]):
+                    self._send_json(200, {'id': parts[2], 'decision': parts[3], 'ok': True})
+                else:
+                    self._send_json(409, {'id': parts[2], 'decision': parts[3], 'ok': False,
+                                          'error': 'article is not awaiting review or is leased by another worker'})
+
+            elif method == 'POST' and parts == ['api', 'decisions']:
+                decisions = self._read_body().get('decisions')
+                # The whole batch is checked first, so a bad entry cannot leave it half applied
+                if not isinstance(decisions, list) or not all(
+                        isinstance(d, dict) and d.get('id') and d.get('decision') in DECISIONS for d in decisions):
+                    raise BadRequest("'decisions' must be a list of {\"id\": ..., \"decision\": \"approve\" or \"reject\"} objects")
+
+                results = []
+                stats = {'approved': 0, 'rejected': 0, 'failed': 0}
+                for decision in decisions:
+                    ok = store.decide(str(decision['id']), decision['decision'])
+                    results.append({'id': decision['id'], 'decision': decision['decision'], 'ok': ok})
+                    if not ok:
+                        stats['failed'] += 1
+                    elif decision['decision'] == 'approve':
+                        stats['approved'] += 1
+                    else:
+                        stats['rejected'] += 1
+                self._send_json(200, dict(stats, results=results))
+
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        except BadRequest as e:
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            logger.error(f"Error handling {method} {self.path}: {e}")
+            self._send_json(500, {'error': 'internal error'})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Create the review server and load the articles awaiting review.
+
+    The server handles one request at a time: requests are answered from
+    memory in well under the time a thread hand-off would save, and the
+    search index connection stays on a single thread.
+
+    Args:
+        host (str): Address to listen on
+        port (int): Port to listen on, 0 for any free port
+
+    Returns:
+        HTTPServer: The server, not serving yet
+    """
+    server = HTTPServer((host, port), ReviewRequestHandler)
+    server.store = ReviewStore()
+    return server
@@ -3,11 +3,12 @@
 Command-line interface for the RSS feed monitoring system.
 """
 
-import os
 import sys
+import json
 import argparse
 import logging
-from rss_monitor.core import run_monitor, run_once, setup_directories
+from datetime import datetime
+from rss_monitor.logging_setup import configure_logging
 
 def main():
     """Main entry point for the CLI."""
@@ -21,6 +22,7 @@ def main():
     
     # Run once command
     once_parser = subparsers.add_parser('once', help='Run the monitor once')
+    once_parser.add_argument('--profile', nargs='?', const='', metavar='DIR', help='Profile the run and write .pstats, collapsed stacks and a summary to DIR (default: profiles/<timestamp>)')
     
     # Run continuously command
     continuous_parser = subparsers.add_parser('run', help='Run the monitor continuously')
@@ -31,20 +33,20 @@ def main():
         help='Interval in seconds between runs (default: 3600)'
     )
     
+    # Feed health command
+    health_parser = subparsers.add_parser('health', help='Show the health of each feed')
+    health_parser.add_argument('--format', choices=['table', 'json'], default='table', help='Output format')
+    
     # Parse arguments
     args = parser.parse_args()
     
     # Set up logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rss_monitor.log')),
-            logging.StreamHandler()
-        ]
-    )
+    configure_logging()
     logger = logging.getLogger('rss_monitor_cli')
     
+    # Imported after argument parsing so --help and usage errors stay fast
+    from rss_monitor.core import run_monitor, run_once, setup_directories
+    
     # Execute the appropriate command
     if args.command == 'setup':
         logger.info("Setting up directory structure")
@@ -52,7 +54,46 @@ def main():
         logger.info("Directory structure set up successfully")
     elif args.command == 'once':
         logger.info("Running monitor once")
-        run_once()
+        if args.profile is not None:
+            from rss_monitor.profiling import RunProfiler
+            profiler = RunProfiler(args.profile or None)
+            with profiler.stage('rss_monitoring'):
+                run_once()
+            print(f"Profile summary written to {profiler.write_summary()}")
+        else:
+            run_once()
+    elif args.command == 'health':
+        from rss_monitor.core import STAGING_DIR
+        from rss_monitor.health import FeedHealth
+        feeds = FeedHealth(STAGING_DIR).list_health()
+        if args.format == 'json':
+            print(json.dumps(feeds, indent=2))
+        elif not feeds:
+            print("No feed health recorded yet")
+        else:
+            from tabulate import tabulate
+            
+            def format_time(timestamp):
+                return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M') if timestamp else '-'
+            
+            def format_latency(seconds):
+                return f"{seconds * 1000:.0f} ms" if seconds is not None else '-'
+            
+            table_data = [
+                [
+                    feed['source'] or feed['url'],
+                    feed['state'],
+                    f"{feed['success_rate']:.0%}" if feed['success_rate'] is not None else '-',
+                    format_latency(feed['p50_latency']),
+                    format_latency(feed['p95_latency']),
+                    feed['consecutive_failures'],
+                    format_time(feed['last_success']),
+                    format_time(feed['open_until']) if feed['state'] == 'open' else '-'
+                ]
+                for feed in feeds
+            ]
+            headers = ['Feed', 'State', 'Success', 'p50', 'p95', 'Failures in a row', 'Last success', 'Next probe']
+            print(tabulate(table_data, headers=headers, tablefmt='grid'))
     elif args.command == 'run':
         logger.info(f"Running monitor continuously with interval {args.interval} seconds")
         run_monitor(interval=args.interval)
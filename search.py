@@ -0,0 +1,455 @@
+"""
+Full-text search over the staging area and the Obsidian vault.
+Uses an SQLite FTS5 index with our own multilingual tokenization:
+text is NFKC-normalized and casefolded, words are split on Unicode word
+boundaries, and Chinese/Japanese runs are indexed as overlapping bigrams.
+"""
+
+import os
+import re
+import sqlite3
+import logging
+import unicodedata
+
+logger = logging.getLogger('staging_search')
+
+SEARCH_DB_FILENAME = 'search.db'
+
+# Left in the staging directory when an article could not be indexed; removed by a rebuild
+STALE_FILENAME = 'search.stale'
+
+# Column weights for bm25 ranking: title, summary, content
+RANK_WEIGHTS = (10.0, 4.0, 1.0)
+
+# Rows fetched per query when walking documents in date order
+LISTING_BATCH_SIZE = 100
+
+# Han, Hiragana, Katakana (incl. half-width after NFKC) and CJK compatibility ranges
+_CJK = '぀-ヿ㐀-䶿一-鿿豈-﫿ㇰ-ㇿ'
+_TOKEN_RE = re.compile(f'[{_CJK}]+|[^\\W{_CJK}]+', re.UNICODE)
+_CJK_RE = re.compile(f'[{_CJK}]')
+
+_FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---\n?', re.DOTALL)
+_SECTION_RE = re.compile(r'^## (Summary|Content)\s*$', re.MULTILINE)
+
+def normalize(text):
+    """Apply NFKC normalization and casefolding to a piece of text."""
+    return unicodedata.normalize('NFKC', text or '').casefold()
+
+def is_cjk(term):
+    """Check whether a term starts with a Chinese or Japanese character."""
+    return bool(_CJK_RE.match(term))
+
+def tokenize(text):
+    """
+    Split text into index terms.
+
+    Args:
+        text (str): The text to tokenize
+
+    Returns:
+        list: Terms; words for alphabetic scripts, bigrams for CJK runs
+    """
+    tokens = []
+    for run in _TOKEN_RE.findall(normalize(text)):
+        if is_cjk(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+def parse_note(text):
+    """
+    Split an article or note into frontmatter, summary and content.
+
+    Returns:
+        tuple: (frontmatter dict, summary str, content str)
+    """
+    frontmatter = {}
+    match = _FRONTMATTER_RE.match(text)
+    if match:
+        for line in match.group(1).split('\n'):
+            if ':' in line:
+                key, value = line.split(':', 1)
+                frontmatter[key.strip()] = value.strip().strip('"')
+        text = text[match.end():]
+
+    sections = {}
+    parts = _SECTION_RE.split(text)
+    for name, body in zip(parts[1::2], parts[2::2]):
+        sections[name.lower()] = body.strip()
+
+    summary = sections.get('summary', '')
+    content = sections.get('content', text.strip() if not sections else '')
+    return frontmatter, summary, content
+
+class SearchIndex:
+    """Class to maintain and query the full-text search index."""
+
+    def __init__(self, db_path):
+        """
+        Initialize the search index, creating the database if needed.
+
+        Args:
+            db_path (str): Path to the SQLite database file
+        """
+        self.db_path = str(db_path)
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                rowid INTEGER PRIMARY KEY,
+                doc_id TEXT UNIQUE NOT NULL,
+                kind TEXT NOT NULL,
+                status TEXT,
+                path TEXT,
+                title TEXT,
+                source TEXT,
+                language TEXT,
+                category TEXT,
+                date TEXT
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS terms USING fts5(
+                title, summary, content, tokenize = 'unicode61 remove_diacritics 0'
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        
+        # Indexes created before documents had a category get the column added
+        columns = [row['name'] for row in self.conn.execute('PRAGMA table_info(documents)')]
+        if 'category' not in columns:
+            self.conn.execute('ALTER TABLE documents ADD COLUMN category TEXT')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS documents_listing ON documents (kind, status, date)')
+        self.conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def index_document(self, doc_id, kind, title, summary, content, status=None, path=None,
+                       source=None, language=None, date=None, category=None):
+        """
+        Add or replace a document in the index.
+
+        Args:
+            doc_id (str): Unique ID, the article ID for staging documents
+            kind (str): 'staging' or 'vault'
+            title (str): Document title
+            summary (str): Document summary
+            content (str): Document body
+            status (str, optional): Review status ('new', 'approved', 'rejected', 'archived')
+            path (str, optional): Path to the file, for vault notes
+            source (str, optional): Article source
+            language (str, optional): Article language
+            date (str, optional): Publication date
+            category (str, optional): Source category
+        """
+        # Dates are never NULL, so listings can page through them in index order
+        date = date or ''
+        with self.conn:
+            row = self.conn.execute('SELECT rowid FROM documents WHERE doc_id = ?', (doc_id,)).fetchone()
+            if row:
+                self.conn.execute('DELETE FROM terms WHERE rowid = ?', (row['rowid'],))
+                self.conn.execute(
+                    'UPDATE documents SET kind = ?, status = ?, path = ?, title = ?, source = ?, language = ?, category = ?, date = ? WHERE rowid = ?',
+                    (kind, status, path, title, source, language, category, date, row['rowid'])
+                )
+                rowid = row['rowid']
+            else:
+                rowid = self.conn.execute(
+                    'INSERT INTO documents (doc_id, kind, status, path, title, source, language, category, date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (doc_id, kind, status, path, title, source, language, category, date)
+                ).lastrowid
+
+            self.conn.execute(
+                'INSERT INTO terms (rowid, title, summary, content) VALUES (?, ?, ?, ?)',
+                (rowid, ' '.join(tokenize(title)), ' '.join(tokenize(summary)), ' '.join(tokenize(content)))
+            )
+
+    def index_file(self, path, doc_id=None, kind='vault', status=None):
+        """
+        Index a markdown article or note from disk.
+
+        Args:
+            path (str): Path to the markdown file
+            doc_id (str, optional): Document ID, defaults to the file path
+            kind (str): 'staging' or 'vault'
+            status (str, optional): Review status
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            frontmatter, summary, content = parse_note(f.read())
+
+        self.index_document(
+            doc_id or str(path),
+            kind,
+            frontmatter.get('title', os.path.splitext(os.path.basename(str(path)))[0]),
+            summary,
+            content,
+            status=status,
+            path=str(path) if kind == 'vault' else None,
+            source=frontmatter.get('source'),
+            language=frontmatter.get('language'),
+            date=frontmatter.get('date'),
+            category=frontmatter.get('category')
+        )
+
+    def update_status(self, doc_id, status):
+        """Record a new review status for a document without reindexing its text."""
+        with self.conn:
+            self.conn.execute('UPDATE documents SET status = ? WHERE doc_id = ?', (status, doc_id))
+
+    def count_documents(self, kind=None, status=None):
+        """Count the documents of a kind and status."""
+        sql = 'SELECT COUNT(*) FROM documents WHERE 1 = 1'
+        params = []
+        if kind:
+            sql += ' AND kind = ?'
+            params.append(kind)
+        if status:
+            sql += ' AND status = ?'
+            params.append(status)
+        return self.conn.execute(sql, params).fetchone()[0]
+    
+    def get_meta(self, key):
+        """Return a value stored with the index, or None."""
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_meta(self, key, value):
+        """Store a value with the index."""
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+    
+    def data_version(self):
+        """Return a number that changes whenever another connection commits to the index."""
+        return self.conn.execute('PRAGMA data_version').fetchone()[0]
+    
+    def iter_documents(self, kind, status, source=None, language=None, category=None):
+        """
+        Iterate over documents newest first, using the (kind, status, date) index.
+        
+        Rows are fetched in small batches with keyset pagination, so memory
+        does not grow with the number of documents, and documents can be
+        updated between batches (e.g. approved while being listed).
+        
+        Args:
+            kind (str): 'staging' or 'vault'
+            status (str): Review status
+            source (str, optional): Only documents from this source
+            language (str, optional): Only documents in this language
+            category (str, optional): Only documents in this category
+            
+        Yields:
+            dict: Document rows with doc_id, title, source, language, category and date
+        """
+        filters = ''
+        params = [kind, status]
+        for column, value in [('source', source), ('language', language), ('category', category)]:
+            if value:
+                filters += f' AND {column} = ?'
+                params.append(value)
+        
+        last = None
+        while True:
+            sql = f"""
+                SELECT rowid, doc_id, title, source, language, category, date
+                FROM documents WHERE kind = ? AND status = ?{filters}
+            """
+            batch_params = list(params)
+            if last:
+                sql += ' AND (date, rowid) < (?, ?)'
+                batch_params.extend(last)
+            sql += ' ORDER BY date DESC, rowid DESC LIMIT ?'
+            batch_params.append(LISTING_BATCH_SIZE)
+            
+            rows = self.conn.execute(sql, batch_params).fetchall()
+            for row in rows:
+                yield dict(row)
+            if len(rows) < LISTING_BATCH_SIZE:
+                return
+            last = (rows[-1]['date'], rows[-1]['rowid'])
+    
+    def remove_document(self, doc_id):
+        """Remove a document from the index."""
+        with self.conn:
+            row = self.conn.execute('SELECT rowid FROM documents WHERE doc_id = ?', (doc_id,)).fetchone()
+            if row:
+                self.conn.execute('DELETE FROM terms WHERE rowid = ?', (row['rowid'],))
+                self.conn.execute('DELETE FROM documents WHERE rowid = ?', (row['rowid'],))
+
+    def search(self, query, limit=20, offset=0, kind=None, status=None):
+        """
+        Run a ranked full-text query.
+
+        All query terms must match; the last term also matches as a prefix,
+        so partially typed words still find results.
+
+        Args:
+            query (str): The search query
+            limit (int): Maximum number of results
+            offset (int): Number of results to skip
+            kind (str, optional): Restrict to 'staging' or 'vault' documents
+            status (str, optional): Restrict to a review status
+
+        Returns:
+            list: Result dictionaries, best match first
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        terms = ['"' + token.replace('"', '""') + '"' for token in tokens]
+        if not is_cjk(tokens[-1]):
+            terms[-1] += '*'
+
+        sql = """
+            SELECT d.doc_id, d.kind, d.status, d.path, d.title, d.source, d.language, d.date,
+                   bm25(terms, ?, ?, ?) AS score
+            FROM terms JOIN documents d ON d.rowid = terms.rowid
+            WHERE terms MATCH ?
+        """
+        params = [*RANK_WEIGHTS, ' '.join(terms)]
+        if kind:
+            sql += ' AND d.kind = ?'
+            params.append(kind)
+        if status:
+            sql += ' AND d.status = ?'
+            params.append(status)
+        sql += ' ORDER BY score LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def rebuild(self, staging_dir, vault_path=None):
+        """
+        Rebuild the index from scratch.
+
+        Args:
+            staging_dir (str): Path to the staging directory
+            vault_path (str, optional): Path to the Obsidian vault
+
+        Returns:
+            dict: Number of documents indexed per kind
+        """
+        from .layout import iter_articles
+        from .archive import load_index, get_archived_article
+
+        stats = {'staging': 0, 'archived': 0, 'vault': 0, 'errors': 0}
+        with self.conn:
+            self.conn.execute('DELETE FROM terms')
+            self.conn.execute('DELETE FROM documents')
+
+        for subdir, status in [('new', 'new'), ('reviewed', 'approved'), ('rejected', 'rejected')]:
+            for article_id, path in iter_articles(staging_dir, subdir):
+                try:
+                    self.index_file(path, doc_id=article_id, kind='staging', status=status)
+                    stats['staging'] += 1
+                except Exception as e:
+                    logger.error(f"Error indexing {path}: {e}")
+                    stats['errors'] += 1
+
+        # Archived articles stay searchable, indexed from their archived copy
+        for article_id in list(load_index(staging_dir)):
+            try:
+                record = get_archived_article(staging_dir, article_id)
+                frontmatter, summary, content = parse_note(record['content'])
+                metadata = record.get('metadata') or {}
+                self.index_document(
+                    article_id,
+                    'staging',
+                    frontmatter.get('title', metadata.get('title', article_id)),
+                    summary,
+                    content,
+                    status='archived',
+                    source=frontmatter.get('source', metadata.get('source')),
+                    language=frontmatter.get('language', metadata.get('language')),
+                    date=frontmatter.get('date', metadata.get('date')),
+                    category=frontmatter.get('category', metadata.get('category'))
+                )
+                stats['archived'] += 1
+            except Exception as e:
+                logger.error(f"Error indexing archived article {article_id}: {e}")
+                stats['errors'] += 1
+
+        if vault_path:
+            for root, dirs, files in os.walk(vault_path):
+                dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'Templates']
+                for filename in files:
+                    if filename.endswith('.md'):
+                        path = os.path.join(root, filename)
+                        try:
+                            self.index_file(path)
+                            stats['vault'] += 1
+                        except Exception as e:
+                            logger.error(f"Error indexing {path}: {e}")
+                            stats['errors'] += 1
+
+        self.set_meta('covers_staging', '1')
+        try:
+            os.remove(os.path.join(str(staging_dir), STALE_FILENAME))
+        except FileNotFoundError:
+            pass
+
+        logger.info(f"Rebuilt search index at {self.db_path}: {stats}")
+        return stats
+
+# Open indexes, one per staging directory
+_indexes = {}
+
+def get_search_index(staging_dir):
+    """
+    Get the shared search index for a staging area.
+
+    Args:
+        staging_dir (str): Path to the staging directory
+
+    Returns:
+        SearchIndex: The index stored at <staging_dir>/search.db
+    """
+    db_path = os.path.join(str(staging_dir), SEARCH_DB_FILENAME)
+    if db_path not in _indexes:
+        _indexes[db_path] = SearchIndex(db_path)
+    return _indexes[db_path]
+
+def mark_index_stale(staging_dir):
+    """Record that an article was staged without being indexed, until the next rebuild."""
+    try:
+        with open(os.path.join(str(staging_dir), STALE_FILENAME), 'a', encoding='utf-8'):
+            pass
+    except OSError as e:
+        logger.error(f"Error marking the search index as stale: {e}")
+
+def index_covers_new_articles(staging_dir, search_index):
+    """
+    Check whether the search index lists every new article in the staging area.
+
+    The staging area is only walked to compare the counts until the index
+    covers it once; that is remembered in the index. Afterwards only the
+    marker left by a failed index update (see mark_index_stale) is checked.
+
+    Args:
+        staging_dir (str): Path to the staging directory
+        search_index (SearchIndex): The index of the staging area
+
+    Returns:
+        bool: True if new articles can be listed from the index
+    """
+    if os.path.exists(os.path.join(str(staging_dir), STALE_FILENAME)):
+        return False
+    if search_index.get_meta('covers_staging'):
+        return True
+
+    from .layout import count_articles
+    if search_index.count_documents(kind='staging', status='new') < count_articles(staging_dir, 'new'):
+        return False
+    search_index.set_meta('covers_staging', '1')
+    return True
@@ -5,55 +5,248 @@ Handles the workflow for reviewing and processing content in the staging area.
 
 import os
 import json
+import heapq
 import shutil
 import logging
 from datetime import datetime
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'rss_monitor.log')),
-        logging.StreamHandler()
-    ]
-)
+from .locking import LeaseManager, article_lock, write_json_atomic
+from .layout import article_path, find_article, iter_articles, count_articles
+from .archive import get_archive_summary
+from .search import get_search_index, index_covers_new_articles
+from .snapshot import get_snapshot
+
 logger = logging.getLogger('staging_manager')
 
-def list_new_articles():
+# Staging area location
+STAGING_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'staging')
+
+# Per-day approval logs (approvals/<YYYY-MM-DD>.jsonl) under the staging area
+APPROVALS_DIRNAME = 'approvals'
+
+# Metadata fields copied into the approval log
+APPROVAL_FIELDS = ('id', 'title', 'source', 'category', 'language', 'date', 'approved_date')
+
+# Review statuses of articles whose metadata is still in the staging area (archived ones are counted by the archive)
+LIVE_STATUSES = ('new', 'approved', 'rejected')
+
+def _read_metadata(staging_dir, article_id):
+    """Read the metadata of an article that is still awaiting review, or return None."""
+    metadata_path = find_article(staging_dir, 'metadata', article_id)
+    if not metadata_path:
+        return None
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except Exception as e:
+        logger.error(f"Error reading metadata for {article_id}: {e}")
+        return None
+    # Reviewed articles have a status; archived ones have no metadata left
+    return None if metadata.get('status') else metadata
+
+def _matches(metadata, filters):
+    return all(metadata.get(key) == value for key, value in filters.items() if value)
+
+def iter_new_articles(limit=None, offset=0, source=None, language=None, category=None):
     """
-    List all new articles in the staging area.
+    Iterate over the new articles in the staging area, newest first.
     
-    Returns:
-        list: A list of dictionaries containing article metadata
+    Articles are read in date order from the search index, so only the
+    metadata of the requested page is loaded. If the index does not cover
+    the staging area yet, the metadata files are scanned and the newest
+    articles kept in a heap of offset + limit entries.
+    
+    Args:
+        limit (int, optional): Maximum number of articles to yield
+        offset (int): Number of articles to skip
+        source (str, optional): Only articles from this source
+        language (str, optional): Only articles in this language
+        category (str, optional): Only articles in this category
+        
+    Yields:
+        dict: Article metadata
     """
-    articles = []
-    staging_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'staging')
-    metadata_dir = os.path.join(staging_dir, 'metadata')
-    new_dir = os.path.join(staging_dir, 'new')
+    staging_dir = STAGING_DIR
+    filters = {'source': source, 'language': language, 'category': category}
+    if limit is not None and limit <= 0:
+        return
     
     # Create directories if they don't exist
-    os.makedirs(metadata_dir, exist_ok=True)
-    os.makedirs(new_dir, exist_ok=True)
+    os.makedirs(os.path.join(staging_dir, 'metadata'), exist_ok=True)
+    os.makedirs(os.path.join(staging_dir, 'new'), exist_ok=True)
+    
+    search_index = get_search_index(staging_dir)
+    if index_covers_new_articles(staging_dir, search_index):
+        candidates = (_read_metadata(staging_dir, row['doc_id'])
+                      for row in search_index.iter_documents('staging', 'new', **filters))
+    else:
+        logger.warning("Search index is behind the staging area, scanning metadata (run 'staging_cli.py search --rebuild' to fix)")
+        candidates = _scan_new_articles(staging_dir, filters, None if limit is None else offset + limit)
+    
+    yielded = 0
+    skipped = 0
+    for metadata in candidates:
+        if metadata is None or not _matches(metadata, filters):
+            continue
+        if skipped < offset:
+            skipped += 1
+            continue
+        yield metadata
+        yielded += 1
+        if limit is not None and yielded >= limit:
+            return
+
+def _scan_new_articles(staging_dir, filters, top=None):
+    """Read the metadata of every new article and return the newest `top` matches (or all), newest first."""
+    articles = (_read_metadata(staging_dir, article_id) for article_id, _ in iter_articles(staging_dir, 'new'))
+    articles = (metadata for metadata in articles if metadata and _matches(metadata, filters))
+    if top is None:
+        return sorted(articles, key=lambda x: x.get('date', ''), reverse=True)
+    return heapq.nlargest(top, articles, key=lambda x: x.get('date', ''))
+
+def list_new_articles(limit=None, offset=0, source=None, language=None, category=None):
+    """
+    List new articles in the staging area.
+    
+    Args:
+        limit (int, optional): Maximum number of articles to return
+        offset (int): Number of articles to skip
+        source (str, optional): Only articles from this source
+        language (str, optional): Only articles in this language
+        category (str, optional): Only articles in this category
+    
+    Returns:
+        list: A list of dictionaries containing article metadata, newest first
+    """
+    return list(iter_new_articles(limit=limit, offset=offset, source=source, language=language, category=category))
+
+def get_new_article(article_id):
+    """
+    Get the metadata of an article that is awaiting review.
+    
+    Args:
+        article_id (str): The ID of the article
+    
+    Returns:
+        dict: The article metadata, or None if the article is not in the new directory
+    """
+    return _read_metadata(STAGING_DIR, article_id)
+
+def approval_log_path(staging_dir, day):
+    """Return the path of the approval log for a day (YYYY-MM-DD)."""
+    return os.path.join(str(staging_dir), APPROVALS_DIRNAME, f"{day}.jsonl")
+
+def _record_approval(staging_dir, metadata):
+    """
+    Append an approved article to the approval log of its approval day.
+    
+    The line is written with a single append, so concurrent approvals never
+    interleave within a line.
+    """
+    approved_date = metadata.get('approved_date') or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    entry = {field: metadata.get(field, '') for field in APPROVAL_FIELDS}
+    entry['approved_date'] = approved_date
+    
+    path = approval_log_path(staging_dir, approved_date[:10])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+def read_approvals(day, offset=0, staging_dir=None):
+    """
+    Read the articles approved on a day, starting at a byte offset in its log.
+    
+    Only complete lines are read, so a line still being appended is picked
+    up by the next call.
+    
+    Args:
+        day (str): The day, as YYYY-MM-DD
+        offset (int): Byte offset to start reading at, as returned by an earlier call
+        staging_dir (str, optional): Path to the staging directory
     
-    # Get all metadata files for articles in the new directory
-    if os.path.exists(new_dir):
-        for filename in os.listdir(new_dir):
-            if filename.endswith('.md'):
-                article_id = filename[:-3]  # Remove .md extension
-                metadata_path = os.path.join(metadata_dir, f"{article_id}.json")
+    Returns:
+        tuple: (list of approval entries, offset to continue from)
+    """
+    path = approval_log_path(staging_dir or STAGING_DIR, day)
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return [], 0
+    
+    complete = data.rfind(b'\n') + 1
+    entries = []
+    for line in data[:complete].splitlines():
+        try:
+            entries.append(json.loads(line))
+        except ValueError as e:
+            logger.warning(f"Skipping malformed line in approval log {path}: {e}")
+    
+    return entries, offset + complete
+
+def _transition_article(article_id, destination, status):
+    """
+    Move an article out of the new directory and record its review status.
+    
+    The article is leased for the duration of the move, so two reviewers
+    (or a reviewer and an auto-approving pipeline) cannot act on it at once.
+    
+    Args:
+        article_id (str): The ID of the article
+        destination (str): Target directory name ('reviewed' or 'rejected')
+        status (str): Status to record in the metadata ('approved' or 'rejected')
+        
+    Returns:
+        bool: True if the article was moved successfully, False otherwise
+    """
+    leases = LeaseManager(STAGING_DIR)
+    with leases.lease(article_id) as claimed:
+        if not claimed:
+            logger.error(f"Article {article_id} is currently leased by another worker")
+            return False
+        
+        with article_lock(STAGING_DIR, article_id):
+            new_path = find_article(STAGING_DIR, 'new', article_id)
+            if not new_path:
+                logger.error(f"Article {article_id} not found in new directory")
+                return False
+            
+            # Move the file, creating the target directory if it doesn't exist
+            target_path = article_path(STAGING_DIR, destination, article_id, create=True)
+            shutil.move(new_path, target_path)
+            
+            # Update metadata
+            metadata_path = find_article(STAGING_DIR, 'metadata', article_id)
+            if metadata_path:
+                with open(metadata_path, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
                 
-                if os.path.exists(metadata_path):
-                    try:
-                        with open(metadata_path, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                            articles.append(metadata)
-                    except Exception as e:
-                        logger.error(f"Error reading metadata for {article_id}: {e}")
+                metadata['status'] = status
+                metadata[f'{status}_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                
+                write_json_atomic(metadata_path, metadata)
+            else:
+                metadata = {'id': article_id}
+            
+            if status == 'approved':
+                _record_approval(STAGING_DIR, metadata)
+    
+    try:
+        get_search_index(STAGING_DIR).update_status(article_id, status)
+    except Exception as e:
+        logger.warning(f"Error updating search index for {article_id}: {e}")
+    
+    try:
+        get_snapshot(STAGING_DIR).set_status([article_id], status)
+    except Exception as e:
+        logger.warning(f"Error updating metadata snapshot for {article_id}: {e}")
     
-    # Sort by date, newest first
-    articles.sort(key=lambda x: x.get('date', ''), reverse=True)
-    return articles
+    return True
 
 def approve_article(article_id):
     """
@@ -66,32 +259,9 @@ def approve_article(article_id):
         bool: True if the article was approved successfully, False otherwise
     """
     try:
-        staging_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'staging')
-        new_path = os.path.join(staging_dir, 'new', f"{article_id}.md")
-        reviewed_path = os.path.join(staging_dir, 'reviewed', f"{article_id}.md")
-        
-        # Create reviewed directory if it doesn't exist
-        os.makedirs(os.path.join(staging_dir, 'reviewed'), exist_ok=True)
-        
-        if not os.path.exists(new_path):
-            logger.error(f"Article {article_id} not found in new directory")
+        if not _transition_article(article_id, 'reviewed', 'approved'):
             return False
         
-        # Move the file
-        shutil.move(new_path, reviewed_path)
-        
-        # Update metadata
-        metadata_path = os.path.join(staging_dir, 'metadata', f"{article_id}.json")
-        if os.path.exists(metadata_path):
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-            
-            metadata['status'] = 'approved'
-            metadata['approved_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
-        
         logger.info(f"Article {article_id} approved and moved to reviewed directory")
         return True
     
@@ -110,32 +280,9 @@ def reject_article(article_id):
         bool: True if the article was rejected successfully, False otherwise
     """
     try:
-        staging_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'staging')
-        new_path = os.path.join(staging_dir, 'new', f"{article_id}.md")
-        rejected_path = os.path.join(staging_dir, 'rejected', f"{article_id}.md")
-        
-        # Create rejected directory if it doesn't exist
-        os.makedirs(os.path.join(staging_dir, 'rejected'), exist_ok=True)
-        
-        if not os.path.exists(new_path):
-            logger.error(f"Article {article_id} not found in new directory")
+        if not _transition_article(article_id, 'rejected', 'rejected'):
             return False
         
-        # Move the file
-        shutil.move(new_path, rejected_path)
-        
-        # Update metadata
-        metadata_path = os.path.join(staging_dir, 'metadata', f"{article_id}.json")
-        if os.path.exists(metadata_path):
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-            
-            metadata['status'] = 'rejected'
-            metadata['rejected_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
-        
         logger.info(f"Article {article_id} rejected and moved to rejected directory")
         return True
     
@@ -156,82 +303,92 @@ def export_to_obsidian(article_id=None):
     """
     stats = {
         'exported': 0,
+        'unchanged': 0,
         'errors': 0,
         'articles': []
     }
     
     try:
-        staging_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'staging')
+        staging_dir = STAGING_DIR
         obsidian_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'obsidian-integration')
         
         # Create Obsidian directory if it doesn't exist
         os.makedirs(obsidian_dir, exist_ok=True)
         
-        reviewed_dir = os.path.join(staging_dir, 'reviewed')
-        metadata_dir = os.path.join(staging_dir, 'metadata')
-        
         # Create reviewed directory if it doesn't exist
-        os.makedirs(reviewed_dir, exist_ok=True)
+        os.makedirs(os.path.join(staging_dir, 'reviewed'), exist_ok=True)
         
         # Get list of articles to export
         if article_id:
-            articles = [f"{article_id}.md"]
+            articles = [(article_id, find_article(staging_dir, 'reviewed', article_id))]
         else:
-            if os.path.exists(reviewed_dir):
-                articles = [f for f in os.listdir(reviewed_dir) if f.endswith('.md')]
-            else:
-                articles = []
+            articles = list(iter_articles(staging_dir, 'reviewed'))
         
         # Export each article
-        for article_file in articles:
+        for article_id, source_path in articles:
             try:
-                article_id = article_file[:-3]  # Remove .md extension
-                source_path = os.path.join(reviewed_dir, article_file)
-                
-                # Get metadata
-                metadata_path = os.path.join(metadata_dir, f"{article_id}.json")
-                if os.path.exists(metadata_path):
-                    with open(metadata_path, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                else:
-                    logger.warning(f"Metadata not found for {article_id}, using default values")
-                    metadata = {
-                        'title': article_id,
-                        'date': datetime.now().strftime('%Y-%m-%d'),
-                        'category': 'unknown'
-                    }
-                
-                # Create category directory if it doesn't exist
-                category_dir = os.path.join(obsidian_dir, metadata.get('category', 'uncategorized'))
-                os.makedirs(category_dir, exist_ok=True)
-                
-                # Format the destination filename
-                date_str = metadata.get('date', '').split(' ')[0]  # Get just the date part
-                if not date_str:
-                    date_str = datetime.now().strftime('%Y-%m-%d')
-                
-                # Clean the title for use in a filename
-                title = metadata.get('title', article_id)
-                clean_title = ''.join(c if c.isalnum() or c in ' -_' else '_' for c in title)
-                clean_title = clean_title.strip()
-                
-                dest_filename = f"{date_str} - {clean_title}.md"
-                dest_path = os.path.join(category_dir, dest_filename)
-                
-                # Copy the file
-                with open(source_path, 'r', encoding='utf-8') as src:
-                    content = src.read()
-                
-                with open(dest_path, 'w', encoding='utf-8') as dest:
-                    dest.write(content)
-                
-                # Update metadata
-                metadata['exported_to_obsidian'] = True
-                metadata['export_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                metadata['obsidian_path'] = dest_path
-                
-                with open(metadata_path, 'w', encoding='utf-8') as f:
-                    json.dump(metadata, f, ensure_ascii=False, indent=2)
+                # Read-modify-write the metadata under the lock, so a review made in the meantime is not overwritten
+                with article_lock(staging_dir, article_id):
+                    # Look the article up again, it may have been archived since it was listed
+                    source_path = find_article(staging_dir, 'reviewed', article_id)
+                    if not source_path:
+                        raise FileNotFoundError(f"{article_id}.md not found in reviewed directory")
+                    
+                    # Get metadata
+                    metadata_path = find_article(staging_dir, 'metadata', article_id)
+                    if metadata_path:
+                        with open(metadata_path, 'r', encoding='utf-8') as f:
+                            metadata = json.load(f)
+                    else:
+                        logger.warning(f"Metadata not found for {article_id}, using default values")
+                        metadata_path = article_path(staging_dir, 'metadata', article_id, create=True)
+                        metadata = {
+                            'title': article_id,
+                            'date': datetime.now().strftime('%Y-%m-%d'),
+                            'category': 'unknown'
+                        }
+                    
+                    # Exported before and not edited since, so the note and its export date stay as they are
+                    exported_path = metadata.get('obsidian_path')
+                    if (metadata.get('exported_to_obsidian') and exported_path and os.path.exists(exported_path)
+                            and os.path.getmtime(exported_path) >= os.path.getmtime(source_path)):
+                        stats['unchanged'] += 1
+                        continue
+                    
+                    # Create category directory if it doesn't exist
+                    category_dir = os.path.join(obsidian_dir, metadata.get('category', 'uncategorized'))
+                    os.makedirs(category_dir, exist_ok=True)
+                    
+                    # Format the destination filename
+                    date_str = metadata.get('date', '').split(' ')[0]  # Get just the date part
+                    if not date_str:
+                        date_str = datetime.now().strftime('%Y-%m-%d')
+                    
+                    # Clean the title for use in a filename
+                    title = metadata.get('title', article_id)
+                    clean_title = ''.join(c if c.isalnum() or c in ' -_' else '_' for c in title)
+                    clean_title = clean_title.strip()
+                    
+                    dest_filename = f"{date_str} - {clean_title}.md"
+                    dest_path = os.path.join(category_dir, dest_filename)
+                    
+                    # Copy the file, recording the export date in its frontmatter for the garden pages.
+                    # A re-exported article keeps the date of its first export.
+                    export_date = metadata.get('export_date') or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    with open(source_path, 'r', encoding='utf-8') as src:
+                        content = src.read()
+                    if content.startswith('---\n') and '\nexport_date:' not in content.split('\n---', 2)[0]:
+                        content = f'---\nexport_date: "{export_date}"\n' + content[4:]
+                    
+                    with open(dest_path, 'w', encoding='utf-8') as dest:
+                        dest.write(content)
+                    
+                    # Update metadata
+                    metadata['exported_to_obsidian'] = True
+                    metadata['export_date'] = export_date
+                    metadata['obsidian_path'] = dest_path
+                    
+                    write_json_atomic(metadata_path, metadata)
                 
                 logger.info(f"Exported article {article_id} to {dest_path}")
                 stats['exported'] += 1
@@ -242,7 +399,7 @@ def export_to_obsidian(article_id=None):
                 })
             
             except Exception as e:
-                logger.error(f"Error exporting article {article_file}: {e}")
+                logger.error(f"Error exporting article {article_id}: {e}")
                 stats['errors'] += 1
         
         return stats
@@ -262,6 +419,7 @@ def get_staging_stats():
         'new': 0,
         'reviewed': 0,
         'rejected': 0,
+        'archived': 0,
         'total': 0,
         'by_category': {},
         'by_language': {},
@@ -269,7 +427,7 @@ def get_staging_stats():
     }
     
     try:
-        staging_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'staging')
+        staging_dir = STAGING_DIR
         
         # Create directories if they don't exist
         os.makedirs(os.path.join(staging_dir, 'new'), exist_ok=True)
@@ -278,40 +436,24 @@ def get_staging_stats():
         os.makedirs(os.path.join(staging_dir, 'metadata'), exist_ok=True)
         
         # Count files in each directory
-        if os.path.exists(os.path.join(staging_dir, 'new')):
-            stats['new'] = len([f for f in os.listdir(os.path.join(staging_dir, 'new')) if f.endswith('.md')])
+        stats['new'] = count_articles(staging_dir, 'new')
+        stats['reviewed'] = count_articles(staging_dir, 'reviewed')
+        stats['rejected'] = count_articles(staging_dir, 'rejected')
         
-        if os.path.exists(os.path.join(staging_dir, 'reviewed')):
-            stats['reviewed'] = len([f for f in os.listdir(os.path.join(staging_dir, 'reviewed')) if f.endswith('.md')])
+        # Archived articles are counted from the archive's running totals instead of being scanned
+        archive_summary = get_archive_summary(staging_dir)
+        stats['archived'] = archive_summary['total']
+        for key in ['by_category', 'by_language', 'by_source']:
+            stats[key] = dict(archive_summary[key])
         
-        if os.path.exists(os.path.join(staging_dir, 'rejected')):
-            stats['rejected'] = len([f for f in os.listdir(os.path.join(staging_dir, 'rejected')) if f.endswith('.md')])
+        stats['total'] = stats['new'] + stats['reviewed'] + stats['rejected'] + stats['archived']
         
-        stats['total'] = stats['new'] + stats['reviewed'] + stats['rejected']
-        
-        # Analyze metadata
-        metadata_dir = os.path.join(staging_dir, 'metadata')
-        if os.path.exists(metadata_dir):
-            for filename in os.listdir(metadata_dir):
-                if filename.endswith('.json'):
-                    try:
-                        with open(os.path.join(metadata_dir, filename), 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                        
-                        # Count by category
-                        category = metadata.get('category', 'unknown')
-                        stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-                        
-                        # Count by language
-                        language = metadata.get('language', 'unknown')
-                        stats['by_language'][language] = stats['by_language'].get(language, 0) + 1
-                        
-                        # Count by source
-                        source = metadata.get('source', 'unknown')
-                        stats['by_source'][source] = stats['by_source'].get(source, 0) + 1
-                    
-                    except Exception as e:
-                        logger.error(f"Error reading metadata file {filename}: {e}")
+        # Count the articles still in the staging area from the metadata snapshot instead of every metadata file
+        counts = get_snapshot(staging_dir).group_counts(('category', 'language', 'source'), statuses=LIVE_STATUSES)
+        for (category, language, source), count in counts.items():
+            stats['by_category'][category] = stats['by_category'].get(category, 0) + count
+            stats['by_language'][language] = stats['by_language'].get(language, 0) + count
+            stats['by_source'][source] = stats['by_source'].get(source, 0) + count
         
         return stats
     
@@ -3,19 +3,31 @@
 Main script for the staging area management CLI.
 """
 
-import os
 import sys
 import argparse
 import json
 import logging
-from tabulate import tabulate
+import time
+from datetime import datetime
 from rss_monitor.staging import (
     list_new_articles, 
     approve_article, 
     reject_article, 
     export_to_obsidian, 
-    get_staging_stats
+    get_staging_stats,
+    STAGING_DIR
 )
+from rss_monitor.locking import LeaseManager
+from rss_monitor.logging_setup import configure_logging
+from rss_monitor.layout import LAYOUTS, SHARDED, get_layout, migrate_layout
+from rss_monitor.archive import archive_articles, get_archived_article
+from rss_monitor.search import get_search_index
+from rss_monitor.snapshot import get_snapshot
+
+def tabulate(*args, **kwargs):
+    """Format a table. tabulate is only imported when a table is actually printed."""
+    from tabulate import tabulate as format_table
+    return format_table(*args, **kwargs)
 
 def main():
     """Main entry point for the staging CLI."""
@@ -27,6 +39,11 @@ def main():
     # List command
     list_parser = subparsers.add_parser('list', help='List articles in the staging area')
     list_parser.add_argument('--format', choices=['table', 'json'], default='table', help='Output format')
+    list_parser.add_argument('--limit', type=int, default=20, help='Maximum number of articles to show, 0 for all (default: 20)')
+    list_parser.add_argument('--offset', type=int, default=0, help='Number of articles to skip')
+    list_parser.add_argument('--source', help='Only show articles from this source')
+    list_parser.add_argument('--language', help='Only show articles in this language')
+    list_parser.add_argument('--category', help='Only show articles in this category')
     
     # Approve command
     approve_parser = subparsers.add_parser('approve', help='Approve an article')
@@ -44,23 +61,65 @@ def main():
     stats_parser = subparsers.add_parser('stats', help='Get statistics about the staging area')
     stats_parser.add_argument('--format', choices=['table', 'json'], default='table', help='Output format')
     
+    # Leases command
+    leases_parser = subparsers.add_parser('leases', help='Show worker leases on articles and feeds')
+    leases_parser.add_argument('--expire', action='store_true', help='Remove stale leases')
+    
+    # Migrate layout command
+    migrate_parser = subparsers.add_parser('migrate-layout', help='Convert the staging area between flat and sharded layouts')
+    migrate_parser.add_argument('--layout', choices=LAYOUTS, default=SHARDED, help='Target layout (default: sharded)')
+    
+    # Archive command
+    archive_parser = subparsers.add_parser('archive', help='Pack rejected and old reviewed articles into compressed archive segments')
+    archive_parser.add_argument('--days', type=int, default=30, help='Archive articles decided on more than this many days ago (default: 30)')
+    archive_parser.add_argument('--rejected-only', action='store_true', help='Only archive rejected articles')
+    
+    # Show archived article command
+    archived_parser = subparsers.add_parser('archived', help='Show an archived article')
+    archived_parser.add_argument('article_id', help='ID of the archived article')
+    archived_parser.add_argument('--format', choices=['markdown', 'json'], default='markdown', help='Output format')
+    
+    # Search command
+    search_parser = subparsers.add_parser('search', help='Full-text search over the staging area and vault')
+    search_parser.add_argument('query', nargs='?', default='', help='Search query')
+    search_parser.add_argument('--limit', type=int, default=20, help='Maximum number of results (default: 20)')
+    search_parser.add_argument('--status', choices=['new', 'approved', 'rejected', 'archived'], help='Only show articles with this status')
+    search_parser.add_argument('--kind', choices=['staging', 'vault'], help='Only search staging articles or vault notes')
+    search_parser.add_argument('--rebuild', action='store_true', help='Rebuild the index before searching')
+    search_parser.add_argument('--vault-path', help='Obsidian vault to include when rebuilding')
+    search_parser.add_argument('--format', choices=['table', 'json'], default='table', help='Output format')
+    
+    # Trends command
+    trends_parser = subparsers.add_parser('trends', help='Count articles per period from the metadata snapshot')
+    trends_parser.add_argument('--period', choices=['day', 'week', 'month'], default='week', help='Period to count per (default: week)')
+    trends_parser.add_argument('--by', nargs='+', choices=['source', 'category', 'language', 'status'], default=['source'], help='Columns to group by within each period (default: source)')
+    trends_parser.add_argument('--since', help='First day to include (YYYY-MM-DD)')
+    trends_parser.add_argument('--until', help='Last day to include (YYYY-MM-DD)')
+    trends_parser.add_argument('--status', action='append', choices=['new', 'approved', 'rejected', 'archived'], help='Only count articles with this status (repeatable)')
+    trends_parser.add_argument('--rebuild', action='store_true', help='Rebuild the snapshot from the metadata files first')
+    trends_parser.add_argument('--format', choices=['table', 'json'], default='table', help='Output format')
+    
+    # Serve command
+    serve_parser = subparsers.add_parser('serve', help='Run the local review API server')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    serve_parser.add_argument('--port', type=int, default=8765, help='Port to listen on, 0 for any free port (default: 8765)')
+    
     # Parse arguments
     args = parser.parse_args()
     
     # Set up logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'staging_manager.log')),
-            logging.StreamHandler()
-        ]
-    )
+    configure_logging()
     logger = logging.getLogger('staging_cli')
     
     # Execute the appropriate command
     if args.command == 'list':
-        articles = list_new_articles()
+        articles = list_new_articles(
+            limit=args.limit or None,
+            offset=args.offset,
+            source=args.source,
+            language=args.language,
+            category=args.category
+        )
         if args.format == 'json':
             print(json.dumps(articles, indent=2))
         else:
@@ -79,7 +138,7 @@ def main():
                 
                 headers = ['ID', 'Title', 'Source', 'Language', 'Date']
                 print(tabulate(table_data, headers=headers, tablefmt='grid'))
-                print(f"\nTotal: {len(articles)} articles")
+                print(f"\nShowing articles {args.offset + 1}-{args.offset + len(articles)}")
     
     elif args.command == 'approve':
         success = approve_article(args.article_id)
@@ -99,7 +158,7 @@ def main():
     
     elif args.command == 'export':
         stats = export_to_obsidian(args.article_id)
-        print(f"Export completed: {stats['exported']} articles exported, {stats['errors']} errors.")
+        print(f"Export completed: {stats['exported']} articles exported, {stats['unchanged']} unchanged, {stats['errors']} errors.")
         if stats['exported'] > 0:
             print("\nExported articles:")
             for article in stats['articles']:
@@ -114,6 +173,7 @@ def main():
             print(f"New articles: {stats['new']}")
             print(f"Reviewed articles: {stats['reviewed']}")
             print(f"Rejected articles: {stats['rejected']}")
+            print(f"Archived articles: {stats['archived']}")
             print(f"Total articles: {stats['total']}")
             
             print("\nBy Category:")
@@ -128,6 +188,120 @@ def main():
             source_data = [[source, count] for source, count in stats['by_source'].items()]
             print(tabulate(source_data, headers=['Source', 'Count'], tablefmt='simple'))
     
+    elif args.command == 'leases':
+        table_data = []
+        for namespace in ['articles', 'feeds']:
+            leases = LeaseManager(STAGING_DIR, namespace=namespace)
+            if args.expire:
+                removed = leases.expire_stale()
+                print(f"Expired {removed} stale {namespace} leases.")
+            for lease in leases.list_leases():
+                table_data.append([
+                    namespace,
+                    lease.get('key', ''),
+                    lease.get('owner', ''),
+                    datetime.fromtimestamp(lease.get('expires_at', 0)).strftime('%Y-%m-%d %H:%M:%S'),
+                    'yes' if lease['stale'] else 'no'
+                ])
+        
+        if not table_data:
+            print("No active leases.")
+        else:
+            print(tabulate(table_data, headers=['Namespace', 'Key', 'Owner', 'Expires', 'Stale'], tablefmt='grid'))
+    
+    elif args.command == 'migrate-layout':
+        current = get_layout(STAGING_DIR)
+        stats = migrate_layout(STAGING_DIR, args.layout)
+        print(f"Migrated staging area from {current} to {stats['layout']} layout: {stats['moved']} files moved, {stats['errors']} errors.")
+        if stats['errors']:
+            return 1
+    
+    elif args.command == 'archive':
+        stats = archive_articles(STAGING_DIR, days=args.days, include_reviewed=not args.rejected_only)
+        print(f"Archive completed: {stats['archived']} articles archived ({stats['bytes_before']} bytes -> {stats['bytes_after']} bytes), {stats['recovered']} recovered from an interrupted run, {stats['skipped']} skipped, {stats['errors']} errors.")
+        if stats['errors']:
+            return 1
+    
+    elif args.command == 'archived':
+        record = get_archived_article(STAGING_DIR, args.article_id)
+        if not record:
+            print(f"Article {args.article_id} not found in the archive.")
+            return 1
+        
+        if args.format == 'json':
+            print(json.dumps(record, indent=2, ensure_ascii=False))
+        else:
+            print(record['content'])
+    
+    elif args.command == 'search':
+        search_index = get_search_index(STAGING_DIR)
+        if args.rebuild:
+            stats = search_index.rebuild(STAGING_DIR, args.vault_path)
+            print(f"Rebuilt search index: {stats['staging']} staging articles, {stats['archived']} archived articles, {stats['vault']} vault notes, {stats['errors']} errors.")
+        
+        if args.query:
+            start = time.perf_counter()
+            results = search_index.search(args.query, limit=args.limit, kind=args.kind, status=args.status)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            if args.format == 'json':
+                print(json.dumps(results, indent=2, ensure_ascii=False))
+            elif not results:
+                print(f"No results for '{args.query}'.")
+            else:
+                table_data = []
+                for result in results:
+                    table_data.append([
+                        result['doc_id'] if result['kind'] == 'staging' else result['path'],
+                        result['title'],
+                        result['source'] or '',
+                        result['status'] or result['kind'],
+                        f"{-result['score']:.2f}"
+                    ])
+                
+                print(tabulate(table_data, headers=['ID / Path', 'Title', 'Source', 'Status', 'Score'], tablefmt='grid'))
+                print(f"\n{len(results)} results in {elapsed_ms:.1f} ms")
+        elif not args.rebuild:
+            search_parser.print_help()
+            return 1
+    
+    elif args.command == 'trends':
+        snapshot = get_snapshot(STAGING_DIR)
+        if args.rebuild:
+            stats = snapshot.rebuild()
+            print(f"Rebuilt metadata snapshot: {stats['rows']} articles ({stats['archived']} archived), {stats['errors']} errors.")
+        
+        start = time.perf_counter()
+        try:
+            rows = snapshot.trend(args.period, by=tuple(args.by), since=args.since, until=args.until, statuses=args.status)
+        except ValueError as e:
+            print(f"Invalid trend query: {e}")
+            return 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        if args.format == 'json':
+            print(json.dumps(rows, indent=2, ensure_ascii=False))
+        elif not rows:
+            print("No articles in this range.")
+        else:
+            table_data = [[row['period'], *(row[column] for column in args.by), row['count']] for row in rows]
+            print(tabulate(table_data, headers=['Period', *(column.capitalize() for column in args.by), 'Articles'], tablefmt='grid'))
+            print(f"\n{sum(row['count'] for row in rows)} articles in {len(rows)} groups, counted in {elapsed_ms:.1f} ms")
+    
+    elif args.command == 'serve':
+        # Imported here so the other commands do not load the HTTP server
+        from rss_monitor.review_server import create_server
+        
+        server = create_server(args.host, args.port)
+        host, port = server.server_address[:2]
+        print(f"Serving the review API for {len(server.store.articles)} articles on http://{host}:{port}/api/articles (Ctrl+C to stop)", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    
     else:
         parser.print_help()
         return 1
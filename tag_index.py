@@ -0,0 +1,85 @@
+"""
+Tag index for the digital garden.
+Computes tag -> article postings, tag counts and a per-article tag bitmask
+from the vault frontmatter, so the site can filter with bit operations and
+the tag cloud and tag pages are driven by real data.
+"""
+
+import logging
+from pathlib import Path
+
+from scripts.obsidian_integration.vault import write_json_if_changed
+
+logger = logging.getLogger('garden_tags')
+
+INDEX_VERSION = 1
+
+# Bits per mask word; JavaScript bitwise operators work on 32-bit integers
+WORD_BITS = 32
+
+# Tags every article carries, which would make filtering on them meaningless
+IGNORED_TAGS = {'ai-governance'}
+
+def build_tag_index(notes):
+    """
+    Build the tag index for a set of notes.
+
+    Tags are ordered by article count (most used first), so the most
+    common tags share the first mask word. The notes are read once, so they
+    can be streamed.
+
+    Args:
+        notes (iterable): Notes as returned by vault.iter_vault_notes, or their headers
+
+    Returns:
+        dict: The tag index with 'tags', 'articles' and 'postings'
+    """
+    postings = {}
+    entries = []
+    for article_number, note in enumerate(notes):
+        entries.append((note['page'], note['title'], note['tags']))
+        for tag in note['tags']:
+            if tag not in IGNORED_TAGS:
+                postings.setdefault(tag, []).append(article_number)
+
+    ordered = sorted(postings, key=lambda tag: (-len(postings[tag]), tag))
+    bits = {tag: bit for bit, tag in enumerate(ordered)}
+    words = max(1, (len(ordered) + WORD_BITS - 1) // WORD_BITS)
+
+    articles = []
+    for page, title, tags in entries:
+        mask = [0] * words
+        for tag in tags:
+            if tag in bits:
+                bit = bits[tag]
+                mask[bit // WORD_BITS] |= 1 << (bit % WORD_BITS)
+        articles.append({
+            'page': page,
+            'title': title,
+            'mask': mask
+        })
+
+    return {
+        'version': INDEX_VERSION,
+        'word_bits': WORD_BITS,
+        'tags': [{'name': tag, 'bit': bits[tag], 'count': len(postings[tag])} for tag in ordered],
+        'articles': articles,
+        'postings': {tag: postings[tag] for tag in ordered}
+    }
+
+def write_tag_index(tag_index, output_path):
+    """
+    Write the tag index as a static JSON asset.
+
+    Args:
+        tag_index (dict): Index as returned by build_tag_index
+        output_path (str): Path of the JSON file, e.g. <garden>/tags/index.json
+
+    Returns:
+        bool: True if the file changed
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    changed = write_json_if_changed(output_path, tag_index)
+    logger.info(f"Tag index with {len(tag_index['tags'])} tags over {len(tag_index['articles'])} articles {'written' if changed else 'unchanged'}")
+    return changed
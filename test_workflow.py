@@ -9,27 +9,86 @@ import sys
 import json
 import logging
 import argparse
+import time
+import asyncio
+import tempfile
+import threading
+import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
 from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import modules from the project
 from scripts.rss_monitor.core import run_once, setup_directories
+from scripts.rss_monitor.layout import iter_articles
 from scripts.workflow_integration import WorkflowIntegration
 from scripts.content_pipeline import ContentPipeline
+from scripts.rss_monitor.logging_setup import configure_logging
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test_workflow.log')),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger('test_workflow')
 
+# Quick CLI commands that must start fast, run from the scripts directory
+CLI_STARTUP_COMMANDS = [
+    ['rss_cli.py', '--help'],
+    ['staging_cli.py', 'stats', '--format', 'json'],
+    ['obsidian_cli.py', '--help']
+]
+
+# Dependencies only the paths that actually need them may import
+HEAVY_MODULES = {'requests', 'bs4', 'markdown', 'tabulate'}
+
+# Import time allowed on top of the bare interpreter
+CLI_IMPORT_BUDGET_MS = 100
+
+# Requests the throttling test server handles at once, and articles fetched from it
+THROTTLE_CAPACITY = 3
+THROTTLE_ARTICLES = 40
+
+# Workers competing for leases, and keys they compete for
+LEASE_WORKERS = 8
+LEASE_KEYS = 50
+
+# Documents matching the pagination query, and results per page
+SEARCH_DOCUMENTS = 25
+SEARCH_PAGE_SIZE = 10
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Stand-in for a publisher that answers 429 when too many requests are in flight."""
+    
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            throttled = server.active > server.capacity
+        
+        try:
+            if throttled:
+                server.rejected += 1
+                self.send_response(429)
+                self.send_header('Retry-After', '1')
+                self.end_headers()
+                return
+            
+            time.sleep(server.delay)
+            body = f"<html><body><article><p>Article text for {self.path}</p></article></body></html>".encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+    
+    def log_message(self, format, *args):
+        pass
+
 class WorkflowTester:
     """Class to test the end-to-end workflow of the AI Governance content aggregation system."""
     
@@ -197,6 +256,1571 @@ class WorkflowTester:
             logger.error(f"Error testing full pipeline: {e}")
             return False
     
+    def test_incremental_deploy(self):
+        """
+        Test the incremental deploy against a local bare repository.
+        
+        Deploys the generated garden, then checks that a second deploy pushes
+        nothing, and that changed and deleted files are pushed on their own.
+        
+        Returns:
+            bool: True if the incremental deploy behaved as expected, False otherwise
+        """
+        try:
+            logger.info("Testing incremental deploy...")
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                remote = Path(temp_dir) / 'remote.git'
+                clone_dir = Path(temp_dir) / 'clone'
+                subprocess.run(['git', 'init', '--quiet', '--bare', str(remote)], check=True)
+                
+                if not self.pipeline.generate_digital_garden():
+                    logger.error("Digital garden generation failed")
+                    return False
+                
+                first = self.pipeline.publish_changes(remote, clone_dir)
+                second = self.pipeline.publish_changes(remote, clone_dir)
+                
+                # Touch one page and remove another
+                pages = sorted((self.pipeline.digital_garden_path / 'articles').glob('*.html'))
+                with open(pages[0], 'a', encoding='utf-8') as f:
+                    f.write('\n<!-- changed -->\n')
+                removed_page = pages[-1].read_bytes()
+                pages[-1].unlink()
+                third = self.pipeline.publish_changes(remote, clone_dir)
+                pages[-1].write_bytes(removed_page)
+                
+                listed = subprocess.run(['git', '--git-dir', str(remote), 'ls-tree', '-r', '--name-only', 'HEAD'],
+                                        capture_output=True, text=True, check=True).stdout.split('\n')
+                
+                results = [
+                    first['success'] and first['changed'] == first['files'],
+                    second['success'] and second['changed'] == 0 and second['commit'] == first['commit'],
+                    third['success'] and third['changed'] == 1 and third['removed'] == 1,
+                    f"articles/{pages[0].name}" in listed and f"articles/{pages[-1].name}" not in listed
+                ]
+            
+            if all(results):
+                logger.info(f"Incremental deploy completed successfully: {first}, {second}, {third}")
+                return True
+            else:
+                logger.error(f"Incremental deploy failed: {results}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing incremental deploy: {e}")
+            return False
+    
+    def test_adaptive_concurrency(self):
+        """
+        Test the adaptive per-host concurrency of the article fetcher.
+        
+        Fetches a batch of articles from a local server that throttles
+        requests beyond THROTTLE_CAPACITY in flight, and checks that every
+        article arrives and that the fetcher backs off rather than running
+        into the limit over and over. Then checks that later batches, such
+        as the next run's, start from the limit learned for the host and
+        wait out its pause.
+        
+        Returns:
+            bool: True if the fetcher adapted as expected, False otherwise
+        """
+        try:
+            logger.info("Testing adaptive concurrency...")
+            
+            # Imported here so the other tests do not need requests and bs4
+            from scripts.rss_monitor.fetcher import fetch_articles_async, get_host_limiter, MAX_PER_HOST
+            
+            server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+            server.lock = threading.Lock()
+            server.capacity = THROTTLE_CAPACITY
+            server.delay = 0.05
+            server.active = server.peak = server.rejected = 0
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            
+            try:
+                host = f"127.0.0.1:{server.server_address[1]}"
+                urls = [f"http://{host}/article-{i}" for i in range(THROTTLE_ARTICLES)]
+                contents, stats = asyncio.run(fetch_articles_async(urls))
+                
+                # Each batch runs in a new event loop, but the host's limiter carries over
+                limiter = get_host_limiter(host)
+                learned = limiter.limit
+                _, second = asyncio.run(fetch_articles_async(urls[:1]))
+                limiter.paused_until = time.monotonic() + 1
+                started = time.monotonic()
+                _, third = asyncio.run(fetch_articles_async(urls[1:2]))
+                paused = time.monotonic() - started
+            finally:
+                server.shutdown()
+                server.server_close()
+            
+            results = [
+                stats['fetched'] == len(urls) and all(contents.values()),
+                stats['throttled'] > 0,
+                server.rejected <= len(urls) // 5,
+                second['fetched'] == 1 and second['host_limits'][host] == round(min(MAX_PER_HOST, learned + 1 / learned), 2),
+                third['fetched'] == 1 and paused >= 1
+            ]
+            
+            if all(results):
+                logger.info(f"Adaptive concurrency completed successfully: {stats}, peak {server.peak} in flight, {server.rejected} rejected")
+                return True
+            else:
+                logger.error(f"Adaptive concurrency failed: {results}, {stats}, {server.rejected} rejected, "
+                             f"learned limit {learned}, then {second['host_limits']}, paused {paused:.2f}s")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing adaptive concurrency: {e}")
+            return False
+    
+    def test_watch_mode(self):
+        """
+        Test the file watcher and the processing of change sets.
+        
+        Checks that the watcher stays quiet while nothing changes, reports
+        new files (also in new subdirectories) as one change set while
+        leaving out hidden and temporary files, and that a change set of
+        freshly staged articles is exported and published without its own
+        writes to the staging area and the vault making up another one.
+        
+        Returns:
+            bool: True if the watch mode behaved as expected, False otherwise
+        """
+        try:
+            logger.info("Testing watch mode...")
+            
+            from scripts.rss_monitor.watcher import FileWatcher
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                root = Path(temp_dir) / 'watched'
+                watcher = FileWatcher([root], ignore=self.pipeline.watch_ignored)
+                try:
+                    idle = watcher.wait(0.5)
+                    
+                    (root / 'note.md').write_text('note', encoding='utf-8')
+                    (root / 'sub').mkdir()
+                    (root / 'sub' / 'other.md').write_text('other', encoding='utf-8')
+                    (root / '.note.md.1234.tmp').write_text('partial', encoding='utf-8')
+                    changed = watcher.wait(10)
+                finally:
+                    watcher.close()
+            
+            # Stage some articles and hand them to the pipeline as a change set,
+            # watching the pipeline's own writes as the watch mode does
+            setup_directories()
+            run_once()
+            staged = {str(path) for _, path in iter_articles(self.pipeline.staging_dir, 'new')}
+            watcher = FileWatcher(
+                [self.pipeline.staging_dir / 'new', self.pipeline.staging_dir / 'reviewed', self.pipeline.obsidian_vault_path],
+                ignore=self.pipeline.watch_ignored
+            )
+            try:
+                stats = self.pipeline.process_changes(staged)
+                dropped = watcher.discard()
+                after = watcher.wait(0.5)
+                
+                edited_note = self.pipeline.obsidian_vault_path / 'edited.md'
+                edited_note.write_text('edited', encoding='utf-8')
+                edited = watcher.wait(10)
+                edited_note.unlink()
+            finally:
+                watcher.close()
+            
+            results = [
+                idle is None,
+                changed == {str(root / 'note.md'), str(root / 'sub' / 'other.md')},
+                stats['digital_garden'] and not stats['errors'],
+                dropped > 0 and after is None,
+                edited == {str(edited_note)}
+            ]
+            
+            if all(results):
+                logger.info(f"Watch mode completed successfully: {stats}")
+                return True
+            else:
+                logger.error(f"Watch mode failed: {results}, changed {changed}, {after}, {edited}, {stats}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing watch mode: {e}")
+            return False
+    
+    def test_review_server(self):
+        """
+        Test the review API server.
+        
+        Starts `staging_cli.py serve` on a free port and checks that a page
+        of articles revalidates with its ETag, that a batch of decisions is
+        applied, and that the page and search results reflect it afterwards.
+        
+        Returns:
+            bool: True if the review server behaved as expected, False otherwise
+        """
+        try:
+            logger.info("Testing review server...")
+            
+            setup_directories()
+            run_once()
+            
+            server = subprocess.Popen([sys.executable, 'staging_cli.py', 'serve', '--port', '0'],
+                                      cwd=self.project_root / 'scripts', stdout=subprocess.PIPE, text=True)
+            try:
+                line = server.stdout.readline()
+                base_url = next(word for word in line.split() if word.startswith('http://')).split('/api/')[0]
+                
+                _, etag, page = self.review_request(f"{base_url}/api/articles?limit=2")
+                if len(page['articles']) < 2:
+                    logger.error(f"Review server test needs at least 2 new articles, got {page['total']}")
+                    return False
+                revalidated, _, _ = self.review_request(f"{base_url}/api/articles?limit=2", etag=etag)
+                
+                approved, rejected = page['articles'][0], page['articles'][1]
+                _, _, decided = self.review_request(f"{base_url}/api/decisions", body={'decisions': [
+                    {'id': approved['id'], 'decision': 'approve'},
+                    {'id': rejected['id'], 'decision': 'reject'}
+                ]})
+                
+                status, new_etag, new_page = self.review_request(f"{base_url}/api/articles?limit=2", etag=etag)
+                query = approved['title'].split()[0]
+                _, _, found = self.review_request(f"{base_url}/api/search?q={urllib.parse.quote(query)}&status=approved")
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+            
+            results = [
+                revalidated == 304,
+                decided['approved'] == 1 and decided['rejected'] == 1 and not decided['failed'],
+                status == 200 and new_etag != etag and new_page['total'] == page['total'] - 2,
+                approved['id'] in [result['doc_id'] for result in found['results']]
+            ]
+            
+            if all(results):
+                logger.info(f"Review server completed successfully: {page['total']} articles, {decided}")
+                return True
+            else:
+                logger.error(f"Review server failed: {results}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing review server: {e}")
+            return False
+    
+    def review_request(self, url, etag=None, body=None):
+        """
+        Send a request to the review server, a POST if there is a body.
+        
+        Returns:
+            tuple: (status, ETag, decoded JSON response or None for 304)
+        """
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+        if etag:
+            request.add_header('If-None-Match', etag)
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, response.headers.get('ETag'), json.load(response)
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise
+            return e.code, e.headers.get('ETag'), None
+    
+    def test_metadata_snapshot(self):
+        """
+        Test the columnar metadata snapshot.
+        
+        Stages some articles and checks that the snapshot's counts agree
+        with the metadata files, that a review is reflected in place, and
+        that a rebuild from the metadata files gives the same counts.
+        
+        Returns:
+            bool: True if the snapshot agreed with the metadata, False otherwise
+        """
+        try:
+            logger.info("Testing metadata snapshot...")
+            
+            from scripts.rss_monitor.staging import list_new_articles, approve_article
+            from scripts.rss_monitor.snapshot import get_snapshot
+            
+            setup_directories()
+            run_once()
+            staging_dir = self.pipeline.staging_dir
+            snapshot = get_snapshot(staging_dir)
+            
+            articles = list_new_articles(limit=1)
+            if articles:
+                approve_article(articles[0]['id'])
+            
+            expected = {}
+            for _, metadata_path in iter_articles(staging_dir, 'metadata'):
+                with open(metadata_path, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                key = (metadata.get('status') or 'new', metadata.get('source', 'unknown'))
+                expected[key] = expected.get(key, 0) + 1
+            
+            live = ('new', 'approved', 'rejected')
+            counts = snapshot.group_counts(('status', 'source'), statuses=live)
+            trend = snapshot.trend('week', by=('source',), statuses=live)
+            snapshot.rebuild()
+            rebuilt = snapshot.group_counts(('status', 'source'), statuses=live)
+            
+            results = [
+                bool(articles),
+                counts == expected,
+                sum(row['count'] for row in trend) == sum(expected.values()),
+                rebuilt == counts
+            ]
+            
+            if all(results):
+                logger.info(f"Metadata snapshot completed successfully: {sum(expected.values())} articles in {len(trend)} groups")
+                return True
+            else:
+                logger.error(f"Metadata snapshot failed: {results}, {counts} != {expected}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing metadata snapshot: {e}")
+            return False
+    
+    def test_cli_startup(self):
+        """
+        Test that the CLI entry points start quickly.
+        
+        Runs quick CLI commands under `python -X importtime` and checks that
+        none of them loads a heavy dependency, and that their imports beyond
+        the bare interpreter stay within the time budget.
+        
+        Returns:
+            bool: True if all commands stayed within the budget, False otherwise
+        """
+        try:
+            logger.info("Testing CLI startup time...")
+            
+            scripts_dir = self.project_root / 'scripts'
+            baseline = self.measure_imports([sys.executable, '-X', 'importtime', '-c', 'pass'], scripts_dir)
+            
+            success = True
+            for command in CLI_STARTUP_COMMANDS:
+                imports = self.measure_imports([sys.executable, '-X', 'importtime', *command], scripts_dir)
+                heavy = sorted(HEAVY_MODULES & set(imports))
+                import_ms = sum(us for module, us in imports.items() if module not in baseline) / 1000
+                
+                if heavy or import_ms > CLI_IMPORT_BUDGET_MS:
+                    logger.error(f"{' '.join(command)}: {import_ms:.1f} ms of imports (budget {CLI_IMPORT_BUDGET_MS} ms), heavy modules: {heavy}")
+                    success = False
+                else:
+                    logger.info(f"{' '.join(command)}: {import_ms:.1f} ms of imports")
+            
+            return success
+        
+        except Exception as e:
+            logger.error(f"Error testing CLI startup: {e}")
+            return False
+    
+    def measure_imports(self, command, cwd):
+        """
+        Run a command under -X importtime.
+        
+        Returns:
+            dict: Cumulative import time in microseconds of each top-level import
+        """
+        result = subprocess.run(command, cwd=cwd, capture_output=True, text=True, timeout=60)
+        imports = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, module = line.split('|')
+            # Nested imports are indented below their parent and already counted in it
+            if not module.startswith('  '):
+                imports[module.strip()] = int(cumulative)
+        return imports
+    
+    def test_lease_contention(self):
+        """
+        Test article leases under contention.
+        
+        Several workers claim the same keys at once and every key must end
+        up with exactly one owner. A held lease must refuse other workers
+        until it is released or expires.
+        
+        Returns:
+            bool: True if the leases behaved as expected, False otherwise
+        """
+        try:
+            logger.info("Testing lease contention...")
+            
+            from concurrent.futures import ThreadPoolExecutor
+            from scripts.rss_monitor.locking import LeaseManager
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                keys = [f"article-{i}" for i in range(LEASE_KEYS)]
+                workers = [LeaseManager(temp_dir, owner=f"worker-{i}") for i in range(LEASE_WORKERS)]
+                with ThreadPoolExecutor(max_workers=LEASE_WORKERS) as executor:
+                    claims = list(executor.map(lambda worker: worker.claim_many(keys), workers))
+                
+                key = keys[0]
+                holder = next(worker for worker, claimed in zip(workers, claims) if key in claimed)
+                other = next(worker for worker in workers if worker is not holder)
+                refused = not other.claim(key) and not other.renew(key)
+                other.release(key)
+                kept = holder.renew(key)
+                holder.release(key)
+                taken_over = other.claim(key)
+                
+                short = LeaseManager(temp_dir, namespace='feeds', owner='worker-short', ttl=0.2)
+                waiting = LeaseManager(temp_dir, namespace='feeds', owner='worker-waiting')
+                held = short.claim('feed') and not waiting.claim('feed')
+                time.sleep(0.3)
+                expired = waiting.claim('feed') and not short.renew('feed')
+            
+            claimed = [key for worker_claims in claims for key in worker_claims]
+            results = [
+                sorted(claimed) == sorted(keys),
+                refused and kept and taken_over,
+                held and expired
+            ]
+            
+            if all(results):
+                logger.info(f"Lease contention completed successfully: {len(keys)} keys over {len(workers)} workers, "
+                            f"{sorted(len(c) for c in claims)} claimed each")
+                return True
+            else:
+                logger.error(f"Lease contention failed: {results}, {len(claimed)} claims for {len(keys)} keys")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing lease contention: {e}")
+            return False
+    
+    def test_layout_migration(self):
+        """
+        Test migrating a staging area to the sharded layout and back.
+        
+        Returns:
+            bool: True if every file survived both migrations in place, False otherwise
+        """
+        try:
+            logger.info("Testing staging layout migration...")
+            
+            import hashlib
+            from scripts.rss_monitor.layout import (ARTICLE_DIRS, FLAT, SHARDED, get_layout, find_article,
+                                                    shard_dir, migrate_layout)
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                staging_dir = Path(temp_dir)
+                files = {}
+                for i in range(20):
+                    article_id = hashlib.md5(f"article-{i}".encode()).hexdigest()
+                    subdir = ('new', 'reviewed', 'rejected')[i % 3]
+                    for name, ext in ((subdir, '.md'), ('metadata', '.json')):
+                        (staging_dir / name).mkdir(exist_ok=True)
+                        path = staging_dir / name / f"{article_id}{ext}"
+                        path.write_text(f"{name} {article_id}", encoding='utf-8')
+                        files[(name, article_id)] = path.read_text(encoding='utf-8')
+                
+                def contents():
+                    found = {}
+                    for name, ext in ARTICLE_DIRS.items():
+                        for article_id, path in iter_articles(staging_dir, name, ext):
+                            with open(path, 'r', encoding='utf-8') as f:
+                                found[(name, article_id)] = (path, f.read())
+                    return found
+                
+                sharded = migrate_layout(staging_dir, SHARDED)
+                sharded_files = contents()
+                sharded_again = migrate_layout(staging_dir, SHARDED)
+                sharded_layout = get_layout(staging_dir)
+                found_sharded = all(find_article(staging_dir, name, article_id) for name, article_id in files)
+                
+                flat = migrate_layout(staging_dir, FLAT)
+                flat_files = contents()
+                leftover = [path for name in ARTICLE_DIRS for path in (staging_dir / name).iterdir() if path.is_dir()]
+                
+                results = [
+                    sharded['moved'] == len(files) and not sharded['errors'] and sharded_again['moved'] == 0,
+                    sharded_layout == SHARDED and get_layout(staging_dir) == FLAT,
+                    {key: text for key, (_, text) in sharded_files.items()} == files,
+                    all(shard_dir(article_id) in path for (_, article_id), (path, _) in sharded_files.items()),
+                    found_sharded,
+                    flat['moved'] == len(files) and not flat['errors'],
+                    {key: text for key, (_, text) in flat_files.items()} == files,
+                    all(os.path.dirname(path) == str(staging_dir / name) for (name, _), (path, _) in flat_files.items()),
+                    not leftover
+                ]
+            
+            if all(results):
+                logger.info(f"Layout migration completed successfully: {sharded}, {flat}")
+                return True
+            else:
+                logger.error(f"Layout migration failed: {results}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing layout migration: {e}")
+            return False
+    
+    def test_archive(self):
+        """
+        Test the cold archive.
+        
+        Archives old rejected and exported articles, then checks that they
+        can be read back and stay searchable, that recent or unexported ones
+        are left alone, and that neither a repeated run nor one recovering
+        from an interrupted run archives anything twice.
+        
+        Returns:
+            bool: True if the archive behaved as expected, False otherwise
+        """
+        try:
+            logger.info("Testing cold archive...")
+            
+            from scripts.rss_monitor.archive import archive_articles, get_archived_article, get_archive_summary, is_archived
+            from scripts.rss_monitor.search import get_search_index
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                staging_dir = Path(temp_dir)
+                articles = {
+                    'old-rejected': ('rejected', {'status': 'rejected', 'rejected_date': '2000-01-01 00:00:00'}),
+                    'old-exported': ('reviewed', {'status': 'approved', 'approved_date': '2000-01-01 00:00:00',
+                                                  'exported_to_obsidian': True}),
+                    'old-unexported': ('reviewed', {'status': 'approved', 'approved_date': '2000-01-01 00:00:00'}),
+                    'recent-rejected': ('rejected', {'status': 'rejected',
+                                                     'rejected_date': time.strftime('%Y-%m-%d %H:%M:%S')})
+                }
+                search_index = get_search_index(staging_dir)
+                for article_id, (subdir, metadata) in articles.items():
+                    (staging_dir / subdir).mkdir(exist_ok=True)
+                    (staging_dir / 'metadata').mkdir(exist_ok=True)
+                    content = f"---\ntitle: \"Archived {article_id}\"\n---\n\n## Content\n\nText of {article_id}\n"
+                    (staging_dir / subdir / f"{article_id}.md").write_text(content, encoding='utf-8')
+                    metadata = dict(metadata, id=article_id, title=f"Archived {article_id}", source='Test', language='en')
+                    (staging_dir / 'metadata' / f"{article_id}.json").write_text(json.dumps(metadata), encoding='utf-8')
+                    search_index.index_document(article_id, 'staging', metadata['title'], '', content, status=metadata['status'])
+                
+                first = archive_articles(staging_dir, days=30)
+                record = get_archived_article(staging_dir, 'old-rejected')
+                found = [result['doc_id'] for result in search_index.search('archived', status='archived')]
+                second = archive_articles(staging_dir, days=30)
+                
+                # A run that stopped after writing the archive left the live files behind
+                (staging_dir / 'rejected' / 'old-rejected.md').write_text(record['content'], encoding='utf-8')
+                third = archive_articles(staging_dir, days=30)
+                summary = get_archive_summary(staging_dir)
+                
+                results = [
+                    first['archived'] == 2 and first['skipped'] == 2 and not first['errors'],
+                    record and record['status'] == 'rejected' and 'Text of old-rejected' in record['content'],
+                    record and record['metadata'].get('title') == 'Archived old-rejected',
+                    sorted(found) == ['old-exported', 'old-rejected'],
+                    get_archived_article(staging_dir, 'recent-rejected') is None and not is_archived(staging_dir, 'old-unexported'),
+                    (staging_dir / 'reviewed' / 'old-unexported.md').exists() and not (staging_dir / 'reviewed' / 'old-exported.md').exists(),
+                    second['archived'] == 0 and second['recovered'] == 0,
+                    third['archived'] == 0 and third['recovered'] == 1 and not (staging_dir / 'rejected' / 'old-rejected.md').exists(),
+                    summary['total'] == 2 and summary['by_status'] == {'rejected': 1, 'approved': 1}
+                ]
+                search_index.close()
+            
+            if all(results):
+                logger.info(f"Cold archive completed successfully: {first}, {summary['by_status']}")
+                return True
+            else:
+                logger.error(f"Cold archive failed: {results}, {first}, {second}, {third}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing cold archive: {e}")
+            return False
+    
+    def test_search_ranking(self):
+        """
+        Test the ranking and pagination of full-text search.
+        
+        Checks that a title match ranks above a summary match and that above
+        a body match, that a partly typed last word still matches, that the
+        filters apply, and that consecutive pages split the full result list
+        without gaps or repeats.
+        
+        Returns:
+            bool: True if search behaved as expected, False otherwise
+        """
+        try:
+            logger.info("Testing search ranking and pagination...")
+            
+            from scripts.rss_monitor.search import SearchIndex
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                search_index = SearchIndex(Path(temp_dir) / 'search.db')
+                filler = 'policy review of the framework'
+                search_index.index_document('body', 'staging', f"Body {filler}", filler, f"sandbox {filler}", status='new')
+                search_index.index_document('title', 'staging', f"Sandbox {filler}", filler, filler, status='new')
+                search_index.index_document('summary', 'vault', f"Summary {filler}", f"sandbox {filler}", filler)
+                for i in range(SEARCH_DOCUMENTS):
+                    search_index.index_document(f"page-{i}", 'staging', f"Report {i}", '',
+                                                f"quorum {'filler ' * i}", status='approved' if i % 2 else 'new')
+                
+                ranked = [result['doc_id'] for result in search_index.search('sandbox')]
+                prefix = [result['doc_id'] for result in search_index.search('sandb')]
+                staged = [result['doc_id'] for result in search_index.search('sandbox', kind='staging')]
+                approved = search_index.search('quorum', limit=SEARCH_DOCUMENTS, status='approved')
+                
+                everything = [result['doc_id'] for result in search_index.search('quorum', limit=SEARCH_DOCUMENTS)]
+                pages = [[result['doc_id'] for result in search_index.search('quorum', limit=SEARCH_PAGE_SIZE, offset=offset)]
+                         for offset in range(0, SEARCH_DOCUMENTS + SEARCH_PAGE_SIZE, SEARCH_PAGE_SIZE)]
+                search_index.close()
+            
+            results = [
+                ranked == ['title', 'summary', 'body'],
+                sorted(prefix) == sorted(ranked),
+                staged == ['title', 'body'],
+                len(approved) == SEARCH_DOCUMENTS // 2 and all(result['status'] == 'approved' for result in approved),
+                len(everything) == SEARCH_DOCUMENTS and everything[0] == 'page-0',
+                [doc_id for page in pages for doc_id in page] == everything,
+                all(len(page) == SEARCH_PAGE_SIZE for page in pages[:-2]) and pages[-1] == []
+            ]
+            
+            if all(results):
+                logger.info(f"Search ranking completed successfully: {ranked}, {len(pages) - 1} pages")
+                return True
+            else:
+                logger.error(f"Search ranking failed: {results}, ranked {ranked}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing search ranking: {e}")
+            return False
+    
+    def test_new_article_listing(self):
+        """
+        Test paging and filtering the articles awaiting review.
+        
+        Compares pages and filtered listings from iter_new_articles with
+        slices of the full listing, both when they are read from the search
+        index and when the index is marked stale and the metadata is scanned.
+        
+        Returns:
+            bool: True if every listing matched, False otherwise
+        """
+        try:
+            logger.info("Testing new article listing...")
+            
+            from scripts.rss_monitor.staging import iter_new_articles
+            from scripts.rss_monitor.search import get_search_index, mark_index_stale
+            
+            setup_directories()
+            run_once()
+            staging_dir = self.pipeline.staging_dir
+            
+            def ids(**kwargs):
+                return [metadata['id'] for metadata in iter_new_articles(**kwargs)]
+            
+            def listings():
+                articles = list(iter_new_articles())
+                full = [metadata['id'] for metadata in articles]
+                source, language = articles[0].get('source'), articles[0].get('language')
+                same_source = [metadata for metadata in articles if metadata.get('source') == source]
+                same_language = [metadata['id'] for metadata in same_source if metadata.get('language') == language]
+                return full, [
+                    ids(limit=2, offset=1) == full[1:3],
+                    ids(limit=5, offset=len(full) - 2) == full[-2:],
+                    ids(offset=len(full)) == [] and ids(limit=0) == [],
+                    ids(source=source) == [metadata['id'] for metadata in same_source],
+                    ids(limit=3, source=source, language=language) == same_language[:3],
+                    ids(source='no such source') == []
+                ]
+            
+            if len(ids()) < 3:
+                logger.error(f"New article listing test needs at least 3 new articles, got {len(ids())}")
+                return False
+            indexed, indexed_results = listings()
+            dates = [metadata.get('date', '') for metadata in iter_new_articles()]
+            
+            mark_index_stale(staging_dir)
+            scanned, scanned_results = listings()
+            get_search_index(staging_dir).rebuild(staging_dir, self.config['obsidian_vault_path'])
+            
+            results = [
+                dates == sorted(dates, reverse=True),
+                # Articles staged in the same second are ordered differently by the two paths
+                sorted(scanned) == sorted(indexed),
+                *indexed_results,
+                *scanned_results
+            ]
+            
+            if all(results):
+                logger.info(f"New article listing completed successfully: {len(indexed)} articles")
+                return True
+            else:
+                logger.error(f"New article listing failed: {results}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing new article listing: {e}")
+            return False
+    
+    def test_circuit_breaker(self):
+        """
+        Test the per-feed circuit breaker.
+        
+        Walks a feed through closed, open, half-open, open again with a
+        longer backoff, half-open and back to closed, fixing the clock
+        rather than waiting for the backoffs.
+        
+        Returns:
+            bool: True if every transition happened as expected, False otherwise
+        """
+        try:
+            logger.info("Testing feed circuit breaker...")
+            
+            from scripts.rss_monitor.health import (FeedHealth, CLOSED, OPEN, HALF_OPEN, FAILURE_THRESHOLD,
+                                                    backoff_for)
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                health = FeedHealth(temp_dir)
+                feed = {'url': 'http://127.0.0.1/feed.xml', 'source': 'Test'}
+                
+                def state():
+                    return health.list_health()[0]['state']
+                
+                now = time.time()
+                steps = []
+                
+                for _ in range(FAILURE_THRESHOLD - 1):
+                    health.record('feed', feed, False, 0.1, error='timeout', now=now)
+                steps.append((state(), health.allow('feed', now)))
+                
+                record = health.record('feed', feed, False, 0.1, error='timeout', now=now)
+                first_backoff = record['open_until'] - now
+                steps.append((state(), health.allow('feed', now + first_backoff - 1)))
+                
+                # The probe after the backoff fails, so the feed is skipped for longer
+                now += first_backoff
+                steps.append((health.allow('feed', now), state()))
+                record = health.record('feed', feed, False, 0.1, error='timeout', now=now)
+                second_backoff = record['open_until'] - now
+                steps.append((state(), health.allow('feed', now + first_backoff)))
+                
+                # The next probe succeeds and closes the circuit
+                now += second_backoff
+                steps.append((health.allow('feed', now), state()))
+                record = health.record('feed', feed, True, 0.1, now=now)
+                steps.append((state(), health.allow('feed', now)))
+            
+            results = [
+                steps == [
+                    (CLOSED, True),
+                    (OPEN, False),
+                    (True, HALF_OPEN),
+                    (OPEN, False),
+                    (True, HALF_OPEN),
+                    (CLOSED, True)
+                ],
+                first_backoff == backoff_for(FAILURE_THRESHOLD),
+                second_backoff == backoff_for(FAILURE_THRESHOLD + 1) > first_backoff,
+                record['consecutive_failures'] == 0 and record['failures'] == FAILURE_THRESHOLD + 1
+            ]
+            
+            if all(results):
+                logger.info(f"Circuit breaker completed successfully: backoff {first_backoff:.0f} s, then {second_backoff:.0f} s")
+                return True
+            else:
+                logger.error(f"Circuit breaker failed: {results}, {steps}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing circuit breaker: {e}")
+            return False
+    
+    def test_keyword_routing(self):
+        """
+        Test the per-language keyword routing of the relevance filter.
+        
+        Checks that articles match the keywords of their declared language,
+        of the languages written in the scripts of their text and of English,
+        and that Latin text is not checked against the CJK or Cyrillic keywords.
+        
+        Returns:
+            bool: True if every article was routed as expected, False otherwise
+        """
+        try:
+            logger.info("Testing keyword routing...")
+            
+            from scripts.rss_monitor.relevance import KeywordMatcher
+            
+            matcher = KeywordMatcher({
+                'en': ['ai governance'],
+                'es': ['gobernanza de la ia'],
+                'zh': ['人工智能治理'],
+                'ja': ['AI ガバナンス', '人工知能ガバナンス'],
+                'ru': ['регулирование ии']
+            })
+            expected = [
+                ('人工智能治理 新闻', 'en', '人工智能治理'),
+                ('人工知能ガバナンス の議論', 'zh-cn', '人工知能ガバナンス'),
+                ('人工智能治理', 'ja', '人工智能治理'),
+                ('La gobernanza de la IA en Europa', 'en', 'gobernanza de la ia'),
+                ('gobernanza de la IA', None, 'gobernanza de la ia'),
+                ('ＡＩガバナンス の議論', 'en', 'aiガバナンス'),
+                ('Регулирование ИИ в Европе', None, 'регулирование ии'),
+                ('AI governance in the news', 'ru', 'ai governance'),
+                ('Nothing relevant here', 'es', None)
+            ]
+            matched = [matcher.match(text, language) for text, language, _ in expected]
+            
+            results = [
+                matched == [match for _, _, match in expected],
+                sorted(matcher.languages_for('la gobernanza de la ia')) == ['en', 'es']
+            ]
+            
+            if all(results):
+                logger.info(f"Keyword routing completed successfully: {len(expected)} articles")
+                return True
+            else:
+                logger.error(f"Keyword routing failed: {results}, {matched}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing keyword routing: {e}")
+            return False
+    
+    def test_export_date(self):
+        """
+        Test that exported articles keep the date they were first exported.
+        
+        Exports an approved article, runs two workflow cycles a second
+        apart and edits the article in between, then checks that the
+        export date in the note (the garden's "added" date) and in the
+        metadata never changes, and that unchanged articles are not
+        exported again.
+        
+        Returns:
+            bool: True if the export date stayed the same, False otherwise
+        """
+        try:
+            logger.info("Testing export date...")
+            
+            from scripts.rss_monitor.staging import list_new_articles, approve_article, export_to_obsidian
+            from scripts.rss_monitor.layout import find_article
+            from scripts.obsidian_integration.vault import read_note
+            
+            setup_directories()
+            run_once()
+            staging_dir = self.pipeline.staging_dir
+            articles = list_new_articles(limit=1)
+            if not articles or not approve_article(articles[0]['id']):
+                logger.error("Export date test needs a new article to approve")
+                return False
+            article_id = articles[0]['id']
+            
+            def exported():
+                with open(find_article(staging_dir, 'metadata', article_id), 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                note_path = Path(metadata['obsidian_path'])
+                note = read_note(note_path, note_path.parent.parent)
+                return metadata['export_date'], note['added_date'], note_path.stat().st_mtime_ns
+            
+            first = export_to_obsidian(article_id)
+            before = exported()
+            
+            time.sleep(1.1)
+            self.pipeline.workflow.process_new_articles()
+            unchanged = export_to_obsidian(article_id)
+            after_cycles = exported()
+            
+            # An edited article is exported again, under its first export date
+            reviewed_path = find_article(staging_dir, 'reviewed', article_id)
+            os.utime(reviewed_path, (time.time() + 1, time.time() + 1))
+            edited = export_to_obsidian(article_id)
+            after_edit = exported()
+            
+            results = [
+                first['exported'] == 1,
+                unchanged['exported'] == 0 and unchanged['unchanged'] == 1,
+                after_cycles == before,
+                edited['exported'] == 1 and after_edit[:2] == before[:2] and after_edit[2] != before[2],
+                before[1] == before[0].split(' ')[0]
+            ]
+            
+            if all(results):
+                logger.info(f"Export date completed successfully: exported on {before[0]}")
+                return True
+            else:
+                logger.error(f"Export date failed: {results}, {before}, {after_cycles}, {after_edit}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing export date: {e}")
+            return False
+    
+    def test_daily_note(self):
+        """
+        Test that the daily note is extended rather than rebuilt.
+        
+        Approves an article and builds the daily note, adds a line to the
+        note by hand, then approves another article and builds it twice
+        more. The new approval must be appended once, the earlier entries
+        and the hand-written line must be kept, and a build without new
+        approvals must leave the note as it is.
+        
+        Returns:
+            bool: True if the daily note was extended as expected, False otherwise
+        """
+        try:
+            logger.info("Testing daily note...")
+            
+            from scripts.rss_monitor.staging import list_new_articles, approve_article
+            
+            setup_directories()
+            run_once()
+            workflow = self.pipeline.workflow
+            articles = list_new_articles(limit=2)
+            if len(articles) < 2:
+                logger.error(f"Daily note test needs at least 2 new articles, got {len(articles)}")
+                return False
+            first, second = articles
+            
+            approve_article(first['id'])
+            note_path = Path(workflow.create_daily_note())
+            hand_written = f"- Checked on {time.strftime('%H:%M:%S')}"
+            note_path.write_text(note_path.read_text(encoding='utf-8') + hand_written + '\n', encoding='utf-8')
+            before = note_path.read_text(encoding='utf-8')
+            
+            approve_article(second['id'])
+            workflow.create_daily_note()
+            extended = note_path.read_text(encoding='utf-8')
+            workflow.create_daily_note()
+            rebuilt = note_path.read_text(encoding='utf-8')
+            
+            results = [
+                extended.count(f"[[{first['title']}]]") == 1,
+                extended.count(f"[[{second['title']}]]") == 1,
+                hand_written in extended,
+                all(line in extended.splitlines() for line in before.splitlines()),
+                extended.count('\n- [[') == before.count('\n- [[') + 1,
+                rebuilt == extended
+            ]
+            
+            if all(results):
+                logger.info(f"Daily note completed successfully: {note_path}")
+                return True
+            else:
+                logger.error(f"Daily note failed: {results}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing daily note: {e}")
+            return False
+    
+    def test_registry_reload(self):
+        """
+        Test reloading the feed registry file while the monitor runs.
+        
+        Edits a registry file in a temporary directory and checks that added,
+        removed and changed feeds are picked up, that the state of unchanged
+        feeds is kept, that only the keyword languages that changed are
+        recompiled, and that a malformed file leaves the current feeds in
+        place and is logged once per version of the file.
+        
+        Returns:
+            bool: True if the registry was reloaded as expected, False otherwise
+        """
+        try:
+            logger.info("Testing registry reload...")
+            
+            from scripts.rss_monitor.registry import FeedRegistry, registry_path, write_registry_file
+            
+            class ErrorCounter(logging.Handler):
+                def __init__(self):
+                    super().__init__(logging.ERROR)
+                    self.count = 0
+                
+                def emit(self, record):
+                    self.count += 1
+            
+            def feed(url, category='News', language='en'):
+                return {'url': url, 'category': category, 'language': language, 'source': url}
+            
+            def write(text):
+                # A new modification time, so the edit is noticed even within the same tick
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                write.mtime += 1
+                os.utime(path, (write.mtime, write.mtime))
+            write.mtime = time.time()
+            
+            errors = ErrorCounter()
+            registry_logger = logging.getLogger('rss_registry')
+            registry_logger.addHandler(errors)
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                path = os.path.join(temp_dir, 'feeds.json')
+                keywords = {'en': ['ai governance'], 'es': ['gobernanza de la ia']}
+                write_registry_file(path, [feed('https://a.test/rss'), feed('https://b.test/rss'), feed('https://d.test/rss')], keywords)
+                
+                registry = FeedRegistry([], {}, path)
+                registry.feed_state['https://a.test/rss']['last_seen'] = 'kept'
+                registry.feed_state['https://b.test/rss']['last_seen'] = 'reset'
+                english = registry.matcher.patterns['en']
+                
+                write(json.dumps({
+                    'feeds': [feed('https://a.test/rss'), feed('https://b.test/rss', category='Policy'), feed('https://c.test/rss', language='es')],
+                    'keywords': {'en': ['ai governance'], 'es': ['gobernanza de la ia', 'regulación de la ia']}
+                }))
+                changes = registry.reload()
+                unchanged = registry.reload()
+                
+                feeds = dict(registry.feeds)
+                changed_state = dict(registry.feed_state['https://b.test/rss'])
+                write('{"feeds": [')
+                broken = [registry.reload(), registry.reload()]
+                errors_first = errors.count
+                write('{"feeds": [}')
+                broken.append(registry.reload())
+                
+                write(json.dumps({'feeds': [feed('https://a.test/rss')], 'keywords': keywords}))
+                fixed = registry.reload()
+                
+                results = [
+                    registry_path(os.path.join(temp_dir, 'pipeline.json')) == path,
+                    changes == {
+                        'added': ['https://c.test/rss'],
+                        'removed': ['https://d.test/rss'],
+                        'changed': ['https://b.test/rss'],
+                        'languages': ['es']
+                    },
+                    unchanged is None,
+                    feeds['https://b.test/rss']['category'] == 'Policy',
+                    'last_seen' not in changed_state,
+                    broken == [None, None, None],
+                    errors_first == 1 and errors.count == 2,
+                    fixed is not None and fixed['removed'] == ['https://b.test/rss', 'https://c.test/rss'],
+                    registry.feed_state['https://a.test/rss'].get('last_seen') == 'kept',
+                    registry.matcher.patterns['en'] is english
+                ]
+            
+            registry_logger.removeHandler(errors)
+            
+            if all(results):
+                logger.info("Registry reload completed successfully")
+                return True
+            else:
+                logger.error(f"Registry reload failed: {results}, {changes}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing registry reload: {e}")
+            return False
+    
+    def test_vault_import(self):
+        """
+        Test that importing into the vault skips articles that did not change.
+        
+        Imports two reviewed articles into a vault in a temporary directory,
+        imports them again, then edits one and imports a third time, checking
+        that only new or edited articles are copied and reindexed.
+        
+        Returns:
+            bool: True if unchanged articles were skipped, False otherwise
+        """
+        try:
+            logger.info("Testing vault import...")
+            
+            from scripts.rss_monitor.search import SearchIndex
+            from scripts.obsidian_integration.obsidian import ObsidianIntegration
+            
+            class CountingIndex(SearchIndex):
+                indexed = 0
+                
+                def index_file(self, path, *args, **kwargs):
+                    CountingIndex.indexed += 1
+                    return super().index_file(path, *args, **kwargs)
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                reviewed_dir = Path(temp_dir) / 'reviewed'
+                reviewed_dir.mkdir()
+                for number in (1, 2):
+                    (reviewed_dir / f"article{number}.md").write_text(
+                        f"---\ntitle: Article {number}\ndate: 2026-01-0{number}\ncategory: journalism\n---\n\n## Summary\n\nAI governance {number}\n",
+                        encoding='utf-8'
+                    )
+                
+                search_index = CountingIndex(os.path.join(temp_dir, 'search.db'))
+                obsidian = ObsidianIntegration(Path(temp_dir) / 'vault', search_index=search_index)
+                
+                first = obsidian.batch_import(reviewed_dir)
+                indexed_first = CountingIndex.indexed
+                second = obsidian.batch_import(reviewed_dir)
+                indexed_second = CountingIndex.indexed
+                
+                edited = reviewed_dir / 'article2.md'
+                edited.write_text(edited.read_text(encoding='utf-8') + "\nEdited after the import.\n", encoding='utf-8')
+                third = obsidian.batch_import(reviewed_dir)
+                imported = Path(temp_dir) / 'vault' / 'AI Governance' / 'Journalism' / '2026-01-02 - Article-2.md'
+                
+                results = [
+                    (first['imported'], first['unchanged']) == (2, 0),
+                    (second['imported'], second['unchanged']) == (0, 2),
+                    (third['imported'], third['unchanged']) == (1, 1),
+                    third['articles'][0]['id'] == 'article2',
+                    'Edited after the import.' in imported.read_text(encoding='utf-8'),
+                    (indexed_first, indexed_second, CountingIndex.indexed) == (2, 2, 3),
+                    [result['title'] for result in search_index.search('edited')] == ['Article 2']
+                ]
+                search_index.close()
+            
+            if all(results):
+                logger.info("Vault import completed successfully")
+                return True
+            else:
+                logger.error(f"Vault import failed: {results}, {first}, {second}, {third}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing vault import: {e}")
+            return False
+    
+    def write_vault_note(self, vault_path, title, date, tags=(), summary='', content='', language='en'):
+        """
+        Write an article note to a test vault, as the Obsidian import lays it out.
+        
+        Returns:
+            Path: Path to the note
+        """
+        from scripts.obsidian_integration.vault import slugify
+        
+        path = Path(vault_path) / 'AI Governance' / 'Journalism' / f"{date} - {slugify(title)}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            f'---\ntitle: "{title}"\nsource: "Test Source"\ndate: "{date}"\nlanguage: "{language}"\n'
+            f'category: "journalism"\ntags: [{", ".join(["ai-governance", *tags])}]\n---\n\n'
+            f'# {title}\n\n## Summary\n\n{summary}\n\n## Content\n\n{content}\n',
+            encoding='utf-8'
+        )
+        return path
+    
+    def test_garden_search(self):
+        """
+        Test the prebuilt search index of the digital garden.
+        
+        Builds the index for a small vault in a temporary directory and
+        checks the documents, the term shards (including CJK bigrams) and
+        their weights, that a rebuild of the same vault writes nothing, and
+        that editing a note rewrites only the shards it touches.
+        
+        Returns:
+            bool: True if the search index was built as expected, False otherwise
+        """
+        try:
+            logger.info("Testing garden search index...")
+            
+            from scripts.obsidian_integration.vault import iter_vault_notes
+            from scripts.obsidian_integration.garden_search import write_search_index
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                vault_path = Path(temp_dir) / 'vault'
+                output_dir = Path(temp_dir) / 'search'
+                self.write_vault_note(vault_path, 'AI Governance in Europe', '2026-01-02', summary='The EU adopts rules.', content='Governance of models.')
+                self.write_vault_note(vault_path, '人工智能治理', '2026-01-01', summary='人工智能', content='治理框架', language='zh-cn')
+                edited = self.write_vault_note(vault_path, 'Safety Institutes', '2026-01-03', summary='Evaluation of models.')
+                
+                first = write_search_index(iter_vault_notes(vault_path), output_dir)
+                docs = json.loads((output_dir / 'docs.json').read_text(encoding='utf-8'))
+                manifest = json.loads((output_dir / 'manifest.json').read_text(encoding='utf-8'))
+                shards = {key: json.loads((output_dir / 'shards' / filename).read_text(encoding='utf-8'))
+                          for key, filename in manifest['shards'].items()}
+                europe = [doc[0] for doc in docs].index('AI Governance in Europe')
+                chinese = [doc[0] for doc in docs].index('人工智能治理')
+                
+                second = write_search_index(iter_vault_notes(vault_path), output_dir)
+                
+                edited.write_text(edited.read_text(encoding='utf-8').replace('Evaluation of models.', 'Evaluation of frontier systems.'), encoding='utf-8')
+                third = write_search_index(iter_vault_notes(vault_path), output_dir)
+                
+                results = [
+                    len(docs) == 3 and docs[europe][1] == 'articles/2026-01-02-ai-governance-in-europe.html',
+                    # 'governance' is in the title (5), the content (1) and the ai-governance tag is not indexed
+                    [europe, 6] in shards['go']['governance'],
+                    [chinese, 5 + 2] in shards['人']['人工'] and '治理' in shards['治'],
+                    first['written'] == first['shards'],
+                    second['written'] == 0 and second['removed'] == 0,
+                    0 < third['written'] < third['shards'] and third['removed'] == 0,
+                    'frontier' in json.loads((output_dir / 'shards' / 'fr.json').read_text(encoding='utf-8'))
+                ]
+            
+            if all(results):
+                logger.info(f"Garden search index completed successfully: {first}, {second}, {third}")
+                return True
+            else:
+                logger.error(f"Garden search index failed: {results}, {first}, {second}, {third}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing garden search index: {e}")
+            return False
+    
+    def test_tag_index(self):
+        """
+        Test the tag index and the bitmasks the site filters with.
+        
+        Builds the index for a small vault in a temporary directory, with
+        more tags than fit in one mask word, and checks the counts, the
+        postings and that filtering on the masks the way js/main.js does
+        selects exactly the tagged articles. Writing the same index again
+        must leave the file alone.
+        
+        Returns:
+            bool: True if the tag index was built as expected, False otherwise
+        """
+        try:
+            logger.info("Testing tag index...")
+            
+            import re
+            from scripts.obsidian_integration.vault import iter_vault_notes
+            from scripts.obsidian_integration.tag_index import build_tag_index, write_tag_index
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                vault_path = Path(temp_dir) / 'vault'
+                output_path = Path(temp_dir) / 'tags' / 'index.json'
+                many = [f"topic-{number:02d}" for number in range(40)]
+                self.write_vault_note(vault_path, 'First', '2026-01-01', tags=['policy', 'eu', *many])
+                self.write_vault_note(vault_path, 'Second', '2026-01-02', tags=['policy', 'safety'])
+                self.write_vault_note(vault_path, 'Third', '2026-01-03', tags=['safety'])
+                
+                notes = list(iter_vault_notes(vault_path))
+                tag_index = build_tag_index(notes)
+                first = write_tag_index(tag_index, output_path)
+                second = write_tag_index(build_tag_index(iter_vault_notes(vault_path)), output_path)
+                written = json.loads(output_path.read_text(encoding='utf-8'))
+            
+            # Filter as setupTagFiltering does: an article is shown if its mask shares a bit with the query
+            word_bits = int(re.search(r'const WORD_BITS = (\d+);', (self.project_root / 'digital-garden' / 'js' / 'main.js').read_text(encoding='utf-8')).group(1))
+            bits = {tag['name']: tag['bit'] for tag in written['tags']}
+            
+            def shown(active):
+                query = [0] * len(written['articles'][0]['mask'])
+                for tag in active:
+                    query[bits[tag] // word_bits] |= 1 << (bits[tag] % word_bits)
+                return [article['title'] for article in written['articles']
+                        if any(mask & word for mask, word in zip(article['mask'], query))]
+            
+            titles = [note['title'] for note in notes]
+            counts = {tag['name']: tag['count'] for tag in written['tags']}
+            
+            results = [
+                word_bits == written['word_bits'],
+                [tag['name'] for tag in written['tags'][:2]] == ['policy', 'safety'],
+                counts['policy'] == 2 and counts['topic-39'] == 1 and 'ai-governance' not in counts,
+                len(written['articles'][0]['mask']) == 2 and bits['topic-39'] >= word_bits,
+                [titles[number] for number in written['postings']['safety']] == ['Second', 'Third'],
+                shown(['safety']) == ['Second', 'Third'],
+                shown(['topic-39']) == ['First'],
+                shown(['eu', 'safety']) == ['First', 'Second', 'Third'],
+                first and not second
+            ]
+            
+            if all(results):
+                logger.info(f"Tag index completed successfully: {len(written['tags'])} tags")
+                return True
+            else:
+                logger.error(f"Tag index failed: {results}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing tag index: {e}")
+            return False
+    
+    def test_related_articles(self):
+        """
+        Test the related articles of the digital garden.
+        
+        Computes the related articles of a small vault in a temporary
+        directory with pairs of notes on the same topic, and checks that
+        each note's closest neighbour is its pair, that a rerun on the same
+        vault recomputes nothing, and that editing a note recomputes only
+        the articles it affects.
+        
+        Returns:
+            bool: True if the related articles were computed as expected, False otherwise
+        """
+        try:
+            logger.info("Testing related articles...")
+            
+            from scripts.obsidian_integration.vault import iter_vault_notes
+            from scripts.obsidian_integration.related import compute_related
+            
+            topics = [
+                ('Chip Export Controls', 'Export controls on advanced chips', 'New export controls restrict chips and lithography tools.'),
+                ('Chip Export Rules Tightened', 'Chips face tighter export controls', 'Lithography tools and chips are covered by export controls.'),
+                ('Copyright Lawsuits', 'Authors sue over training data', 'The copyright lawsuits concern training data and licensing.'),
+                ('Training Data Copyright', 'Copyright claims on training data', 'Licensing of training data is at the heart of copyright lawsuits.'),
+                ('Election Deepfakes', 'Deepfakes target elections', 'Disinformation with deepfakes ahead of elections.'),
+                ('Deepfake Disinformation', 'Elections and deepfake disinformation', 'Voters see deepfakes and disinformation before elections.')
+            ]
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                vault_path = Path(temp_dir) / 'vault'
+                cache_path = Path(temp_dir) / 'cache' / 'related.json'
+                paths = [self.write_vault_note(vault_path, title, f"2026-01-0{number + 1}", summary=summary, content=content)
+                         for number, (title, summary, content) in enumerate(topics)]
+                pages = {note['title']: note['page'] for note in iter_vault_notes(vault_path)}
+                
+                related, first = compute_related(iter_vault_notes(vault_path), cache_path)
+                _, second = compute_related(iter_vault_notes(vault_path), cache_path)
+                
+                paths[5].write_text(paths[5].read_text(encoding='utf-8').replace('before elections.', 'before elections, says a report.'), encoding='utf-8')
+                edited_related, third = compute_related(iter_vault_notes(vault_path), cache_path)
+                
+                results = [
+                    all(related[pages[topics[number][0]]][0] == pages[topics[number ^ 1][0]] for number in range(len(topics))),
+                    first['full_rebuild'] and first['recomputed'] == len(topics),
+                    (second['changed'], second['recomputed']) == (0, 0),
+                    third['changed'] == 1 and 0 < third['recomputed'] < len(topics) and not third['full_rebuild'],
+                    edited_related[pages['Election Deepfakes']][0] == pages['Deepfake Disinformation']
+                ]
+            
+            if all(results):
+                logger.info(f"Related articles completed successfully: {first}, {second}, {third}")
+                return True
+            else:
+                logger.error(f"Related articles failed: {results}, {related}, {first}, {second}, {third}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing related articles: {e}")
+            return False
+    
+    def test_garden_assets(self):
+        """
+        Test the fingerprinting and precompression of the garden assets.
+        
+        Runs the asset stage over a small site in a temporary directory and
+        checks that CSS and JavaScript get fingerprinted names the pages
+        point at, with byte-identical .gz siblings, that a rerun rewrites and
+        compresses nothing, and that changing the stylesheet replaces its
+        fingerprint and recompresses only what changed.
+        
+        Returns:
+            bool: True if the assets were processed as expected, False otherwise
+        """
+        try:
+            logger.info("Testing garden assets...")
+            
+            import gzip
+            from scripts.obsidian_integration.assets import process_assets
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                site = Path(temp_dir) / 'garden'
+                cache_dir = Path(temp_dir) / 'cache'
+                for rel_path, text in [
+                    ('css/style.css', 'body { margin: 0; }\n' * 20),
+                    ('js/main.js', 'console.log("garden");\n' * 20),
+                    ('index.html', '<link rel="stylesheet" href="css/style.css"><script src="js/main.js"></script>\n' + '<p>Index</p>\n' * 30),
+                    ('articles/page.html', '<link rel="stylesheet" href="../css/style.css">\n' + '<p>Article</p>\n' * 30)
+                ]:
+                    (site / rel_path).parent.mkdir(parents=True, exist_ok=True)
+                    (site / rel_path).write_text(text, encoding='utf-8')
+                
+                first = process_assets(site, cache_dir)
+                styles = sorted(path.name for path in (site / 'css').glob('style.*.css'))
+                index = (site / 'index.html').read_text(encoding='utf-8')
+                article = (site / 'articles' / 'page.html').read_text(encoding='utf-8')
+                compressed = gzip.decompress((site / 'index.html.gz').read_bytes()).decode('utf-8') == index
+                
+                second = process_assets(site, cache_dir)
+                
+                (site / 'css' / 'style.css').write_text('body { margin: 1em; }\n' * 20, encoding='utf-8')
+                third = process_assets(site, cache_dir)
+                new_styles = sorted(path.name for path in (site / 'css').glob('style.*.css'))
+                
+                results = [
+                    first['fingerprinted'] == 2 and first['pages_rewritten'] == 2 and len(styles) == 1,
+                    f'href="css/{styles[0]}"' in index and 'src="js/main.' in index and 'js/main.js' not in index,
+                    f'href="../css/{styles[0]}"' in article,
+                    compressed,
+                    second['pages_rewritten'] == 0 and second['compressed'] == 0 and second['unchanged'] == first['compressed'],
+                    len(new_styles) == 1 and new_styles != styles and third['pages_rewritten'] == 2,
+                    f'href="css/{new_styles[0]}"' in (site / 'index.html').read_text(encoding='utf-8'),
+                    # The stylesheet, its new fingerprinted copy and the two pages pointing at it
+                    third['compressed'] == 4 and third['removed'] == 1
+                ]
+            
+            if all(results):
+                logger.info(f"Garden assets completed successfully: {first}, {second}, {third}")
+                return True
+            else:
+                logger.error(f"Garden assets failed: {results}, {first}, {second}, {third}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing garden assets: {e}")
+            return False
+    
+    def test_note_rendering(self):
+        """
+        Test the markdown rendering of vault notes through the fragment cache.
+        
+        Renders the notes of a small vault in a temporary directory and
+        checks the HTML for markdown, ==highlights== and wikilinks resolved
+        to pages, that a new build takes every fragment from the cache
+        without loading markdown, and that editing a note renders only that
+        note and prunes its old fragment.
+        
+        Returns:
+            bool: True if the notes were rendered as expected, False otherwise
+        """
+        try:
+            logger.info("Testing note rendering...")
+            
+            from scripts.obsidian_integration.vault import iter_vault_notes
+            from scripts.obsidian_integration.render import FragmentRenderer, resolve_links
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                vault_path = Path(temp_dir) / 'vault'
+                cache_dir = Path(temp_dir) / 'fragments'
+                self.write_vault_note(vault_path, 'Model Evaluations', '2026-01-01', summary='Evaluations of **frontier** models.',
+                                      content='- first\n- second\n\nSee [[Safety Institutes|the institutes]], [[Nowhere]] and `[[code]]`.')
+                edited = self.write_vault_note(vault_path, 'Safety Institutes', '2026-01-02', summary='An ==important== update.',
+                                               content='## Background\n\nBack to [[model evaluations]].')
+                
+                def build():
+                    renderer = FragmentRenderer(cache_dir)
+                    notes = list(iter_vault_notes(vault_path))
+                    pages = {note['title'].casefold(): note['page'] for note in notes}
+                    html = {note['title']: resolve_links(renderer.render(note['summary'] + '\n\n' + note['content']), pages) for note in notes}
+                    return html, renderer.prune(), renderer._markdown is None
+                
+                html, first, _ = build()
+                second_html, second, not_loaded = build()
+                
+                edited.write_text(edited.read_text(encoding='utf-8').replace('An ==important== update.', 'A ==major== update.'), encoding='utf-8')
+                third_html, third, _ = build()
+                
+                evaluations = html['Model Evaluations']
+                results = [
+                    '<strong>frontier</strong>' in evaluations and '<li>first</li>' in evaluations,
+                    '<a class="internal-link" href="2026-01-02-safety-institutes.html" data-wikilink="Safety Institutes">the institutes</a>' in evaluations,
+                    '<a class="internal-link" data-wikilink="Nowhere">Nowhere</a>' in evaluations,
+                    '<code>[[code]]</code>' in evaluations,
+                    '<mark>important</mark>' in html['Safety Institutes'] and '<h2>Background</h2>' in html['Safety Institutes'],
+                    'href="2026-01-01-model-evaluations.html"' in html['Safety Institutes'],
+                    first['rendered'] == 2,
+                    second_html == html and (second['rendered'], second['cached']) == (0, 2) and not_loaded,
+                    '<mark>major</mark>' in third_html['Safety Institutes'],
+                    (third['rendered'], third['cached'], third['pruned']) == (1, 1, 1)
+                ]
+            
+            if all(results):
+                logger.info(f"Note rendering completed successfully: {first}, {second}, {third}")
+                return True
+            else:
+                logger.error(f"Note rendering failed: {results}, {html}, {first}, {second}, {third}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing note rendering: {e}")
+            return False
+    
+    def test_link_graph(self):
+        """
+        Test the wikilink graph of the digital garden.
+        
+        Builds the graph of a small vault in a temporary directory and checks
+        links resolved by title and by file name, backlinks, unresolved
+        links and links in code, that a rebuild parses no note, and that
+        editing a note parses only that note and updates the backlinks.
+        
+        Returns:
+            bool: True if the link graph was built as expected, False otherwise
+        """
+        try:
+            logger.info("Testing link graph...")
+            
+            from scripts.obsidian_integration.vault import iter_vault_notes
+            from scripts.obsidian_integration.links import build_link_graph
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                vault_path = Path(temp_dir) / 'vault'
+                cache_path = Path(temp_dir) / 'cache' / 'links.json'
+                self.write_vault_note(vault_path, 'Hub', '2026-01-01',
+                                      content='Links to [[Spoke One]], [[2026-01-03 - spoke-two|the second]], [[Missing]] and `[[Spoke One]]` in code.')
+                edited = self.write_vault_note(vault_path, 'Spoke One', '2026-01-02', content='Back to [[hub#Overview]].')
+                self.write_vault_note(vault_path, 'Spoke Two', '2026-01-03', content='No links.')
+                
+                graph, first = build_link_graph(iter_vault_notes(vault_path), cache_path)
+                _, second = build_link_graph(iter_vault_notes(vault_path), cache_path)
+                
+                edited.write_text(edited.read_text(encoding='utf-8').replace('Back to [[hub#Overview]].', 'See [[Spoke Two]].'), encoding='utf-8')
+                edited_graph, third = build_link_graph(iter_vault_notes(vault_path), cache_path)
+                
+                hub, one, two = '2026-01-01-hub.html', '2026-01-02-spoke-one.html', '2026-01-03-spoke-two.html'
+                results = [
+                    graph['outgoing'][hub] == [one, two],
+                    graph['outgoing'][one] == [hub] and graph['outgoing'][two] == [],
+                    graph['backlinks'] == {one: [hub], two: [hub], hub: [one]},
+                    graph['unresolved'] == {hub: ['Missing']},
+                    (first['parsed'], first['links']) == (3, 3),
+                    (second['parsed'], second['cached']) == (0, 3),
+                    (third['parsed'], third['cached']) == (1, 2),
+                    edited_graph['backlinks'] == {one: [hub], two: [hub, one]}
+                ]
+            
+            if all(results):
+                logger.info(f"Link graph completed successfully: {first}, {second}, {third}")
+                return True
+            else:
+                logger.error(f"Link graph failed: {results}, {graph}, {edited_graph}, {first}, {second}, {third}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing link graph: {e}")
+            return False
+    
+    def test_profiling(self):
+        """
+        Test that a profiled run writes readable profiles.
+        
+        Runs `content_pipeline.py generate --profile` into a temporary
+        directory and checks that the stage's .pstats file loads with pstats
+        and covers the garden generation, and that the collapsed stacks and
+        the summary are written next to it.
+        
+        Returns:
+            bool: True if the profile files were written as expected, False otherwise
+        """
+        try:
+            logger.info("Testing profiling...")
+            
+            import pstats
+            
+            with tempfile.TemporaryDirectory() as temp_dir:
+                result = subprocess.run(
+                    [sys.executable, 'content_pipeline.py', 'generate', '--config', str(self.config_path), '--profile', temp_dir],
+                    cwd=self.project_root / 'scripts', capture_output=True, text=True, timeout=300
+                )
+                profile_dir = Path(temp_dir)
+                stats = pstats.Stats(str(profile_dir / 'digital_garden.pstats'))
+                functions = {name for _, _, name in stats.stats}
+                summary = (profile_dir / 'summary.txt').read_text(encoding='utf-8')
+                
+                results = [
+                    result.returncode == 0,
+                    f"Profile summary written to {profile_dir / 'summary.txt'}" in result.stdout,
+                    stats.total_calls > 0 and 'generate_digital_garden' in functions,
+                    (profile_dir / 'digital_garden.collapsed').exists(),
+                    '=== digital_garden' in summary and 'cumulative' in summary
+                ]
+            
+            if all(results):
+                logger.info(f"Profiling completed successfully: {stats.total_calls} calls profiled")
+                return True
+            else:
+                logger.error(f"Profiling failed: {results}, {result.stderr[-2000:]}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error testing profiling: {e}")
+            return False
+    
     def run_all_tests(self):
         """
         Run all tests.
@@ -210,6 +1834,30 @@ class WorkflowTester:
             'workflow_integration': False,
             'digital_garden_generation': False,
             'full_pipeline': False,
+            'new_article_listing': False,
+            'metadata_snapshot': False,
+            'review_server': False,
+            'incremental_deploy': False,
+            'adaptive_concurrency': False,
+            'watch_mode': False,
+            'cli_startup': False,
+            'lease_contention': False,
+            'layout_migration': False,
+            'archive': False,
+            'search_ranking': False,
+            'circuit_breaker': False,
+            'keyword_routing': False,
+            'export_date': False,
+            'daily_note': False,
+            'registry_reload': False,
+            'vault_import': False,
+            'garden_search': False,
+            'tag_index': False,
+            'related_articles': False,
+            'garden_assets': False,
+            'note_rendering': False,
+            'link_graph': False,
+            'profiling': False,
             'overall': False
         }
         
@@ -220,6 +1868,13 @@ class WorkflowTester:
             # Test RSS monitoring
             results['rss_monitoring'] = self.test_rss_monitoring()
             
+            # Test the review paths while the staged articles still await review
+            results['new_article_listing'] = self.test_new_article_listing()
+            results['metadata_snapshot'] = self.test_metadata_snapshot()
+            results['review_server'] = self.test_review_server()
+            results['export_date'] = self.test_export_date()
+            results['daily_note'] = self.test_daily_note()
+            
             # Test workflow integration
             results['workflow_integration'] = self.test_workflow_integration()
             
@@ -229,14 +1884,31 @@ class WorkflowTester:
             # Test full pipeline
             results['full_pipeline'] = self.test_full_pipeline()
             
+            # Test publishing and the watch mode on the generated garden
+            results['incremental_deploy'] = self.test_incremental_deploy()
+            results['watch_mode'] = self.test_watch_mode()
+            
+            # Test the fetcher, the CLI start-up and the staging building blocks
+            results['adaptive_concurrency'] = self.test_adaptive_concurrency()
+            results['cli_startup'] = self.test_cli_startup()
+            results['profiling'] = self.test_profiling()
+            results['lease_contention'] = self.test_lease_contention()
+            results['layout_migration'] = self.test_layout_migration()
+            results['archive'] = self.test_archive()
+            results['search_ranking'] = self.test_search_ranking()
+            results['circuit_breaker'] = self.test_circuit_breaker()
+            results['keyword_routing'] = self.test_keyword_routing()
+            results['registry_reload'] = self.test_registry_reload()
+            results['vault_import'] = self.test_vault_import()
+            results['garden_search'] = self.test_garden_search()
+            results['tag_index'] = self.test_tag_index()
+            results['related_articles'] = self.test_related_articles()
+            results['garden_assets'] = self.test_garden_assets()
+            results['note_rendering'] = self.test_note_rendering()
+            results['link_graph'] = self.test_link_graph()
+            
             # Overall result
-            results['overall'] = all([
-                results['setup'],
-                results['rss_monitoring'],
-                results['workflow_integration'],
-                results['digital_garden_generation'],
-                results['full_pipeline']
-            ])
+            results['overall'] = all(passed for name, passed in results.items() if name != 'overall')
             
             logger.info(f"All tests completed: {results}")
             return results
@@ -252,11 +1924,14 @@ def main():
     
     # Add arguments
     parser.add_argument('--config', default='/home/ubuntu/ai-governance-aggregator/config/pipeline.json', help='Path to configuration file')
-    parser.add_argument('--test', choices=['setup', 'rss', 'workflow', 'digital-garden', 'pipeline', 'all'], default='all', help='Test to run')
+    parser.add_argument('--test', choices=['setup', 'rss', 'workflow', 'digital-garden', 'pipeline', 'deploy', 'startup', 'throttling', 'watch', 'review-server', 'snapshot', 'leases', 'layout', 'archive', 'search', 'listing', 'circuit-breaker', 'keywords', 'export-date', 'daily-note', 'registry-reload', 'vault-import', 'garden-search', 'tag-index', 'related', 'assets', 'render', 'links', 'profiling', 'all'], default='all', help='Test to run')
     
     # Parse arguments
     args = parser.parse_args()
     
+    # Set up logging
+    configure_logging()
+    
     # Initialize workflow tester
     tester = WorkflowTester(args.config)
     
@@ -281,6 +1956,102 @@ def main():
         success = tester.test_full_pipeline()
         print(f"Full pipeline test {'succeeded' if success else 'failed'}")
     
+    elif args.test == 'deploy':
+        success = tester.test_incremental_deploy()
+        print(f"Incremental deploy test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'startup':
+        success = tester.test_cli_startup()
+        print(f"CLI startup test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'throttling':
+        success = tester.test_adaptive_concurrency()
+        print(f"Adaptive concurrency test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'watch':
+        success = tester.test_watch_mode()
+        print(f"Watch mode test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'review-server':
+        success = tester.test_review_server()
+        print(f"Review server test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'snapshot':
+        success = tester.test_metadata_snapshot()
+        print(f"Metadata snapshot test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'leases':
+        success = tester.test_lease_contention()
+        print(f"Lease contention test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'layout':
+        success = tester.test_layout_migration()
+        print(f"Layout migration test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'archive':
+        success = tester.test_archive()
+        print(f"Cold archive test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'search':
+        success = tester.test_search_ranking()
+        print(f"Search ranking test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'listing':
+        success = tester.test_new_article_listing()
+        print(f"New article listing test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'circuit-breaker':
+        success = tester.test_circuit_breaker()
+        print(f"Circuit breaker test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'keywords':
+        success = tester.test_keyword_routing()
+        print(f"Keyword routing test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'export-date':
+        success = tester.test_export_date()
+        print(f"Export date test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'daily-note':
+        success = tester.test_daily_note()
+        print(f"Daily note test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'registry-reload':
+        success = tester.test_registry_reload()
+        print(f"Registry reload test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'vault-import':
+        success = tester.test_vault_import()
+        print(f"Vault import test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'garden-search':
+        success = tester.test_garden_search()
+        print(f"Garden search index test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'tag-index':
+        success = tester.test_tag_index()
+        print(f"Tag index test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'related':
+        success = tester.test_related_articles()
+        print(f"Related articles test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'assets':
+        success = tester.test_garden_assets()
+        print(f"Garden assets test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'render':
+        success = tester.test_note_rendering()
+        print(f"Note rendering test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'links':
+        success = tester.test_link_graph()
+        print(f"Link graph test {'succeeded' if success else 'failed'}")
+    
+    elif args.test == 'profiling':
+        success = tester.test_profiling()
+        print(f"Profiling test {'succeeded' if success else 'failed'}")
+    
     else:  # 'all'
         results = tester.run_all_tests()
         
@@ -290,9 +2061,34 @@ def main():
         print(f"Workflow Integration: {'✓' if results['workflow_integration'] else '✗'}")
         print(f"Digital Garden Generation: {'✓' if results['digital_garden_generation'] else '✗'}")
         print(f"Full Pipeline: {'✓' if results['full_pipeline'] else '✗'}")
+        print(f"New Article Listing: {'✓' if results['new_article_listing'] else '✗'}")
+        print(f"Metadata Snapshot: {'✓' if results['metadata_snapshot'] else '✗'}")
+        print(f"Review Server: {'✓' if results['review_server'] else '✗'}")
+        print(f"Incremental Deploy: {'✓' if results['incremental_deploy'] else '✗'}")
+        print(f"Watch Mode: {'✓' if results['watch_mode'] else '✗'}")
+        print(f"Adaptive Concurrency: {'✓' if results['adaptive_concurrency'] else '✗'}")
+        print(f"CLI Startup: {'✓' if results['cli_startup'] else '✗'}")
+        print(f"Lease Contention: {'✓' if results['lease_contention'] else '✗'}")
+        print(f"Layout Migration: {'✓' if results['layout_migration'] else '✗'}")
+        print(f"Cold Archive: {'✓' if results['archive'] else '✗'}")
+        print(f"Search Ranking: {'✓' if results['search_ranking'] else '✗'}")
+        print(f"Circuit Breaker: {'✓' if results['circuit_breaker'] else '✗'}")
+        print(f"Keyword Routing: {'✓' if results['keyword_routing'] else '✗'}")
+        print(f"Export Date: {'✓' if results['export_date'] else '✗'}")
+        print(f"Daily Note: {'✓' if results['daily_note'] else '✗'}")
+        print(f"Registry Reload: {'✓' if results['registry_reload'] else '✗'}")
+        print(f"Vault Import: {'✓' if results['vault_import'] else '✗'}")
+        print(f"Garden Search: {'✓' if results['garden_search'] else '✗'}")
+        print(f"Tag Index: {'✓' if results['tag_index'] else '✗'}")
+        print(f"Related Articles: {'✓' if results['related_articles'] else '✗'}")
+        print(f"Garden Assets: {'✓' if results['garden_assets'] else '✗'}")
+        print(f"Note Rendering: {'✓' if results['note_rendering'] else '✗'}")
+        print(f"Link Graph: {'✓' if results['link_graph'] else '✗'}")
+        print(f"Profiling: {'✓' if results['profiling'] else '✗'}")
         print(f"\nOverall: {'✓ PASSED' if results['overall'] else '✗ FAILED'}")
+        success = results['overall']
     
-    return 0 if success or results.get('overall', False) else 1
+    return 0 if success else 1
 
 if __name__ == '__main__':
     sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+Vault reading helpers for the digital garden build.
+Walks the Obsidian vault and turns article notes into plain dictionaries
+that the site generation steps (pages, search index, tags) share.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+from pathlib import Path
+
+logger = logging.getLogger('obsidian_vault')
+
+FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---\n?', re.DOTALL)
+SECTION_RE = re.compile(r'^## (Summary|Content|Notes)\s*$', re.MULTILINE)
+
+# Vault folders that never contain published articles
+EXCLUDED_DIRS = {'Templates', 'Daily Notes', 'Attachments'}
+
+def parse_frontmatter(text):
+    """
+    Split a note into its frontmatter and body.
+
+    Args:
+        text (str): The full note text
+
+    Returns:
+        tuple: (frontmatter dict, body str)
+    """
+    frontmatter = {}
+    match = FRONTMATTER_RE.match(text)
+    if not match:
+        return frontmatter, text
+
+    for line in match.group(1).split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            value = value.strip()
+            if value.startswith('[') and value.endswith(']'):
+                value = [v.strip().strip('"') for v in value[1:-1].split(',') if v.strip()]
+            else:
+                value = value.strip('"')
+            frontmatter[key.strip()] = value
+    return frontmatter, text[match.end():]
+
+def parse_sections(body):
+    """
+    Get the Summary and Content sections of an article note.
+
+    Returns:
+        tuple: (summary str, content str)
+    """
+    sections = {}
+    parts = SECTION_RE.split(body)
+    for name, section_body in zip(parts[1::2], parts[2::2]):
+        sections[name.lower()] = section_body.strip()
+
+    if not sections:
+        return '', body.strip()
+    return sections.get('summary', ''), sections.get('content', '')
+
+def slugify(text):
+    """Turn a title into a URL-safe slug, keeping non-Latin letters."""
+    slug = re.sub(r'[^\w\s-]', '', text.lower())
+    slug = re.sub(r'[\s_-]+', '-', slug).strip('-')
+    return slug or 'untitled'
+
+def note_page_name(title, date):
+    """
+    Get the garden page filename for a note, e.g. '2025-04-07-unesco-ethics-framework.html'.
+
+    Args:
+        title (str): The note title
+        date (str): The note date, time part optional
+
+    Returns:
+        str: The page filename
+    """
+    date = (date or '').split(' ')[0]
+    return f"{date}-{slugify(title)}.html" if date else f"{slugify(title)}.html"
+
+def _note_tags(frontmatter):
+    tags = frontmatter.get('tags', [])
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(',') if t.strip()]
+    return list(dict.fromkeys(tags))
+
+def read_note(path, vault_path):
+    """
+    Read one vault note.
+
+    Args:
+        path (Path): Path to the note
+        vault_path (Path): Root of the vault
+
+    Returns:
+        dict: The note's metadata, summary, content and garden page name
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    frontmatter, body = parse_frontmatter(text)
+    summary, content = parse_sections(body)
+    rel_path = path.relative_to(vault_path).as_posix()
+
+    title = frontmatter.get('title') or path.stem
+    date = frontmatter.get('date', '')
+
+    return {
+        'id': hashlib.md5(rel_path.encode()).hexdigest()[:12],
+        'path': str(path),
+        'rel_path': rel_path,
+        'title': title,
+        'source': frontmatter.get('source', ''),
+        'url': frontmatter.get('url', ''),
+        'date': date,
+        # When the note was exported to the vault; imported notes fall back to their date
+        'added_date': (frontmatter.get('export_date') or date).split(' ')[0],
+        'language': frontmatter.get('language', ''),
+        'category': frontmatter.get('category', ''),
+        'tags': _note_tags(frontmatter),
+        'summary': summary,
+        'content': content,
+        'body': body,
+        'content_hash': hashlib.md5(text.encode('utf-8')).hexdigest(),
+        'page': note_page_name(title, date)
+    }
+
+def read_note_header(path):
+    """
+    Read the frontmatter of one vault note, stopping before its body.
+
+    Args:
+        path (Path): Path to the note
+
+    Returns:
+        dict: The fields listings are grouped and ordered by, the title and
+        garden page name, and a stamp that changes whenever the file does
+    """
+    lines = []
+    with open(path, 'r', encoding='utf-8') as f:
+        if f.readline().rstrip('\n') == '---':
+            for line in f:
+                if line.rstrip('\n') == '---':
+                    break
+                lines.append(line)
+        stat = os.fstat(f.fileno())
+
+    frontmatter, _ = parse_frontmatter('---\n' + ''.join(lines) + '---\n')
+    title = frontmatter.get('title') or path.stem
+    date = frontmatter.get('date', '')
+
+    return {
+        'path': str(path),
+        'title': title,
+        'date': date,
+        'source': frontmatter.get('source', ''),
+        'language': frontmatter.get('language', ''),
+        'category': frontmatter.get('category', ''),
+        'tags': _note_tags(frontmatter),
+        'stamp': f"{stat.st_mtime_ns}-{stat.st_size}",
+        'page': note_page_name(title, date)
+    }
+
+def _iter_note_paths(vault_path):
+    for root, dirs, files in os.walk(vault_path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d not in EXCLUDED_DIRS)
+        for filename in sorted(files):
+            if filename.endswith('.md'):
+                yield Path(root) / filename
+
+def iter_note_headers(vault_path):
+    """
+    Iterate over the headers of the article notes in a vault.
+
+    Skips the same notes as iter_vault_notes.
+
+    Args:
+        vault_path (str): Path to the Obsidian vault
+
+    Yields:
+        dict: One header per article, as returned by read_note_header
+    """
+    vault_path = Path(vault_path)
+    if not vault_path.exists():
+        return
+
+    for path in _iter_note_paths(vault_path):
+        try:
+            header = read_note_header(path)
+        except Exception as e:
+            logger.error(f"Error reading vault note {path}: {e}")
+            continue
+        if 'index' in header['tags']:
+            continue
+        yield header
+
+def iter_vault_notes(vault_path):
+    """
+    Iterate over the article notes in a vault.
+
+    Index and category notes (tagged 'index'), templates and daily notes
+    are skipped.
+
+    Args:
+        vault_path (str): Path to the Obsidian vault
+
+    Yields:
+        dict: One note per article, as returned by read_note
+    """
+    vault_path = Path(vault_path)
+    if not vault_path.exists():
+        return
+
+    for path in _iter_note_paths(vault_path):
+        try:
+            note = read_note(path, vault_path)
+        except Exception as e:
+            logger.error(f"Error reading vault note {path}: {e}")
+            continue
+        if 'index' in note['tags']:
+            continue
+        yield note
+
+def write_text_if_changed(path, text):
+    """Write a text file only if its content changed, so unchanged files keep their mtime."""
+    if path.exists() and path.read_text(encoding='utf-8') == text:
+        return False
+    path.write_text(text, encoding='utf-8')
+    return True
+
+def write_json_if_changed(path, data):
+    """Write a JSON file only if its content changed, so unchanged files keep their mtime."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    return write_text_if_changed(path, payload)
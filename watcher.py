@@ -0,0 +1,191 @@
+"""
+File watching for the watch mode of the content pipeline.
+Uses Linux inotify (through ctypes, no extra dependency) to turn file
+events under a set of directory trees into debounced change sets, so
+nothing is rescanned while nothing changes.
+"""
+
+import os
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+
+logger = logging.getLogger('file_watcher')
+
+# inotify event masks (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+# A change set is closed once no event arrived for DEBOUNCE_SECONDS,
+# or MAX_BATCH_SECONDS after its first event
+DEBOUNCE_SECONDS = 2.0
+MAX_BATCH_SECONDS = 30.0
+
+class WatchUnavailable(OSError):
+    """Raised when file watching is not supported on this system."""
+
+def _load_libc():
+    libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    if not hasattr(libc, 'inotify_init1'):
+        raise WatchUnavailable("inotify is not available on this system")
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+class FileWatcher:
+    """Class to watch directory trees for changed files."""
+
+    def __init__(self, roots, ignore=None):
+        """
+        Start watching directory trees.
+
+        Args:
+            roots (list): Directories to watch, created if missing
+            ignore (callable, optional): Predicate on a path; ignored
+                directories are not watched and ignored files not reported
+        """
+        self.libc = _load_libc()
+        self.ignore = ignore or (lambda path: False)
+        self.roots = [os.path.abspath(str(root)) for root in roots]
+        self.watches = {}
+
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise WatchUnavailable(ctypes.get_errno(), f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+
+        for root in self.roots:
+            os.makedirs(root, exist_ok=True)
+            self._add_tree(root)
+        logger.info(f"Watching {len(self.watches)} directories under {', '.join(self.roots)}")
+
+    def _add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                logger.error(f"Cannot watch {path}: inotify watch limit reached (fs.inotify.max_user_watches)")
+            elif error != errno.ENOENT:
+                logger.warning(f"Cannot watch {path}: {os.strerror(error)}")
+            return False
+        self.watches[wd] = path
+        return True
+
+    def _add_tree(self, path, changed=None):
+        """Watch a directory and its subdirectories, recording files already in them as changed."""
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if not self.ignore(os.path.join(root, d))]
+            if not self._add_watch(root):
+                dirs[:] = []
+                continue
+            if changed is not None:
+                changed.update(os.path.join(root, f) for f in files if not self.ignore(os.path.join(root, f)))
+
+    def _read_events(self, changed):
+        """Read the pending events into the set of changed paths."""
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b'\0'))
+                offset += _EVENT_HEADER.size + length
+
+                if mask & IN_Q_OVERFLOW:
+                    # Events were lost, so the whole tree has to be looked at
+                    logger.warning("inotify event queue overflowed, reporting all watched roots as changed")
+                    changed.update(self.roots)
+                    continue
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+
+                directory = self.watches.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                if self.ignore(path):
+                    continue
+
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        # Files can land in a new directory before its watch is added
+                        self._add_tree(path, changed)
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE):
+                    changed.add(path)
+
+    def wait(self, timeout=None):
+        """
+        Wait for a change set.
+
+        Returns after the first event once events have stopped arriving for
+        DEBOUNCE_SECONDS, or at most MAX_BATCH_SECONDS after the first one.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a first event, forever if None
+
+        Returns:
+            set: Paths of the changed files (the watched roots if events were
+                lost), or None if the timeout expired without changes
+        """
+        changed = set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        first_event = None
+
+        while True:
+            now = time.monotonic()
+            if first_event is None:
+                wait = None if deadline is None else max(0, deadline - now)
+            else:
+                wait = min(DEBOUNCE_SECONDS, first_event + MAX_BATCH_SECONDS - now)
+
+            readable, _, _ = select.select([self.fd], [], [], wait) if wait is None or wait > 0 else ([], [], [])
+            if readable:
+                self._read_events(changed)
+                if changed and first_event is None:
+                    first_event = time.monotonic()
+                continue
+
+            if changed:
+                return changed
+            if first_event is None and deadline is not None and time.monotonic() >= deadline:
+                return None
+
+    def discard(self):
+        """
+        Drop the events received since the last change set, e.g. those
+        caused by the caller's own writes. New directories are still watched.
+
+        Returns:
+            int: Number of changed paths dropped
+        """
+        changed = set()
+        self._read_events(changed)
+        return len(changed)
+
+    def close(self):
+        """Stop watching."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+            self.watches.clear()
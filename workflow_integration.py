@@ -9,20 +9,45 @@ import logging
 from pathlib import Path
 from datetime import datetime
 
-from scripts.rss_monitor.staging import list_new_articles, approve_article, export_to_obsidian
+from scripts.rss_monitor.staging import iter_new_articles, approve_article, export_to_obsidian, approval_log_path, read_approvals
+from scripts.rss_monitor.locking import write_text_atomic, write_json_atomic
+from scripts.rss_monitor.layout import count_articles, find_article
+from scripts.rss_monitor.search import get_search_index
 from scripts.obsidian_integration.obsidian import ObsidianIntegration
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'workflow_integration.log')),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger('workflow_integration')
 
+# Heading of the daily note section listing the day's approvals
+DAILY_NOTE_SECTION = "## New AI Governance Content"
+NO_ARTICLES_PLACEHOLDER = "No new articles today."
+
+# Records how far into today's approval log the daily note has been built
+DAILY_NOTE_STATE_FILENAME = 'daily-note.json'
+
+def append_to_section(text, heading, lines):
+    """
+    Append lines to the end of a markdown section, dropping its placeholder.
+    
+    Args:
+        text (str): The markdown document
+        heading (str): The heading line of the section
+        lines (str): Newline-terminated lines to append
+    
+    Returns:
+        str: The updated document, with the section added at the end if it was missing
+    """
+    start = text.find(heading)
+    if start == -1:
+        return f"{text.rstrip()}\n\n{heading}\n\n{lines}"
+    
+    body_start = start + len(heading)
+    next_heading = text.find('\n## ', body_start)
+    body_end = next_heading + 1 if next_heading != -1 else len(text)
+    
+    body = text[body_start:body_end].replace(NO_ARTICLES_PLACEHOLDER, '').strip('\n')
+    body = f"{body}\n{lines}" if body else lines
+    return f"{text[:body_start]}\n\n{body}\n{text[body_end:]}"
+
 class WorkflowIntegration:
     """Class to handle the workflow integration between RSS monitoring and Obsidian."""
     
@@ -40,7 +65,11 @@ class WorkflowIntegration:
         self.digital_garden_path = Path(digital_garden_path) if digital_garden_path else None
         
         # Initialize Obsidian integration
-        self.obsidian = ObsidianIntegration(obsidian_vault_path, digital_garden_path)
+        self.obsidian = ObsidianIntegration(
+            obsidian_vault_path,
+            digital_garden_path,
+            search_index=get_search_index(self.staging_dir)
+        )
         
         logger.info(f"Initialized workflow integration between {staging_dir} and {obsidian_vault_path}")
     
@@ -86,13 +115,10 @@ class WorkflowIntegration:
         }
         
         try:
-            # Get list of new articles
-            articles = list_new_articles()
-            stats['total'] = len(articles)
-            
             if auto_approve:
-                # Automatically approve all articles
-                for article in articles:
+                # Automatically approve all articles, streaming them from the staging area
+                for article in iter_new_articles():
+                    stats['total'] += 1
                     article_id = article['id']
                     
                     # Approve the article
@@ -101,6 +127,8 @@ class WorkflowIntegration:
                     else:
                         logger.error(f"Failed to approve article {article_id}")
                         stats['errors'] += 1
+            else:
+                stats['total'] = count_articles(self.staging_dir, 'new')
             
             # Export approved articles to Obsidian
             export_stats = export_to_obsidian()
@@ -121,9 +149,72 @@ class WorkflowIntegration:
             logger.error(f"Error processing new articles: {e}")
             return stats
     
+    def process_changed_articles(self, new_ids, reviewed_ids, auto_approve=False):
+        """
+        Process only the articles that changed in the staging area.
+        
+        Used by the watch mode in place of process_new_articles, so that a
+        change costs in proportion to the articles it touched.
+        
+        Args:
+            new_ids (set): IDs of articles added to the new directory
+            reviewed_ids (set): IDs of articles added to the reviewed directory
+            auto_approve (bool): Whether to automatically approve the new articles
+            
+        Returns:
+            dict: Statistics about the processing
+        """
+        stats = {
+            'total': len(new_ids),
+            'approved': 0,
+            'imported': 0,
+            'errors': 0
+        }
+        
+        try:
+            reviewed_ids = set(reviewed_ids)
+            if auto_approve:
+                for article_id in sorted(new_ids):
+                    # Another worker may have moved it on already
+                    if not find_article(self.staging_dir, 'new', article_id):
+                        continue
+                    if approve_article(article_id):
+                        stats['approved'] += 1
+                        reviewed_ids.add(article_id)
+                    else:
+                        logger.error(f"Failed to approve article {article_id}")
+                        stats['errors'] += 1
+            
+            for article_id in sorted(reviewed_ids):
+                reviewed_path = find_article(self.staging_dir, 'reviewed', article_id)
+                if not reviewed_path:
+                    continue
+                
+                export_stats = export_to_obsidian(article_id)
+                stats['errors'] += export_stats['errors']
+                if self.obsidian.import_article(reviewed_path):
+                    stats['imported'] += 1
+                else:
+                    stats['errors'] += 1
+            
+            # Only appends today's new approvals
+            self.create_daily_note()
+            
+            logger.info(f"Processed changed articles: {len(new_ids)} new, {len(reviewed_ids)} reviewed, "
+                        f"{stats['approved']} approved, {stats['imported']} imported, {stats['errors']} errors")
+            return stats
+        
+        except Exception as e:
+            logger.error(f"Error processing changed articles: {e}")
+            return stats
+    
     def create_daily_note(self):
         """
-        Create a daily note in Obsidian with a summary of new content.
+        Create or update a daily note in Obsidian with a summary of new content.
+        
+        Today's approvals are read from the per-day approval log written by
+        approve_article, and an existing note only gets the entries appended
+        since its last build, so the cost does not grow with the archive.
         
         Returns:
             str: Path to the created daily note
@@ -132,23 +223,30 @@ class WorkflowIntegration:
             # Get today's date
             today = datetime.now().strftime('%Y-%m-%d')
             
-            # Get list of articles approved today
-            articles = []
-            metadata_dir = self.staging_dir / 'metadata'
+            # Create daily notes directory if it doesn't exist
+            daily_notes_dir = self.obsidian_vault_path / "Daily Notes"
+            daily_notes_dir.mkdir(exist_ok=True)
+            daily_note_path = daily_notes_dir / f"{today}.md"
+            
+            # Continue from the last build if it was for this note
+            state_path = Path(approval_log_path(self.staging_dir, today)).with_name(DAILY_NOTE_STATE_FILENAME)
+            try:
+                with open(state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (FileNotFoundError, ValueError):
+                state = {}
             
-            for filename in os.listdir(metadata_dir):
-                if filename.endswith('.json'):
-                    try:
-                        with open(metadata_dir / filename, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                        
-                        # Check if the article was approved today
-                        approved_date = metadata.get('approved_date', '')
-                        if approved_date.startswith(today):
-                            articles.append(metadata)
-                    
-                    except Exception as e:
-                        logger.error(f"Error reading metadata file {filename}: {e}")
+            resume = daily_note_path.exists() and state.get('note') == str(daily_note_path)
+            offset = state.get('offset', 0) if resume else 0
+            articles, new_offset = read_approvals(today, offset, staging_dir=self.staging_dir)
+            
+            if resume and new_offset < offset:
+                # The log was replaced since the last build, so start over
+                articles, new_offset = read_approvals(today, 0, staging_dir=self.staging_dir)
+                resume = False
+            
+            if resume and not articles:
+                return str(daily_note_path)
             
             # Sort articles by date
             articles.sort(key=lambda x: x.get('date', ''), reverse=True)
@@ -162,20 +260,21 @@ class WorkflowIntegration:
                 
                 content_list += f"- [[{title}]] from {source} ({category})\n"
             
-            if not content_list:
-                content_list = "No new articles today."
-            
-            # Create daily note content
-            daily_note_content = f"""---
+            if resume:
+                with open(daily_note_path, 'r', encoding='utf-8') as f:
+                    daily_note_content = append_to_section(f.read(), DAILY_NOTE_SECTION, content_list)
+            else:
+                # Create daily note content
+                daily_note_content = f"""---
 date: {today}
 tags: [daily-note, ai-governance]
 ---
 
 # Daily Note: {today}
 
-## New AI Governance Content
+{DAILY_NOTE_SECTION}
 
-{content_list}
+{content_list or NO_ARTICLES_PLACEHOLDER}
 
 ## Tasks
 
@@ -187,16 +286,12 @@ tags: [daily-note, ai-governance]
 
 """
             
-            # Create daily notes directory if it doesn't exist
-            daily_notes_dir = self.obsidian_vault_path / "Daily Notes"
-            daily_notes_dir.mkdir(exist_ok=True)
-            
             # Save daily note
-            daily_note_path = daily_notes_dir / f"{today}.md"
-            with open(daily_note_path, 'w', encoding='utf-8') as f:
-                f.write(daily_note_content)
+            write_text_atomic(daily_note_path, daily_note_content)
+            os.makedirs(state_path.parent, exist_ok=True)
+            write_json_atomic(state_path, {'note': str(daily_note_path), 'offset': new_offset})
             
-            logger.info(f"Created daily note at {daily_note_path}")
+            logger.info(f"{'Updated' if resume else 'Created'} daily note at {daily_note_path} with {len(articles)} new articles")
             return str(daily_note_path)
         
         except Exception as e:
@@ -305,9 +400,11 @@ tags: [daily-note, ai-governance]
 </body>
 </html>"""
             
+            # The content pipeline generates the real, paginated index; only create a placeholder
             index_path = self.digital_garden_path / "index.html"
-            with open(index_path, 'w', encoding='utf-8') as f:
-                f.write(index_html)
+            if not index_path.exists():
+                with open(index_path, 'w', encoding='utf-8') as f:
+                    f.write(index_html)
             
             logger.info(f"Updated digital garden at {self.digital_garden_path}")
             return True